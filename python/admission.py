@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Admission control for expensive API requests
+Bounds the number of parses running at once and the queue in front of
+them; requests that would wait longer than the configured limit are
+rejected at once with a suggested retry delay
+"""
+
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from rate_limiter import PRIORITY_INTERACTIVE
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is not admitted; `retry_after` is the suggested delay in seconds"""
+
+    def __init__(self, message: str, retry_after: float, reason: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded wait queue.
+
+    Up to `max_concurrent` requests run at once. Further requests wait in
+    a queue holding at most `max_queue` requests, and only while their
+    estimated wait stays within `max_wait_seconds`. The estimate comes from
+    a moving average of recent service times. Waiting interactive requests
+    are admitted before bulk ones. A `max_concurrent` of 0 admits everything.
+    """
+
+    def __init__(self, max_concurrent: int = 8, max_queue: int = 16, max_wait_seconds: float = 30.0,
+                 initial_service_seconds: float = 10.0, smoothing: float = 0.2):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.smoothing = smoothing
+        self.service_seconds = initial_service_seconds
+        self._condition = threading.Condition()
+        self.running = 0
+        self.waiting = 0
+        self._waiting_interactive = 0
+        self.admitted = 0
+        self.rejected: Dict[str, int] = {'queue_full': 0, 'wait_too_long': 0, 'timed_out': 0}
+
+    @classmethod
+    def from_env(cls) -> 'AdmissionController':
+        return cls(
+            max_concurrent=int(os.getenv('ADMISSION_MAX_CONCURRENT', '8')),
+            max_queue=int(os.getenv('ADMISSION_MAX_QUEUE', '16')),
+            max_wait_seconds=float(os.getenv('ADMISSION_MAX_WAIT_SECONDS', '30')),
+            initial_service_seconds=float(os.getenv('ADMISSION_INITIAL_SERVICE_SECONDS', '10'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_concurrent > 0
+
+    def _estimated_wait(self, position: int) -> float:
+        """Seconds until the request at queue `position` (1-based) gets a slot"""
+        return math.ceil(position / self.max_concurrent) * self.service_seconds
+
+    def _retry_after(self) -> float:
+        # Time for the backlog beyond what is admissible to drain, at least one service time's share
+        admissible = min(self.max_queue, int(self.max_wait_seconds / self.service_seconds) * self.max_concurrent)
+        excess = max(1, self.waiting + 1 - admissible)
+        return min(300.0, max(1.0, excess * self.service_seconds / self.max_concurrent))
+
+    @contextmanager
+    def admit(self, priority: str = PRIORITY_INTERACTIVE) -> Iterator[None]:
+        """Hold a slot for the duration of the block, or raise AdmissionRejected"""
+        if not self.enabled:
+            yield
+            return
+
+        interactive = priority == PRIORITY_INTERACTIVE
+        with self._condition:
+            if self.running >= self.max_concurrent or self.waiting:
+                position = self.waiting + 1
+                if self.waiting >= self.max_queue:
+                    self._reject('queue_full', f"Server busy: {self.waiting} requests already queued")
+                wait = self._estimated_wait(position)
+                if wait > self.max_wait_seconds:
+                    self._reject('wait_too_long', f"Server busy: estimated wait {wait:.0f}s exceeds "
+                                                  f"{self.max_wait_seconds:.0f}s")
+                self._wait_for_slot(interactive)
+            self.running += 1
+            self.admitted += 1
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            with self._condition:
+                self.running -= 1
+                self.service_seconds += self.smoothing * (elapsed - self.service_seconds)
+                self._condition.notify_all()
+
+    def _wait_for_slot(self, interactive: bool):
+        """Queue until a slot is free (called with the condition held)"""
+        self.waiting += 1
+        if interactive:
+            self._waiting_interactive += 1
+        deadline = time.monotonic() + self.max_wait_seconds
+        try:
+            while self.running >= self.max_concurrent or (not interactive and self._waiting_interactive):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._reject('timed_out', f"Server busy: no slot within {self.max_wait_seconds:.0f}s")
+                self._condition.wait(remaining)
+        finally:
+            self.waiting -= 1
+            if interactive:
+                self._waiting_interactive -= 1
+
+    def _reject(self, reason: str, message: str):
+        self.rejected[reason] += 1
+        raise AdmissionRejected(message, self._retry_after(), reason)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'running': self.running,
+                'queued': self.waiting,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'admitted': self.admitted,
+                'rejected': dict(self.rejected),
+                'service_seconds': round(self.service_seconds, 2),
+                'estimated_wait_seconds': round(self._estimated_wait(self.waiting + 1), 2)
+                if self.enabled and self.running >= self.max_concurrent else 0.0
+            }
@@ -4,21 +4,67 @@ AI-Powered LinkedIn PDF Parser using OpenAI GPT
 Extracts structured data from LinkedIn profile PDFs using LLM intelligence
 """
 
-import fitz  # PyMuPDF
 import json
+import re
 import sys
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import openai
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.schema import Document
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from model_router import ModelRouter, Route, RoutingSignals
+from near_duplicate_cache import NearDuplicateCache
+from pdf_extraction import ExtractedDocument, PdfSource, extract_document, iter_page_texts
+from json_salvage import is_truncated, salvage_json
+from llm_providers import LLMProvider
+from pdf_parser import LinkedInPDFParser
+from profiling import print_profile_summary, profile_call, profiled
+from text_chunking import StreamingChunker
+from text_normalization import BoilerplateFilter
+from rate_limiter import (
+    LLMRateLimiter, LLMRateLimitError, PRIORITY_INTERACTIVE, PRIORITY_CLASSES,
+    estimate_tokens, get_shared_limiter
+)
 
 # Load environment variables
 load_dotenv()
 
+# 'full': whole text (or character chunks) with the full schema
+# 'sections': local heuristic segmentation, one parallel call per section with its sub-schema
+# 'pipelined': pages extracted lazily, chunks sent to the LLM as soon as they fill
+PARSER_MODES = ('full', 'sections', 'pipelined')
+
+# Texts longer than this are split into chunks (leaves room for prompt and response)
+SINGLE_EXTRACTION_MAX_CHARS = 12000
+
+# Sent after a response cut off at the output limit, with the partial response as the assistant turn
+CONTINUATION_PROMPT = """Your previous response was cut off at the output limit. Continue the JSON output
+exactly where it stopped: do not repeat anything already written, do not start a new
+object and do not wrap the output in a code block."""
+
+# Heuristic section names -> extraction schema keys
+SECTION_SCHEMA_KEYS = {
+    'personal': 'personal_info',
+    'summary': 'summary',
+    'experience': 'experience',
+    'education': 'education',
+    'skills': 'skills',
+    'certifications': 'certifications',
+    'languages': 'languages'
+}
+
+# Sections mode falls back to 'full' below this segmentation confidence
+SECTION_MIN_CONFIDENCE = 0.5
+
+# Sections whose text never holds date ranges (one that does was mis-segmented)
+UNDATED_SECTIONS = ('summary', 'skills', 'languages')
+
 @dataclass
 class PersonalInfo:
     name: str = ""
@@ -98,15 +144,49 @@ class ResumeData:
             self.languages = []
 
 class AILinkedInPDFParser:
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the AI-powered PDF parser"""
-        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
+    def __init__(self, api_key: Optional[str] = None, client: Optional[Any] = None,
+                 rate_limiter: Optional[LLMRateLimiter] = None, router: Optional[ModelRouter] = None,
+                 duplicate_cache: Optional[NearDuplicateCache] = None,
+                 provider: Optional[LLMProvider] = None):
+        """Initialize the AI-powered PDF parser
+
+        `client` may be any object exposing `chat.completions.create` (e.g. the
+        offline stand-in used for load testing); no API key is needed then.
+        Otherwise calls go to `provider` (configured from LLM_* variables; the
+        public OpenAI API by default), which may be any OpenAI-compatible server.
+        All LLM calls go through `rate_limiter` (the process-wide limiter by default)
+        and use the model chosen by `router` (configured from MODEL_ROUTING_CONFIG).
+        Documents whose text nearly matches a recent parse reuse its result from
+        `duplicate_cache` (configured from NEAR_DUP_* variables).
+        """
+        self.provider = provider
+        if client is not None:
+            self.client = client
+            self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        else:
+            self.provider = provider or LLMProvider.from_env()
+            self.api_key = api_key or self.provider.api_key
+            # Retries are handled by the rate limiter so that a 429 slows down every caller
+            self.client = self.provider.create_client(self.api_key)
+        
+        self.rate_limiter = rate_limiter or get_shared_limiter()
+        self.max_rate_limit_retries = int(os.getenv('OPENAI_MAX_RETRIES', '5'))
+        # Continuation calls for a response cut off at max_tokens (0: keep only the valid prefix)
+        self.max_continuations = int(os.getenv('AI_MAX_CONTINUATIONS', '2'))
         
-        # Initialize OpenAI client
-        openai.api_key = self.api_key
-        self.client = openai.OpenAI(api_key=self.api_key)
+        # Model routing uses the heuristic parser's cheap section detection as a signal
+        self.router = router or ModelRouter.from_env()
+        self.heuristic_parser = LinkedInPDFParser()
+        
+        self.duplicate_cache = duplicate_cache if duplicate_cache is not None else NearDuplicateCache.from_env()
+        
+        self.mode = os.getenv('AI_PARSER_MODE', 'full')
+        if self.mode not in PARSER_MODES:
+            raise ValueError(f"Unknown AI_PARSER_MODE '{self.mode}' (expected one of {', '.join(PARSER_MODES)})")
+        self.section_workers = int(os.getenv('AI_SECTION_WORKERS', '4'))
+        self.pipeline_workers = int(os.getenv('AI_PIPELINE_WORKERS', '4'))
+        # Strip page footers/repeated edge lines and collapse whitespace before any LLM call
+        self.normalize_text = os.getenv('AI_TEXT_NORMALIZATION', '1').lower() in ('1', 'true', 'yes')
         
         # Text splitter for large documents
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -197,37 +277,136 @@ class AILinkedInPDFParser:
             }
         }
     
-    def parse_pdf(self, pdf_path: str) -> ResumeData:
-        """Parse LinkedIn PDF using AI-powered extraction"""
+    def parse_pdf(self, pdf_path: PdfSource, priority: str = PRIORITY_INTERACTIVE,
+                  metadata: Optional[Dict[str, Any]] = None, mode: Optional[str] = None) -> ResumeData:
+        """Parse LinkedIn PDF (path or in-memory bytes) using AI-powered extraction
+
+        `priority` is the rate-limiter class for this document's LLM calls
+        ('interactive' uploads are served before 'bulk' imports). If a
+        `metadata` dict is given, details of each LLM call (chosen route,
+        token usage) and the request's peak extraction memory are recorded
+        in it. `mode` overrides AI_PARSER_MODE.
+        """
+        if metadata is None:
+            metadata = {}
+        budget = MemoryBudget.from_env()
+        
+        if (mode or self.mode) == 'pipelined':
+            # Pages are extracted lazily while earlier chunks are already with the LLM
+            # (the whole text is never available up front, so the near-duplicate cache is skipped)
+            try:
+                return self._parse_page_stream(iter_page_texts(pdf_path, budget), priority, metadata)
+            finally:
+                metadata['memory'] = budget.summary()
+        
+        # Decode the PDF once; every mode (and any fallback) works from this result
+        document = self.extract(pdf_path, metadata, budget)
+        return self.parse_document(document, priority, metadata, mode)
+    
+    def extract(self, pdf_path: PdfSource, metadata: Optional[Dict[str, Any]] = None,
+                budget: Optional[MemoryBudget] = None) -> ExtractedDocument:
+        """Decode a PDF within a memory budget (recorded in `metadata['memory']`)"""
+        budget = budget or MemoryBudget.from_env()
+        try:
+            return extract_document(pdf_path, budget)
+        except MemoryBudgetExceeded:
+            raise
+        except Exception as e:
+            raise Exception(f"Error parsing PDF with AI: {str(e)}")
+        finally:
+            if metadata is not None:
+                metadata['memory'] = budget.summary()
+    
+    def parse_document(self, document: ExtractedDocument, priority: str = PRIORITY_INTERACTIVE,
+                       metadata: Optional[Dict[str, Any]] = None, mode: Optional[str] = None) -> ResumeData:
+        """Parse a document already decoded by pdf_extraction.extract_document"""
+        mode = mode or self.mode
+        if mode not in PARSER_MODES:
+            raise ValueError(f"Unknown parser mode '{mode}'")
+        if metadata is None:
+            metadata = {}
+        
+        # Recognised LinkedIn export layouts are parsed from their geometry without any LLM call
+        resume_data = self.heuristic_parser.parse_layout(document, metadata)
+        if resume_data is not None:
+            metadata['mode'] = 'layout'
+            return resume_data
+        
+        # Re-exports of an unchanged profile reuse the earlier result without any LLM call
+        match, score, sketch = self.duplicate_cache.lookup(document.text)
+        if self.duplicate_cache.enabled:
+            metadata['near_duplicate'] = {
+                'matched': match is not None,
+                'score': round(score, 4),
+                'threshold': self.duplicate_cache.threshold
+            }
+        if match is not None:
+            metadata['near_duplicate']['fingerprint'] = match.fingerprint
+            metadata['mode'] = 'near_duplicate'
+            return match.data
+        
+        resume_data = self._parse_document_with_ai(document, priority, metadata, mode)
+        self.duplicate_cache.add(document.text, resume_data, sketch)
+        return resume_data
+    
+    def _parse_document_with_ai(self, document: ExtractedDocument, priority: str,
+                                metadata: Dict[str, Any], mode: str) -> ResumeData:
+        if mode == 'pipelined':
+            return self._parse_page_stream(iter(document.page_texts), priority, metadata)
+        
         try:
-            # Extract text from PDF
-            raw_text = self._extract_text_from_pdf(pdf_path)
+            structured_data = None
+            if mode == 'sections':
+                section_texts, confidence = self._segment_sections(document, metadata)
+                section_texts = self._normalize_sections(section_texts, metadata)
+                if confidence < SECTION_MIN_CONFIDENCE:
+                    # The split looks wrong; per-section calls would drop what landed in the wrong place
+                    metadata['mode_fallback'] = 'full'
+                elif any(key != 'personal_info' for key in section_texts):
+                    structured_data = self._extract_sections_parallel(section_texts, confidence,
+                                                                      priority, metadata)
+                else:
+                    # Nothing recognisable beyond the header; let the model segment the text itself
+                    metadata['mode_fallback'] = 'full'
             
-            # Use AI to extract structured data
-            structured_data = self._extract_with_ai(raw_text)
+            if structured_data is None:
+                # Use AI to extract structured data
+                structured_data = self._extract_with_ai(self._normalize_document(document, metadata),
+                                                        priority, metadata)
+            
+            metadata['mode'] = metadata.get('mode_fallback', mode)
             
             # Convert to ResumeData object
             return self._convert_to_resume_data(structured_data)
             
+        except LLMRateLimitError:
+            raise
         except Exception as e:
             raise Exception(f"Error parsing PDF with AI: {str(e)}")
     
-    def _extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract raw text from PDF using PyMuPDF"""
-        doc = fitz.open(pdf_path)
-        text = ""
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text += page.get_text()
-        
-        doc.close()
-        return text
-    
-    def _extract_with_ai(self, text: str) -> Dict[str, Any]:
+    def _extract_with_ai(self, text: str, priority: str = PRIORITY_INTERACTIVE,
+                         metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Use OpenAI GPT to extract structured data from text"""
-        
-        # Create the extraction prompt
+        try:
+            # Split text if it's too long
+            if len(text) > SINGLE_EXTRACTION_MAX_CHARS:
+                chunks = self._split_text(text)
+                extracted_data = self._extract_from_chunks(chunks, priority, metadata)
+            else:
+                system_prompt, user_prompt = self._full_prompts(text)
+                route, signals = self._select_route(text)
+                extracted_data = self._single_extraction(system_prompt, user_prompt, priority,
+                                                         route, signals, metadata)
+            
+            return extracted_data
+            
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            raise Exception(f"AI extraction failed: {str(e)}")
+    
+    def _full_prompts(self, text: str) -> Tuple[str, str]:
+        """System and user prompt for extracting a whole document with the full schema"""
         system_prompt = """You are an expert at extracting structured information from LinkedIn profile PDFs. 
         Your task is to analyze the provided text and extract relevant information into a structured JSON format.
         
@@ -256,35 +435,163 @@ class AILinkedInPDFParser:
 
 Return the data as a JSON object following this schema:
 {json.dumps(self.extraction_schema, indent=2)}"""
+        return system_prompt, user_prompt
+    
+    def _extraction_requests(self, text: str) -> List[Tuple[str, str, Route, RoutingSignals]]:
+        """The prompts and routes 'full' mode would send for this text, without calling the LLM
 
-        try:
-            # Split text if it's too long
-            if len(text) > 12000:  # Leave room for prompt and response
-                chunks = self._split_text(text)
-                extracted_data = self._extract_from_chunks(chunks)
-            else:
-                extracted_data = self._single_extraction(system_prompt, user_prompt)
-            
-            return extracted_data
-            
-        except Exception as e:
-            raise Exception(f"AI extraction failed: {str(e)}")
+        One request for short texts, one per chunk otherwise (used to build batch jobs).
+        """
+        if len(text) <= SINGLE_EXTRACTION_MAX_CHARS:
+            route, signals = self._select_route(text)
+            return [self._full_prompts(text) + (route, signals)]
+        chunks = self._split_text(text)
+        requests = []
+        for i, chunk in enumerate(chunks):
+            route, signals = self._select_route(chunk)
+            requests.append(self._chunk_prompts(chunk, i, len(chunks)) + (route, signals))
+        return requests
     
-    def _single_extraction(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
-        """Perform single AI extraction call"""
-        response = self.client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            temperature=0.1,
-            max_tokens=2000
+    def _select_route(self, text: str) -> Tuple[Route, RoutingSignals]:
+        """Choose model and output budget for one extraction input"""
+        lines, sections = self.heuristic_parser.detect_sections_in_text(text)
+        signals = RoutingSignals(
+            input_tokens=estimate_tokens(text),
+            sections=sorted(sections),
+            heuristic_confidence=self.heuristic_parser.estimate_confidence(lines, sections)
         )
+        return self.router.route(signals), signals
+    
+    def _single_extraction(self, system_prompt: str, user_prompt: str,
+                           priority: str = PRIORITY_INTERACTIVE,
+                           route: Optional[Route] = None,
+                           signals: Optional[RoutingSignals] = None,
+                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Perform single AI extraction call
+
+        A response cut off at the output limit is continued rather than lost.
+        """
+        if route is None:
+            route, signals = self._select_route(user_prompt)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+        response_text, finish_reason = self._complete(messages, route, signals, priority, metadata)
         
-        response_text = response.choices[0].message.content
+        if finish_reason != 'length':
+            try:
+                return self._parse_json_response(response_text)
+            except Exception:
+                if not is_truncated(response_text):
+                    raise
+        return self._continue_truncated(messages, response_text, route, signals, priority, metadata)
+    
+    def _complete(self, messages: List[Dict[str, str]], route: Route, signals: Optional[RoutingSignals],
+                  priority: str = PRIORITY_INTERACTIVE, metadata: Optional[Dict[str, Any]] = None,
+                  continuation: int = 0) -> Tuple[str, str]:
+        """One rate-limited chat completion; returns the response text and finish reason"""
+        max_tokens = route.max_tokens
+        model = self.provider.model_for(route.model) if self.provider else route.model
+        estimated = sum(estimate_tokens(message["content"]) for message in messages) + max_tokens
+        
+        for attempt in range(self.max_rate_limit_retries + 1):
+            self.rate_limiter.acquire(estimated, priority)
+            try:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.1,
+                    max_tokens=max_tokens
+                )
+                break
+            except openai.RateLimitError as e:
+                retry_after = self._retry_after_seconds(e, attempt)
+                print(f"Warning: LLM rate limited (attempt {attempt + 1}), pausing {retry_after:.1f}s")
+                self.rate_limiter.pause(retry_after)
+        else:
+            raise LLMRateLimitError(
+                f"LLM rate limit persisted after {self.max_rate_limit_retries} retries",
+                retry_after=retry_after
+            )
         
-        # Parse JSON response
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            self.rate_limiter.reconcile(estimated, getattr(usage, 'total_tokens', None))
+        
+        finish_reason = getattr(response.choices[0], 'finish_reason', None) or 'stop'
+        if metadata is not None:
+            call = ModelRouter.describe(route, signals)
+            if self.provider:
+                call['provider'] = self.provider.name
+                call['model'] = model
+            if usage is not None:
+                call['usage'] = {
+                    'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+                    'completion_tokens': getattr(usage, 'completion_tokens', 0)
+                }
+            if finish_reason != 'stop':
+                call['finish_reason'] = finish_reason
+            if continuation:
+                call['continuation'] = continuation
+            metadata.setdefault('llm_calls', []).append(call)
+        
+        return response.choices[0].message.content or "", finish_reason
+    
+    def _continue_truncated(self, messages: List[Dict[str, str]], response_text: str, route: Route,
+                            signals: Optional[RoutingSignals], priority: str = PRIORITY_INTERACTIVE,
+                            metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Recover a response cut off at the output limit.
+
+        The model is asked to continue from where it stopped (up to
+        AI_MAX_CONTINUATIONS times), so only the missing remainder is
+        generated again. If the joined output still does not parse, the
+        longest valid prefix is kept.
+        """
+        text = response_text
+        restarted = []
+        continuations = 0
+        while continuations < self.max_continuations:
+            continuations += 1
+            continuation_messages = messages + [
+                {"role": "assistant", "content": text},
+                {"role": "user", "content": CONTINUATION_PROMPT}
+            ]
+            remainder, finish_reason = self._complete(continuation_messages, route, signals, priority,
+                                                      metadata, continuation=continuations)
+            stripped = remainder.lstrip()
+            if stripped.startswith('```') or (stripped.startswith('{') and
+                                              not text.rstrip().endswith(('[', ',', ':'))):
+                # The model started a new document instead of continuing; keep both parts
+                restarted.append(salvage_json(remainder))
+                if finish_reason != 'length':
+                    break
+                continue
+            text += remainder
+            if finish_reason != 'length':
+                try:
+                    result = self._parse_json_response(text)
+                except Exception:
+                    break
+                self._record_truncation(metadata, 'continued', continuations)
+                return result
+        
+        salvaged = [part for part in [salvage_json(text)] + restarted if isinstance(part, dict)]
+        if not salvaged:
+            raise Exception("Failed to parse AI response as JSON (output truncated)")
+        self._record_truncation(metadata, 'salvaged', continuations)
+        if len(salvaged) == 1:
+            return salvaged[0]
+        return self._merge_extraction_results(salvaged)
+    
+    @staticmethod
+    def _record_truncation(metadata: Optional[Dict[str, Any]], outcome: str, continuations: int):
+        if metadata is not None:
+            metadata.setdefault('truncations', []).append({'outcome': outcome, 'continuations': continuations})
+    
+    @staticmethod
+    def _parse_json_response(response_text: str) -> Dict[str, Any]:
+        """Decode a model response as JSON (plain or wrapped in a markdown code block)"""
         try:
             return json.loads(response_text)
         except json.JSONDecodeError:
@@ -296,33 +603,366 @@ Return the data as a JSON object following this schema:
             else:
                 raise Exception("Failed to parse AI response as JSON")
     
+    @staticmethod
+    def _retry_after_seconds(error: Exception, attempt: int) -> float:
+        """Server-requested delay from a 429 response, else exponential backoff"""
+        response = getattr(error, 'response', None)
+        headers = getattr(response, 'headers', None) or {}
+        try:
+            if headers.get('retry-after-ms'):
+                return float(headers['retry-after-ms']) / 1000.0
+            if headers.get('retry-after'):
+                return float(headers['retry-after'])
+        except ValueError:
+            pass
+        return min(60.0, 2.0 ** attempt)
+    
+    def _parse_page_stream(self, pages: Iterable[str], priority: str = PRIORITY_INTERACTIVE,
+                           metadata: Optional[Dict[str, Any]] = None) -> ResumeData:
+        """Pipelined parse: overlap page extraction with in-flight LLM calls.
+
+        Short documents (up to SINGLE_EXTRACTION_MAX_CHARS) still get one call
+        with the full schema, exactly as in 'full' mode. Once the text is known
+        to be longer, it is chunked incrementally and each chunk is submitted as
+        soon as it fills while later pages are still being extracted.
+        """
+        if metadata is None:
+            metadata = {}
+        start = time.monotonic()
+        pending = []
+        futures = []
+        chunker = None
+        first_submit = None
+        normalizer = BoilerplateFilter() if self.normalize_text else None
+        if normalizer:
+            pages = (normalizer.feed(page_text) for page_text in pages)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.pipeline_workers)) as executor:
+                def submit(chunks):
+                    nonlocal first_submit
+                    for chunk in chunks:
+                        if first_submit is None:
+                            first_submit = time.monotonic()
+                        futures.append(executor.submit(profiled(self._extract_chunk), chunk,
+                                                       len(futures), None, priority, metadata))
+                
+                try:
+                    for page_text in pages:
+                        if chunker is not None:
+                            submit(chunker.feed(page_text))
+                            continue
+                        pending.append(page_text)
+                        if sum(len(text) for text in pending) > SINGLE_EXTRACTION_MAX_CHARS:
+                            chunker = StreamingChunker(chunk_size=4000, chunk_overlap=200)
+                            submit(chunker.feed("".join(pending)))
+                            pending = []
+                    extraction_done = time.monotonic()
+                    
+                    if chunker is None:
+                        structured_data = self._extract_with_ai("".join(pending), priority, metadata)
+                    else:
+                        submit(chunker.finish())
+                        results = [future.result() for future in futures]
+                        structured_data = self._merge_extraction_results(
+                            [result for result in results if result is not None]
+                        )
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+            
+            metadata['mode'] = 'pipelined'
+            if normalizer:
+                metadata['normalization'] = normalizer.stats()
+            metadata['pipeline'] = {
+                'chunks': len(futures),
+                'extraction_ms': round((extraction_done - start) * 1000, 1),
+                'first_submit_ms': round((first_submit - start) * 1000, 1) if first_submit else None
+            }
+            return self._convert_to_resume_data(structured_data)
+            
+        except (LLMRateLimitError, MemoryBudgetExceeded):
+            raise
+        except Exception as e:
+            raise Exception(f"Error parsing PDF with AI: {str(e)}")
+    
+    def _normalize_document(self, document: ExtractedDocument, metadata: Dict[str, Any]) -> str:
+        """Document text with boilerplate removed (or unchanged when normalization is off)"""
+        if not self.normalize_text:
+            return document.text
+        normalizer = BoilerplateFilter()
+        text = normalizer.clean_pages(document.page_texts)
+        metadata['normalization'] = normalizer.stats()
+        return text
+    
+    def _normalize_sections(self, section_texts: Dict[str, str], metadata: Dict[str, Any]) -> Dict[str, str]:
+        """Per-section cleanup; sections are not pages, so edge lines are not de-duplicated"""
+        if not self.normalize_text:
+            return section_texts
+        normalizer = BoilerplateFilter(dedupe_edges=False)
+        cleaned = {key: normalizer.feed(text).strip() for key, text in section_texts.items()}
+        metadata['normalization'] = normalizer.stats()
+        return {key: text for key, text in cleaned.items() if text}
+    
+    def _segment_sections(self, document: ExtractedDocument,
+                          metadata: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, str], float]:
+        """Split the document into per-section text using the heuristic parser's header detection
+
+        Two-column exports of a known layout are segmented column by column
+        (sorted top to bottom, the sidebar and main column interleave). The
+        confidence is halved for each sign of a wrong split (see
+        `_segmentation_issues`), recorded in `metadata['segmentation']`.
+        Returns the text per schema key and the confidence in that segmentation.
+        """
+        parser = self.heuristic_parser
+        matched = parser.layouts.match(document, parser) if document.text_blocks else None
+        if matched is not None:
+            split_x = matched[0].column_split_x
+            columns = [[block for block in document.text_blocks if block['bbox'][0] < split_x],
+                       [block for block in document.text_blocks if block['bbox'][0] >= split_x]]
+        else:
+            columns = [document.text_blocks]
+        
+        section_lines: Dict[str, List[str]] = {}
+        header_lines: List[str] = []
+        all_lines: List[str] = []
+        all_sections: Dict[str, List[int]] = {}
+        for blocks in columns:
+            current = None
+            for position, block in enumerate(blocks):
+                line = block['text'].strip()
+                if not line:
+                    continue
+                section_type = parser._classify_header(line, block)
+                # A repeated header of the current section (e.g. a bold "... University" line) is content
+                if section_type and section_type != current:
+                    current = section_type
+                    all_sections.setdefault(section_type, []).append(len(all_lines))
+                elif current is not None:
+                    section_lines.setdefault(current, []).append(line)
+                elif position < 15:
+                    # Name and headline sit above the first section header
+                    header_lines.append(line)
+                all_lines.append(line)
+        section_lines['personal'] = header_lines + section_lines.get('personal', [])
+        
+        section_texts = {}
+        for section_type, schema_key in SECTION_SCHEMA_KEYS.items():
+            if section_lines.get(section_type):
+                section_texts[schema_key] = "\n".join(section_lines[section_type])
+        
+        confidence = parser.estimate_confidence(all_lines, all_sections)
+        issues = self._segmentation_issues(section_texts)
+        confidence = round(confidence * 0.5 ** len(issues), 3)
+        if metadata is not None:
+            metadata['segmentation'] = {'columns': len(columns), 'confidence': confidence, 'issues': issues}
+        return section_texts, confidence
+    
+    def _segmentation_issues(self, section_texts: Dict[str, str]) -> List[str]:
+        """Signs that lines landed in the wrong section: leftover headers, dates where none belong"""
+        parser = self.heuristic_parser
+        date_range = re.compile(parser.linkedin_patterns['date_range'])
+        issues = []
+        for schema_key, text in section_texts.items():
+            lines = text.splitlines()
+            for line in lines:
+                name = line.lower().rstrip(':').strip()
+                other = next((section_type for section_type, headers in parser.section_headers.items()
+                              if name in headers and SECTION_SCHEMA_KEYS[section_type] != schema_key), None)
+                if other:
+                    issues.append(f"{schema_key} contains the {other} header '{line}'")
+                    break
+            if schema_key in UNDATED_SECTIONS and any(date_range.search(parser._bounded(line)) for line in lines):
+                issues.append(f"{schema_key} contains date ranges")
+        if 'experience' in section_texts and not date_range.search(section_texts['experience']):
+            issues.append("experience contains no date ranges")
+        return issues
+    
+    def _extract_sections_parallel(self, section_texts: Dict[str, str], confidence: float,
+                                   priority: str = PRIORITY_INTERACTIVE,
+                                   metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract each section with only its sub-schema, running the calls concurrently"""
+        section_types = {schema_key: section_type for section_type, schema_key in SECTION_SCHEMA_KEYS.items()}
+        
+        def extract_section(schema_key: str, text: str) -> Dict[str, Any]:
+            label = schema_key.replace('_', ' ')
+            sub_schema = {
+                "type": "object",
+                "properties": {schema_key: self.extraction_schema["properties"][schema_key]}
+            }
+            system_prompt = f"""You are extracting the {label} section of a LinkedIn profile PDF.
+            The text below contains only that section. Extract it into the given JSON schema.
+            Be accurate with dates, mark current positions with current=true and end_date "Present",
+            infer skill levels as "Intermediate" if not stated, and handle English and German content.
+            Return only the JSON object."""
+            
+            user_prompt = f"""Extract the {label} from this LinkedIn PDF section text:
+
+{text}
+
+Return as JSON following this schema:
+{json.dumps(sub_schema, indent=2)}"""
+            
+            # The segmentation already tells us what this text is
+            signals = RoutingSignals(
+                input_tokens=estimate_tokens(text),
+                sections=[section_types[schema_key]],
+                heuristic_confidence=confidence
+            )
+            route = self.router.route(signals)
+            return self._single_extraction(system_prompt, user_prompt, priority, route, signals, metadata)
+        
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, self.section_workers)) as executor:
+            futures = {key: executor.submit(profiled(extract_section), key, text) for key, text in section_texts.items()}
+            for key, future in futures.items():
+                try:
+                    result = future.result()
+                except LLMRateLimitError:
+                    raise
+                except Exception as e:
+                    print(f"Warning: Failed to extract section {key}: {e}")
+                    if metadata is not None:
+                        metadata.setdefault('failed_sections', []).append(key)
+                        metadata.setdefault('section_errors', {})[key] = str(e)
+                    continue
+                # Keep only the section that was asked for
+                if isinstance(result, dict) and key in result:
+                    results.append({key: result[key]})
+        
+        if metadata is not None:
+            metadata['sections'] = sorted(section_texts)
+        return self._merge_extraction_results(results)
+    
+    def reextract_sections(self, text: str, section_texts: Dict[str, str], confidence: float,
+                           sections: List[str], priority: str = PRIORITY_INTERACTIVE,
+                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Re-run extraction for some sections of an already segmented document
+
+        Sections the heuristic segmentation found are extracted from their own
+        text (one small call each); the others share one call over the whole
+        text with a schema of just those sections, as do all of them when the
+        segmentation confidence is below SECTION_MIN_CONFIDENCE. Returns a
+        partial ResumeData dict with the requested sections that succeeded.
+        Failed and empty sections are left out and listed in
+        `metadata['failed_sections']`, with the reason in
+        `metadata['section_errors']`; `metadata['segmented_sections']` lists
+        those extracted from their own text.
+        """
+        unknown = [key for key in sections if key not in self.extraction_schema["properties"]]
+        if unknown:
+            raise ValueError(f"Unknown section(s): {', '.join(unknown)}")
+        if metadata is None:
+            metadata = {}
+        
+        segmented = {}
+        if confidence >= SECTION_MIN_CONFIDENCE:
+            segmented = self._normalize_sections({key: section_texts[key] for key in sections
+                                                  if section_texts.get(key)}, metadata)
+        results = []
+        if segmented:
+            results.append(self._extract_sections_parallel(segmented, confidence, priority, metadata))
+        missing = [key for key in sections if key not in segmented]
+        if missing:
+            try:
+                results.append(self._extract_named_sections(text, missing, confidence, priority, metadata))
+            except LLMRateLimitError:
+                raise
+            except Exception as e:
+                print(f"Warning: Failed to extract sections {', '.join(missing)}: {e}")
+                metadata.setdefault('failed_sections', []).extend(missing)
+                for key in missing:
+                    metadata.setdefault('section_errors', {})[key] = str(e)
+        
+        metadata['mode'] = 'sections'
+        metadata['sections'] = list(sections)
+        metadata['segmented_sections'] = sorted(segmented)
+        patch = asdict(self._convert_to_resume_data(self._merge_extraction_results(results)))
+        errors = metadata.setdefault('section_errors', {})
+        for key in sections:
+            value = patch[key]
+            if key not in errors and not (any(value.values()) if isinstance(value, dict) else value):
+                # An empty result would wipe the current value; treat it as a failure
+                errors[key] = f"No {key.replace('_', ' ')} extracted"
+        metadata['failed_sections'] = [key for key in sections if key in errors]
+        return {key: patch[key] for key in sections if key not in errors}
+    
+    def _extract_named_sections(self, text: str, keys: List[str], confidence: float,
+                                priority: str = PRIORITY_INTERACTIVE,
+                                metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract only the given sections from the whole document text, in one call"""
+        labels = ", ".join(key.replace('_', ' ') for key in keys)
+        sub_schema = {
+            "type": "object",
+            "properties": {key: self.extraction_schema["properties"][key] for key in keys}
+        }
+        system_prompt = f"""You are extracting only the following parts of a LinkedIn profile PDF: {labels}.
+        Ignore everything else in the text. Be accurate with dates, mark current positions with
+        current=true and end_date "Present", infer skill levels as "Intermediate" if not stated,
+        and handle English and German content. Return only the JSON object."""
+        
+        user_prompt = f"""Extract the {labels} from this LinkedIn PDF text:
+
+{text}
+
+Return as JSON following this schema:
+{json.dumps(sub_schema, indent=2)}"""
+        
+        section_types = {schema_key: section_type for section_type, schema_key in SECTION_SCHEMA_KEYS.items()}
+        signals = RoutingSignals(
+            input_tokens=estimate_tokens(text),
+            sections=sorted(section_types[key] for key in keys),
+            heuristic_confidence=confidence
+        )
+        route = self.router.route(signals)
+        result = self._single_extraction(system_prompt, user_prompt, priority, route, signals, metadata)
+        return {key: result[key] for key in keys if isinstance(result, dict) and key in result}
+    
     def _split_text(self, text: str) -> List[str]:
         """Split text into manageable chunks"""
         docs = [Document(page_content=text)]
         chunks = self.text_splitter.split_documents(docs)
         return [chunk.page_content for chunk in chunks]
     
-    def _extract_from_chunks(self, chunks: List[str]) -> Dict[str, Any]:
-        """Extract data from multiple text chunks and merge results"""
-        all_results = []
-        
-        for i, chunk in enumerate(chunks):
-            system_prompt = f"""You are extracting data from part {i+1} of {len(chunks)} of a LinkedIn PDF. 
+    def _chunk_prompts(self, chunk: str, index: int, total: Optional[int] = None) -> Tuple[str, str]:
+        """System and user prompt for one chunk (`total` is unknown while streaming)"""
+        part = f"part {index+1} of {total}" if total else f"part {index+1}"
+        system_prompt = f"""You are extracting data from {part} of a LinkedIn PDF. 
             Extract any relevant resume information from this chunk. If this chunk doesn't contain 
             certain types of information, return empty values for those fields."""
-            
-            user_prompt = f"""Extract resume data from this text chunk:
+        
+        user_prompt = f"""Extract resume data from this text chunk:
 
 {chunk}
 
 Return as JSON following the schema structure."""
-            
-            try:
-                result = self._single_extraction(system_prompt, user_prompt)
+        return system_prompt, user_prompt
+    
+    def _extract_chunk(self, chunk: str, index: int, total: Optional[int] = None,
+                       priority: str = PRIORITY_INTERACTIVE,
+                       metadata: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Extract one chunk; failures other than rate limiting drop only this chunk"""
+        system_prompt, user_prompt = self._chunk_prompts(chunk, index, total)
+        try:
+            route, signals = self._select_route(chunk)
+            return self._single_extraction(system_prompt, user_prompt, priority,
+                                           route, signals, metadata)
+        except LLMRateLimitError:
+            raise
+        except Exception as e:
+            print(f"Warning: Failed to extract from chunk {index+1}: {e}")
+            return None
+    
+    def _extract_from_chunks(self, chunks: List[str], priority: str = PRIORITY_INTERACTIVE,
+                             metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Extract data from multiple text chunks and merge results"""
+        all_results = []
+        
+        for i, chunk in enumerate(chunks):
+            result = self._extract_chunk(chunk, i, len(chunks), priority, metadata)
+            if result is not None:
                 all_results.append(result)
-            except Exception as e:
-                print(f"Warning: Failed to extract from chunk {i+1}: {e}")
-                continue
         
         # Merge results from all chunks
         return self._merge_extraction_results(all_results)
@@ -505,13 +1145,23 @@ def main():
     parser = argparse.ArgumentParser(description='AI-Powered LinkedIn PDF Parser')
     parser.add_argument('pdf_path', help='Path to PDF file')
     parser.add_argument('--output', '-o', help='Output JSON file path')
-    parser.add_argument('--api-key', help='OpenAI API key (or set OPENAI_API_KEY env var)')
+    parser.add_argument('--api-key', help="API key of the LLM provider (or set OPENAI_API_KEY / the provider's key variable)")
+    parser.add_argument('--priority', choices=sorted(PRIORITY_CLASSES), default=PRIORITY_INTERACTIVE,
+                        help='Rate-limiter priority class for LLM calls')
+    parser.add_argument('--mode', choices=PARSER_MODES, help='Extraction mode (default: AI_PARSER_MODE or full)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the parse; prints a stage summary and saves the profile to PROFILE_DIR')
     
     args = parser.parse_args()
     
     try:
         pdf_parser = AILinkedInPDFParser(api_key=args.api_key)
-        resume_data = pdf_parser.parse_pdf(args.pdf_path)
+        if args.profile:
+            resume_data, profile = profile_call(pdf_parser.parse_pdf, args.pdf_path, priority=args.priority,
+                                                mode=args.mode, label=os.path.basename(args.pdf_path))
+            print_profile_summary(profile)
+        else:
+            resume_data = pdf_parser.parse_pdf(args.pdf_path, priority=args.priority, mode=args.mode)
         
         # Convert to dict for JSON serialization
         result = asdict(resume_data)
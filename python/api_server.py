@@ -3,11 +3,34 @@
 Flask API server for AI-powered PDF parsing using OpenAI GPT
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
-import tempfile
+import hashlib
+import hmac
+import io
+import json
 import os
-from ai_pdf_parser import AILinkedInPDFParser
+import re
+import zipfile
+import time
+from functools import wraps
+from admission import AdmissionController, AdmissionRejected
+from ai_pdf_parser import AILinkedInPDFParser, PARSER_MODES, SECTION_SCHEMA_KEYS
+from pdf_parser import LinkedInPDFParser
+from llm_providers import LLMProvider
+from metrics import MetricsRegistry
+from offline_llm import OfflineLLMClient
+from section_cache import SectionCache
+from single_flight import SingleFlight
+from parse_pool import ParsePool
+from profiling import profile_call
+from resume_renderer import DEFAULT_TEMPLATE, RenderPool, sample_resume
+from result_store import ResultStore, compress, etag_matches, negotiate_encoding
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from pdf_extraction import extract_document
+from rate_limiter import LLMRateLimitError, PRIORITY_BULK, PRIORITY_CLASSES, PRIORITY_INTERACTIVE, get_shared_limiter
+from warmup import Warmup, WarmupStep, sample_pdf_bytes
+import math
 from dataclasses import asdict
 from dotenv import load_dotenv
 
@@ -17,9 +40,22 @@ load_dotenv()
 app = Flask(__name__)
 CORS(app)
 
+# Offline LLM stand-in (load testing / local development without network)
+OFFLINE_LLM = os.getenv('OPENAI_OFFLINE_STUB', '').lower() in ('1', 'true', 'yes')
+
+# LLM endpoint: the OpenAI API, or any OpenAI-compatible server (LLM_BASE_URL / LLM_PROVIDERS_CONFIG)
+llm_provider = None
+
 # Initialize AI parser
 try:
-    ai_parser = AILinkedInPDFParser()
+    llm_provider = LLMProvider.from_env()
+    if OFFLINE_LLM:
+        ai_parser = AILinkedInPDFParser(client=OfflineLLMClient(
+            latency_ms=float(os.getenv('OPENAI_OFFLINE_LATENCY_MS', '800')),
+            jitter_ms=float(os.getenv('OPENAI_OFFLINE_JITTER_MS', '200'))
+        ))
+    else:
+        ai_parser = AILinkedInPDFParser(provider=llm_provider)
     AI_AVAILABLE = True
     print("[SUCCESS] AI-powered parsing initialized successfully")
 except ValueError as e:
@@ -27,56 +63,542 @@ except ValueError as e:
     AI_AVAILABLE = False
     ai_parser = None
 
+# Heuristic parser for /api/parse-pdf/quick: built once, works without any LLM configured
+quick_parser = LinkedInPDFParser()
+QUICK_PARSE_P99_TARGET_MS = float(os.getenv('QUICK_PARSE_P99_TARGET_MS', '100'))
+
+# In-flight parses keyed by PDF content hash (double-clicks, frontend retries)
+parse_flights = SingleFlight()
+
+# Bounded concurrency and queue for AI parses (ADMISSION_*); overload is answered with 429 + Retry-After
+admission = AdmissionController.from_env()
+
+# Segmented text of recent parses, for re-extracting single sections (POST /api/parse-pdf/sections)
+section_cache = SectionCache.from_env()
+
+# Worker processes for PDF extraction (PARSE_POOL_WORKERS, 0 = extract on the request thread)
+parse_pool = ParsePool.from_env()
+
+# Parse results addressable by content hash (GET /api/results/<hash>)
+result_store = ResultStore.from_env()
+
+# JSON responses at least this large are compressed when the client accepts it (0 disables)
+COMPRESSION_MIN_BYTES = int(os.getenv('RESPONSE_COMPRESSION_MIN_BYTES', '1024'))
+
+# Server-side resume rendering (RENDER_WORKERS processes for batches, 0 = render on the request thread)
+render_pool = RenderPool.from_env()
+RENDER_MAX_BATCH = int(os.getenv('RENDER_MAX_BATCH', '200'))
+
+# Request latencies and service gauges for /api/metrics
+metrics = MetricsRegistry(window=int(os.getenv('METRICS_WINDOW', '1000')))
+metrics.tracker('parse_pdf')
+metrics.tracker('parse_pdf_quick', target_p99_ms=QUICK_PARSE_P99_TARGET_MS)
+metrics.tracker('reextract_sections')
+metrics.tracker('render_pdf')
+metrics.tracker('render_pdf_batch')
+metrics.gauge('in_flight_parses', lambda: parse_flights.in_flight)
+metrics.gauge('admission', lambda: admission.stats())
+metrics.gauge('llm_queue_depth', lambda: get_shared_limiter().queue_depth)
+metrics.gauge('result_store', lambda: result_store.stats())
+metrics.gauge('warmup', lambda: warmup.report.status)
+
+def _warmup_steps() -> list:
+    """Every configured parse path, run on the bundled sample PDF before the server reports ready"""
+    repeats = int(os.getenv('WARMUP_REPEATS', '2'))
+    llm_mode = os.getenv('WARMUP_LLM', 'connect').lower()
+    # Loaded on the first step, not at import (spawned worker processes re-import this module)
+    samples = {}
+    
+    def sample_document():
+        if 'document' not in samples:
+            samples['document'] = extract_document(sample_pdf_bytes(), MemoryBudget.from_env())
+        return samples['document']
+    steps = []
+    
+    if parse_pool.enabled:
+        def pool_extract():
+            parse_pool.start()
+            document, _ = parse_pool.extract(sample_pdf_bytes())
+            return f"{parse_pool.workers} worker(s), {document.page_count} page(s)"
+        steps.append(WarmupStep('parse_pool', pool_extract, repeats))
+    
+    def extract():
+        samples.pop('document', None)
+        return f"{sample_document().page_count} page(s), {len(sample_document().text)} chars"
+    steps.append(WarmupStep('extract', extract, repeats))
+    
+    def quick_parse():
+        metadata = {}
+        quick_parser.parse_document(sample_document(), metadata=metadata)
+        layout = metadata.get('layout') or {}
+        return f"layout {layout['template']}" if layout.get('template') else 'heuristic'
+    steps.append(WarmupStep('quick_parse', quick_parse, repeats))
+    
+    if AI_AVAILABLE:
+        def prepare_prompts():
+            # Segmentation, normalization, routing and prompts: everything before the first LLM call
+            section_texts, _ = ai_parser._segment_sections(sample_document())
+            ai_parser._normalize_sections(section_texts, {})
+            requests = ai_parser._extraction_requests(ai_parser._normalize_document(sample_document(), {}))
+            return f"{len(section_texts)} sections, {len(requests)} request(s)"
+        steps.append(WarmupStep('prepare_prompts', prepare_prompts, repeats))
+        
+        if llm_mode == 'parse':
+            def llm_parse():
+                # Straight to the LLM (past the near-duplicate cache and the layout parser), once
+                metadata = {}
+                ai_parser._parse_document_with_ai(sample_document(), PRIORITY_BULK, metadata, ai_parser.mode)
+                return f"{_provider_label()}, {metadata.get('mode')} mode"
+            steps.append(WarmupStep('llm_parse', llm_parse, repeats=0))
+        elif llm_mode == 'connect' and hasattr(ai_parser.client, 'warm'):
+            connections = max(1, llm_provider.max_concurrency) if llm_provider else 1
+            connections = min(connections, int(os.getenv('WARMUP_LLM_CONNECTIONS', '4')))
+            
+            def llm_connect():
+                ai_parser.client.warm(connections)
+                return f"{_provider_label()}, {connections} connection(s)"
+            steps.append(WarmupStep('llm_connect', llm_connect, repeats=0))
+    
+    def render():
+        render_pool.start()
+        render_pool.render_many([(sample_resume(), DEFAULT_TEMPLATE)] * max(1, render_pool.workers))
+        return f"{render_pool.workers} worker(s)" if render_pool.enabled else None
+    steps.append(WarmupStep('render', render, repeats))
+    return steps
+
+# Readiness (GET /api/ready): started by run_server, or by the first readiness probe
+warmup = Warmup.from_env(
+    _warmup_steps() if os.getenv('WARMUP_ENABLED', '1').lower() in ('1', 'true', 'yes') else []
+)
+
+def _timed(name: str):
+    """Record a view's latency and response status under `name` in the metrics registry"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            response = app.make_response(view(*args, **kwargs))
+            duration_ms = (time.perf_counter() - start) * 1000
+            metrics.tracker(name).record(duration_ms, response.status_code)
+            response.headers['Server-Timing'] = f'app;dur={duration_ms:.1f}'
+            return response
+        return wrapper
+    return decorator
+
+def _uploaded_pdf():
+    """The uploaded PDF file storage, or an error response for a missing/invalid upload"""
+    if 'pdf' not in request.files:
+        return None, (jsonify({'error': 'No PDF file provided'}), 400)
+    
+    file = request.files['pdf']
+    if file.filename == '':
+        return None, (jsonify({'error': 'No file selected'}), 400)
+    
+    if not file.filename.lower().endswith('.pdf'):
+        return None, (jsonify({'error': 'File must be a PDF'}), 400)
+    return file, None
+
+def _admission_rejected(e: AdmissionRejected):
+    """429 response for a request turned away by admission control"""
+    metrics.increment(f'admission_rejected_{e.reason}')
+    retry_after = max(1, math.ceil(e.retry_after))
+    response = jsonify({
+        'success': False,
+        'error': f'{e}. Please retry in {retry_after} seconds.',
+        'retry_after': retry_after
+    })
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
+
+def _rate_limited(e: LLMRateLimitError):
+    """503 response for a request whose LLM calls hit the provider's rate limit"""
+    response = jsonify({
+        'success': False,
+        'error': f'AI parsing is temporarily rate limited: {str(e)}'
+    })
+    response.headers['Retry-After'] = str(max(1, math.ceil(e.retry_after)))
+    return response, 503
+
+def _profiling_requested() -> bool:
+    """Profiling is admin-only: X-Profile: 1 plus an X-Admin-Token matching ADMIN_TOKEN"""
+    admin_token = os.getenv('ADMIN_TOKEN')
+    if not admin_token or request.headers.get('X-Profile', '').lower() not in ('1', 'true', 'yes'):
+        return False
+    return hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token)
+
+def _segment_for_reextraction(document) -> tuple:
+    """(normalized text, section texts, confidence) of a parsed document, for the section cache"""
+    section_texts, confidence = ai_parser._segment_sections(document)
+    return ai_parser._normalize_document(document, {}), section_texts, confidence
+
+def _parse_pdf_bytes(pdf_bytes: bytes, priority: str = PRIORITY_INTERACTIVE, mode: str = None,
+                     content_hash: str = None) -> dict:
+    """Parse an uploaded PDF with the AI parser; returns JSON-ready data and parse metadata"""
+    # Parse using AI (the PDF is opened from memory; no temporary file)
+    metadata = {}
+    if (mode or ai_parser.mode) == 'pipelined':
+        # Pages stream straight into the LLM calls; there is no whole document to segment and cache
+        resume_data = ai_parser.parse_pdf(pdf_bytes, priority=priority, metadata=metadata, mode=mode)
+        return {'data': asdict(resume_data), 'metadata': metadata}
+    
+    if parse_pool.enabled:
+        # CPU-bound extraction runs in a worker process; the I/O-bound LLM calls stay on this thread
+        document, metadata['memory'] = parse_pool.extract(pdf_bytes)
+    else:
+        document = ai_parser.extract(pdf_bytes, metadata)
+    resume_data = ai_parser.parse_document(document, priority=priority, metadata=metadata, mode=mode)
+    
+    if content_hash:
+        # Kept for /api/parse-pdf/sections (re-extracting single sections without a new upload);
+        # segmented only if a re-extraction asks for it
+        section_cache.put_lazy(content_hash, lambda: _segment_for_reextraction(document), len(document.text))
+    
+    # Convert to dict for JSON response
+    return {'data': asdict(resume_data), 'metadata': metadata}
+
+def _admitted_parse(pdf_bytes: bytes, priority: str, mode: str, content_hash: str) -> dict:
+    """`_parse_pdf_bytes` under admission control: beyond the configured concurrency and queue
+    depth, reject at once instead of queueing behind the LLM"""
+    with admission.admit(priority):
+        return _parse_pdf_bytes(pdf_bytes, priority, mode, content_hash)
+
 @app.route('/api/parse-pdf', methods=['POST'])
+@_timed('parse_pdf')
 def parse_pdf():
     try:
         # Check if AI parsing is available
         if not AI_AVAILABLE:
             return jsonify({
                 'success': False,
-                'error': 'AI parsing service is not available. Please configure your OpenAI API key.'
+                'error': 'AI parsing service is not available. Please configure your OpenAI API key or an OpenAI-compatible LLM_BASE_URL.'
             }), 503
         
-        # Check if file was uploaded
-        if 'pdf' not in request.files:
-            return jsonify({'error': 'No PDF file provided'}), 400
+        file, error = _uploaded_pdf()
+        if error:
+            return error
         
-        file = request.files['pdf']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
+        # Batch importers send X-Request-Priority: bulk so interactive uploads go first
+        priority = request.headers.get('X-Request-Priority', PRIORITY_INTERACTIVE).lower()
+        if priority not in PRIORITY_CLASSES:
+            return jsonify({'error': f'Unknown request priority: {priority}'}), 400
         
-        if not file.filename.lower().endswith('.pdf'):
-            return jsonify({'error': 'File must be a PDF'}), 400
+        # Optional extraction mode override ('full' or 'sections')
+        mode = request.form.get('mode') or None
+        if mode and mode not in PARSER_MODES:
+            return jsonify({'error': f'Unknown parser mode: {mode}'}), 400
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            file.save(tmp_file.name)
-            tmp_path = tmp_file.name
+        pdf_bytes = file.read()
+        content_hash = hashlib.sha256(pdf_bytes).hexdigest()
         
-        try:
-            # Parse using AI
-            resume_data = ai_parser.parse_pdf(tmp_path)
-            
-            # Convert to dict for JSON response
-            result = asdict(resume_data)
-            
-            return jsonify({
-                'success': True,
-                'data': result,
-                'parsing_method': 'AI-powered (GPT-4)'
-            })
-            
-        finally:
-            # Clean up temporary file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+        profile = None
+        if _profiling_requested():
+            # Profiled parses run on their own so the profile covers exactly this request
+            with admission.admit(priority):
+                parsed, profile = profile_call(_parse_pdf_bytes, pdf_bytes, priority, mode, content_hash,
+                                               label=content_hash[:12])
+            coalesced = False
+            print(f"[PROFILE] {content_hash[:12]} parsed in {profile['wall_ms']} ms, saved to {profile['profile_path']}")
+        else:
+            # Identical uploads already being parsed share that parse instead of starting another;
+            # only the leader takes an admission slot, so waiting followers do not crowd out new work
+            parsed, coalesced = parse_flights.do(f'{content_hash}:{mode or ai_parser.mode}',
+                                                _admitted_parse, pdf_bytes, priority, mode, content_hash)
+            if coalesced:
+                print(f"[COALESCED] Joined in-flight parse for {content_hash[:12]}")
+        
+        result = {
+            'success': True,
+            'data': parsed['data'],
+            'parsing_method': _parsing_method(parsed['metadata']),
+            'content_hash': content_hash,
+            'metadata': parsed['metadata']
+        }
+        stored = result_store.put(content_hash, result)
+        
+        response = dict(result, coalesced=coalesced)
+        if stored is not None:
+            response['result_url'] = f'/api/results/{content_hash}'
+        if profile is not None:
+            response['profile'] = profile
+        return jsonify(response)
                 
+    except AdmissionRejected as e:
+        return _admission_rejected(e)
+    except MemoryBudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except LLMRateLimitError as e:
+        return _rate_limited(e)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': f'AI parsing failed: {str(e)}'
         }), 500
 
+# Frontend (camelCase) section names accepted by /api/parse-pdf/sections
+SECTION_ALIASES = {'personalInfo': 'personal_info', 'personal': 'personal_info'}
+
+@app.route('/api/parse-pdf/sections', methods=['POST'])
+@_timed('reextract_sections')
+def reextract_sections():
+    """Re-extract some sections of an earlier parse: {"content_hash": ..., "sections": ["experience", ...]}"""
+    try:
+        if not AI_AVAILABLE:
+            return jsonify({
+                'success': False,
+                'error': 'AI parsing service is not available. Please configure your OpenAI API key or an OpenAI-compatible LLM_BASE_URL.'
+            }), 503
+        
+        payload = request.get_json(silent=True) or {}
+        content_hash = str(payload.get('content_hash', '')).lower()
+        sections = payload.get('sections')
+        if not content_hash or not isinstance(sections, list) or not sections:
+            return jsonify({'success': False, 'error': 'Request body must contain "content_hash" and a non-empty "sections" list'}), 400
+        sections = list(dict.fromkeys(SECTION_ALIASES.get(str(section), str(section)) for section in sections))
+        unknown = [section for section in sections if section not in SECTION_SCHEMA_KEYS.values()]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown section(s): {', '.join(unknown)}"}), 400
+        
+        priority = request.headers.get('X-Request-Priority', PRIORITY_INTERACTIVE).lower()
+        if priority not in PRIORITY_CLASSES:
+            return jsonify({'error': f'Unknown request priority: {priority}'}), 400
+        
+        cached = section_cache.get(content_hash)
+        if cached is None:
+            return jsonify({
+                'success': False,
+                'error': 'No cached document for this content hash. Upload the PDF to /api/parse-pdf again.'
+            }), 404
+        
+        metadata = {}
+        with admission.admit(priority):
+            patch = ai_parser.reextract_sections(cached.text, cached.section_texts, cached.confidence,
+                                                 sections, priority, metadata)
+        if not patch:
+            return jsonify({
+                'success': False,
+                'error': f"Re-extraction failed for: {', '.join(metadata.get('failed_sections', sections))}",
+                'section_errors': metadata.get('section_errors', {}),
+                'metadata': metadata
+            }), 500
+        
+        # The stored result (GET /api/results/<hash>) takes only sections re-extracted from their own
+        # segment text; whole-text fallbacks are returned to the caller but not trusted enough to persist
+        persisted = {key: value for key, value in patch.items() if key in metadata.get('segmented_sections', [])}
+        stored = result_store.get(content_hash) if persisted else None
+        if stored is not None:
+            result = json.loads(stored.body)
+            result['data'].update(persisted)
+            result_store.put(content_hash, result)
+        
+        return jsonify({
+            'success': True,
+            'content_hash': content_hash,
+            'data': patch,
+            'failed_sections': metadata.get('failed_sections', []),
+            'section_errors': metadata.get('section_errors', {}),
+            'stored_sections': sorted(persisted) if stored is not None else [],
+            'metadata': metadata
+        })
+    
+    except AdmissionRejected as e:
+        return _admission_rejected(e)
+    except LLMRateLimitError as e:
+        return _rate_limited(e)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Section re-extraction failed: {str(e)}'
+        }), 500
+
+@app.route('/api/parse-pdf/quick', methods=['POST'])
+@_timed('parse_pdf_quick')
+def parse_pdf_quick():
+    """Heuristic parse for an instant draft; no LLM involved (p99 target: QUICK_PARSE_P99_TARGET_MS)"""
+    try:
+        file, error = _uploaded_pdf()
+        if error:
+            return error
+        
+        pdf_bytes = file.read()
+        metadata = {}
+        budget = MemoryBudget.from_env()
+        try:
+            # Opened from memory; recognised export layouts take the geometric fast path
+            resume_data = quick_parser.parse_pdf(pdf_bytes, budget=budget, metadata=metadata)
+        finally:
+            metadata['memory'] = budget.summary()
+        metadata.setdefault('mode', 'layout' if metadata.get('layout', {}).get('accepted') else 'heuristic')
+        
+        return jsonify({
+            'success': True,
+            'data': asdict(resume_data),
+            'parsing_method': 'Heuristic (quick)',
+            'content_hash': hashlib.sha256(pdf_bytes).hexdigest(),
+            'coalesced': False,
+            'metadata': metadata
+        })
+    
+    except MemoryBudgetExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 413
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Quick parsing failed: {str(e)}'
+        }), 500
+
+@app.route('/api/render-pdf', methods=['POST'])
+@_timed('render_pdf')
+def render_pdf():
+    """Render one resume to PDF: {"resume": ResumeData, "template": "<template id>"}"""
+    try:
+        payload = request.get_json(silent=True) or {}
+        if not isinstance(payload.get('resume'), dict):
+            return jsonify({'success': False, 'error': 'Request body must contain a "resume" object'}), 400
+        
+        template_id = payload.get('template') or DEFAULT_TEMPLATE
+        if template_id not in render_pool.renderer.templates:
+            return jsonify({'success': False, 'error': f"Unknown template '{template_id}'"}), 400
+        
+        result = render_pool.renderer.render(payload['resume'], template_id)
+        return Response(result.pdf, status=200, mimetype='application/pdf', headers={
+            'Content-Disposition': f'inline; filename="resume-{template_id}.pdf"',
+            'X-Page-Count': str(result.pages)
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Rendering failed: {str(e)}'
+        }), 500
+
+@app.route('/api/render-pdf/batch', methods=['POST'])
+@_timed('render_pdf_batch')
+def render_pdf_batch():
+    """Render many resumes into a zip of PDFs.
+
+    Body: {"template": "<default template id>", "resumes": [ResumeData | {"resume": ..., "template": ..., "filename": ...}]}
+    """
+    try:
+        payload = request.get_json(silent=True) or {}
+        items = payload.get('resumes')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'error': 'Request body must contain a non-empty "resumes" list'}), 400
+        if len(items) > RENDER_MAX_BATCH:
+            return jsonify({'success': False, 'error': f'At most {RENDER_MAX_BATCH} resumes per batch'}), 413
+        
+        default_template = payload.get('template') or DEFAULT_TEMPLATE
+        jobs, names = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                return jsonify({'success': False, 'error': f'Item {index} is not an object'}), 400
+            resume = item['resume'] if isinstance(item.get('resume'), dict) else item
+            template_id = item.get('template') or default_template
+            if template_id not in render_pool.renderer.templates:
+                return jsonify({'success': False, 'error': f"Unknown template '{template_id}' (item {index})"}), 400
+            name = re.sub(r'[^A-Za-z0-9_.-]', '_', str(item.get('filename') or f'resume-{index + 1}'))
+            jobs.append((resume, template_id))
+            names.append(name if name.lower().endswith('.pdf') else f'{name}.pdf')
+        
+        results = render_pool.render_many(jobs)
+        
+        # PDFs are already deflated; storing them avoids compressing twice
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_STORED) as zf:
+            for name, result in zip(names, results):
+                zf.writestr(name, result.pdf)
+        return Response(archive.getvalue(), status=200, mimetype='application/zip', headers={
+            'Content-Disposition': 'attachment; filename="resumes.zip"',
+            'X-Page-Count': str(sum(result.pages for result in results))
+        })
+    
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': f'Batch rendering failed: {str(e)}'
+        }), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Per-endpoint latency percentiles (with targets), counters and service gauges"""
+    return jsonify(metrics.snapshot())
+
+@app.route('/api/results/<content_hash>', methods=['GET'])
+def get_result(content_hash):
+    """Re-fetch a stored parse result; supports If-None-Match and gzip/brotli encoding"""
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    stored = result_store.get(content_hash.lower(), encoding)
+    if stored is None:
+        return jsonify({
+            'success': False,
+            'error': 'No stored result for this content hash. Upload the PDF to /api/parse-pdf.'
+        }), 404
+    
+    body, etag = stored.representation(encoding)
+    headers = {
+        'ETag': etag,
+        'Vary': 'Accept-Encoding',
+        # Clients may keep the result but must revalidate (a re-parse replaces it)
+        'Cache-Control': 'private, no-cache'
+    }
+    if etag_matches(request.headers.get('If-None-Match', ''), etag):
+        result_store.record_not_modified()
+        return Response(status=304, headers=headers)
+    
+    if encoding:
+        headers['Content-Encoding'] = encoding
+    return Response(body, status=200, headers=headers, content_type='application/json; charset=utf-8')
+
+@app.after_request
+def compress_response(response):
+    """Compress large JSON responses (results already encoded by get_result are left alone)"""
+    if (COMPRESSION_MIN_BYTES <= 0 or response.direct_passthrough or response.status_code != 200 or
+            response.mimetype != 'application/json' or 'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESSION_MIN_BYTES:
+        return response
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    return response
+
+def _provider_label() -> str:
+    if OFFLINE_LLM:
+        return 'offline stand-in'
+    if llm_provider is None or llm_provider.base_url is None:
+        return 'GPT-4'
+    return f"{llm_provider.name}: {llm_provider.model or 'routed models'}"
+
+def _parsing_method(metadata: dict) -> str:
+    """How a parse was answered, from its metadata: a fast path without LLM calls, or the models called"""
+    mode = metadata.get('mode')
+    if mode == 'layout':
+        return 'Layout fast path (no LLM call)'
+    if mode == 'near_duplicate':
+        return 'Near-duplicate of an earlier parse (no LLM call)'
+    label = _provider_label()
+    models = sorted({call['model'] for call in metadata.get('llm_calls', []) if call.get('model')})
+    if models and not OFFLINE_LLM and (llm_provider is None or llm_provider.base_url is None):
+        # Routed OpenAI models (e.g. gpt-4o-mini for short profiles) rather than the default name
+        label = ', '.join(models)
+    return f'AI-powered ({label}, {mode} mode)' if mode else f'AI-powered ({label})'
+
+@app.route('/api/ready', methods=['GET'])
+def readiness_check():
+    """503 until the warm-up has run every parse path once; then 200 with its per-path timings"""
+    if warmup.report.status == 'pending':
+        warmup.start()
+    report = warmup.report.to_dict()
+    return jsonify({'ready': warmup.ready, 'warmup': report}), 200 if warmup.ready else 503
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({
@@ -84,7 +606,19 @@ def health_check():
         'service': 'AI-Powered PDF Parser API',
         'ai_available': AI_AVAILABLE,
         'openai_configured': bool(os.getenv('OPENAI_API_KEY')),
-        'parsing_method': 'AI-powered (GPT-4)' if AI_AVAILABLE else 'Service unavailable'
+        'llm_provider': llm_provider.describe() if llm_provider else None,
+        'offline_llm': OFFLINE_LLM,
+        'in_flight_parses': parse_flights.in_flight,
+        'admission': admission.stats(),
+        'parse_pool_workers': parse_pool.workers,
+        'llm_queue_depth': get_shared_limiter().queue_depth,
+        'near_duplicate_cache': ai_parser.duplicate_cache.stats() if AI_AVAILABLE else None,
+        'result_store': result_store.stats(),
+        'section_cache': section_cache.stats(),
+        'quick_parse_available': True,
+        'render_workers': render_pool.workers,
+        'warmup': warmup.report.status,
+        'parsing_method': f'AI-powered ({_provider_label()})' if AI_AVAILABLE else 'Service unavailable'
     })
 
 @app.route('/api/config', methods=['GET'])
@@ -92,20 +626,62 @@ def get_config():
     """Get current configuration status"""
     return jsonify({
         'ai_parsing_available': AI_AVAILABLE,
+        'quick_parsing_available': True,
+        'render_templates': sorted(render_pool.renderer.templates),
         'openai_api_key_configured': bool(os.getenv('OPENAI_API_KEY')),
+        'llm_provider': llm_provider.name if llm_provider else None,
         'service_status': 'ready' if AI_AVAILABLE else 'configuration_required',
-        'required_setup': [] if AI_AVAILABLE else ['Set OPENAI_API_KEY environment variable']
+        'required_setup': [] if AI_AVAILABLE else [
+            'Set OPENAI_API_KEY environment variable, or LLM_BASE_URL for an OpenAI-compatible server'
+        ]
     })
 
+def run_server():
+    """Serve the app using the configuration from the environment.
+
+    API_THREADS selects a fixed-size waitress thread pool when waitress is
+    installed; otherwise the Flask development server is used.
+    """
+    host = os.getenv('API_HOST', '0.0.0.0')
+    port = int(os.getenv('API_PORT', '5000'))
+    debug = os.getenv('FLASK_DEBUG', '1').lower() in ('1', 'true', 'yes')
+    threads = int(os.getenv('API_THREADS', '0'))
+    
+    # Pre-warm the workers and parse paths in the background (not in the debug reloader's watcher process);
+    # /api/ready answers 503 until this has finished
+    if not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        if not warmup.steps:
+            parse_pool.start()
+            render_pool.start()
+        warmup.start()
+    
+    if threads > 0:
+        try:
+            from waitress import serve
+        except ImportError:
+            print("[WARNING] API_THREADS is set but waitress is not installed; using the Flask development server.")
+        else:
+            print(f"[CONFIG] Serving with waitress ({threads} threads)")
+            serve(app, host=host, port=port, threads=threads)
+            return
+    
+    app.run(host=host, port=port, debug=debug, threaded=True)
+
 if __name__ == '__main__':
     print(f"[STARTUP] Starting AI-Powered PDF Parser API...")
     print(f"[CONFIG] AI Parsing Available: {AI_AVAILABLE}")
     print(f"[CONFIG] OpenAI API Key Configured: {bool(os.getenv('OPENAI_API_KEY'))}")
+    if llm_provider is not None and llm_provider.base_url:
+        print(f"[CONFIG] LLM Provider: {llm_provider.name} at {llm_provider.base_url}")
+    
+    if OFFLINE_LLM:
+        print("[WARNING] Using the offline LLM stand-in. Responses are synthetic.")
     
     if not AI_AVAILABLE:
         print("[WARNING] AI parsing is disabled. Set OPENAI_API_KEY environment variable to enable.")
         print("[SETUP] Create a .env file with: OPENAI_API_KEY=your_api_key_here")
+        print("[SETUP] Or point LLM_BASE_URL at an OpenAI-compatible inference server")
     else:
         print("[READY] AI-powered parsing ready! Upload LinkedIn PDFs for intelligent extraction.")
     
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    run_server()
\ No newline at end of file
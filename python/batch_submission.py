@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+Offline bulk LLM extraction for large imports
+Collects the extraction prompts of many documents into batch-job files,
+submits them through a batch backend (OpenAI's Batch API, or a local
+file-based stand-in), polls for completion and maps the results back to
+one ResumeData per document
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from json_salvage import is_truncated, salvage_json
+from memory_budget import MemoryBudget
+from model_router import ModelRouter
+from pdf_extraction import extract_document
+
+BATCH_ENDPOINT = '/v1/chat/completions'
+
+# OpenAI limits a batch input file to 50,000 requests (and 200 MB)
+MAX_REQUESTS_PER_BATCH = 50000
+
+# Terminal states of a batch job (OpenAI's names; the local backend uses the same)
+FINISHED_STATES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    model: str
+    messages: List[Dict[str, str]]
+    max_tokens: int
+    temperature: float = 0.1
+
+    def to_line(self) -> str:
+        """One line of a batch input file (OpenAI Batch API format)"""
+        return json.dumps({
+            'custom_id': self.custom_id,
+            'method': 'POST',
+            'url': BATCH_ENDPOINT,
+            'body': {
+                'model': self.model,
+                'messages': self.messages,
+                'temperature': self.temperature,
+                'max_tokens': self.max_tokens
+            }
+        }, ensure_ascii=False)
+
+
+def parse_output_line(line: str) -> Tuple[str, Dict[str, Any]]:
+    """custom_id and {content, finish_reason, usage} or {error} from one batch output line"""
+    record = json.loads(line)
+    response = record.get('response') or {}
+    if record.get('error') or response.get('status_code', 200) != 200:
+        error = record.get('error') or (response.get('body') or {}).get('error') or response
+        return record['custom_id'], {'error': error.get('message', str(error)) if isinstance(error, dict) else str(error)}
+    body = response.get('body') or {}
+    choice = body['choices'][0]
+    return record['custom_id'], {
+        'content': choice['message']['content'],
+        'finish_reason': choice.get('finish_reason', 'stop'),
+        'usage': body.get('usage') or {}
+    }
+
+
+class BatchBackend:
+    """Submits batch input files and returns their results keyed by custom_id"""
+
+    name = 'base'
+
+    def submit(self, input_path: str) -> str:
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API: results within `completion_window`, billed at the batch discount"""
+
+    name = 'openai'
+
+    def __init__(self, client: Any, completion_window: str = '24h'):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, 'rb') as f:
+            uploaded = self.client.files.create(file=f, purpose='batch')
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        batch = self.client.batches.retrieve(batch_id)
+        results = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if line.strip():
+                    custom_id, result = parse_output_line(line)
+                    results[custom_id] = result
+        return results
+
+
+class LocalBatchBackend(BatchBackend):
+    """File-based stand-in: requests are answered by a chat client in a background thread.
+
+    Jobs live in `directory/<batch_id>/` (input.jsonl, output.jsonl) in the
+    Batch API formats, so imports can be exercised end to end without the
+    real service. A job left unfinished by an earlier process is completed
+    on its next status poll.
+    """
+
+    name = 'local'
+
+    def __init__(self, directory: str, client: Any = None):
+        self.directory = directory
+        if client is None:
+            from offline_llm import OfflineLLMClient
+            client = OfflineLLMClient(latency_ms=0, jitter_ms=0, seed=1)
+        self.client = client
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def _job_dir(self, batch_id: str) -> str:
+        return os.path.join(self.directory, batch_id)
+
+    def submit(self, input_path: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex[:16]}"
+        job_dir = self._job_dir(batch_id)
+        os.makedirs(job_dir)
+        with open(input_path, 'rb') as src, open(os.path.join(job_dir, 'input.jsonl'), 'wb') as dst:
+            dst.write(src.read())
+        thread = threading.Thread(target=self._process, args=(batch_id,), daemon=True)
+        self._threads[batch_id] = thread
+        thread.start()
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        job_dir = self._job_dir(batch_id)
+        if not os.path.isdir(job_dir):
+            return 'failed'
+        if os.path.exists(os.path.join(job_dir, 'output.jsonl')):
+            return 'completed'
+        thread = self._threads.get(batch_id)
+        if thread is None or not thread.is_alive():
+            self._process(batch_id)
+            return 'completed'
+        return 'in_progress'
+
+    def results(self, batch_id: str) -> Dict[str, Dict[str, Any]]:
+        results = {}
+        with open(os.path.join(self._job_dir(batch_id), 'output.jsonl'), encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    custom_id, result = parse_output_line(line)
+                    results[custom_id] = result
+        return results
+
+    def _process(self, batch_id: str):
+        job_dir = self._job_dir(batch_id)
+        lines = []
+        with open(os.path.join(job_dir, 'input.jsonl'), encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                record = {'id': f"req_{uuid.uuid4().hex[:12]}", 'custom_id': request['custom_id'], 'error': None}
+                try:
+                    response = self.client.chat.completions.create(**request['body'])
+                    usage = getattr(response, 'usage', None)
+                    record['response'] = {'status_code': 200, 'body': {
+                        'model': request['body']['model'],
+                        'choices': [{
+                            'index': 0,
+                            'finish_reason': getattr(response.choices[0], 'finish_reason', 'stop'),
+                            'message': {'role': 'assistant', 'content': response.choices[0].message.content}
+                        }],
+                        'usage': {
+                            'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+                            'completion_tokens': getattr(usage, 'completion_tokens', 0)
+                        } if usage is not None else {}
+                    }}
+                except Exception as e:
+                    record['response'] = None
+                    record['error'] = {'message': str(e)}
+                lines.append(json.dumps(record, ensure_ascii=False))
+        tmp_path = os.path.join(job_dir, 'output.jsonl.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines) + ("\n" if lines else ""))
+        os.replace(tmp_path, os.path.join(job_dir, 'output.jsonl'))
+
+
+@dataclass
+class ImportDocument:
+    name: str
+    path: str
+    # custom_ids of this document's requests, in chunk order
+    requests: List[str] = field(default_factory=list)
+    # Set when the document needed no LLM call (layout fast path) or could not be read
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class BulkImport:
+    """One bulk import: documents, their batch requests and the submitted batch jobs.
+
+    The state is kept in `work_dir/manifest.json`, so an import submitted by
+    one process (batch jobs may take hours) can be collected by another.
+    """
+
+    def __init__(self, parser: Any, backend: BatchBackend, work_dir: str,
+                 max_requests_per_batch: int = MAX_REQUESTS_PER_BATCH):
+        self.parser = parser
+        self.backend = backend
+        self.work_dir = work_dir
+        self.max_requests_per_batch = max_requests_per_batch
+        self.documents: List[ImportDocument] = []
+        self.batches: List[Dict[str, Any]] = []
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.work_dir, 'manifest.json')
+
+    def prepare(self, pdf_paths: List[str]) -> List[BatchRequest]:
+        """Extract every document and build its requests ('full' mode prompts, routed per chunk)"""
+        requests = []
+        for doc_index, path in enumerate(pdf_paths):
+            document = ImportDocument(name=os.path.splitext(os.path.basename(path))[0], path=path)
+            self.documents.append(document)
+            try:
+                extracted = extract_document(path, MemoryBudget.from_env())
+                # Recognised export layouts need no LLM call at all
+                resume_data = self.parser.heuristic_parser.parse_layout(extracted, document.metadata)
+                if resume_data is not None:
+                    document.metadata['mode'] = 'layout'
+                    document.result = asdict(resume_data)
+                    continue
+                text = self.parser._normalize_document(extracted, document.metadata)
+                for chunk_index, (system_prompt, user_prompt, route, signals) in \
+                        enumerate(self.parser._extraction_requests(text)):
+                    custom_id = f"doc{doc_index}-chunk{chunk_index}"
+                    requests.append(BatchRequest(
+                        custom_id=custom_id,
+                        model=route.model,
+                        messages=[{"role": "system", "content": system_prompt},
+                                  {"role": "user", "content": user_prompt}],
+                        max_tokens=route.max_tokens
+                    ))
+                    document.requests.append(custom_id)
+                    document.metadata.setdefault('llm_calls', []).append(ModelRouter.describe(route, signals))
+            except Exception as e:
+                document.error = f"Extraction failed: {e}"
+        return requests
+
+    def submit(self, pdf_paths: List[str]) -> List[str]:
+        """Prepare the documents, write the batch input files and submit them; returns the batch ids"""
+        os.makedirs(self.work_dir, exist_ok=True)
+        requests = self.prepare(pdf_paths)
+        for start in range(0, len(requests), self.max_requests_per_batch):
+            part = requests[start:start + self.max_requests_per_batch]
+            input_path = os.path.join(self.work_dir, f"batch-{len(self.batches) + 1:03d}.jsonl")
+            with open(input_path, 'w', encoding='utf-8') as f:
+                for request in part:
+                    f.write(request.to_line() + "\n")
+            batch_id = self.backend.submit(input_path)
+            self.batches.append({'id': batch_id, 'input': input_path, 'requests': len(part), 'status': 'submitted'})
+            print(f"[BATCH] Submitted {batch_id} ({len(part)} requests)", file=sys.stderr)
+        self.save()
+        return [batch['id'] for batch in self.batches]
+
+    def wait(self, poll_interval: float = 30.0, timeout: Optional[float] = None) -> bool:
+        """Poll until every batch has finished; False if `timeout` ran out first"""
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            pending = [batch for batch in self.batches if batch['status'] not in FINISHED_STATES]
+            for batch in pending:
+                batch['status'] = self.backend.status(batch['id'])
+            self.save()
+            pending = [batch for batch in self.batches if batch['status'] not in FINISHED_STATES]
+            if not pending:
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            print(f"[BATCH] {len(pending)} batch(es) pending, next poll in {poll_interval:.0f}s", file=sys.stderr)
+            time.sleep(poll_interval)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Per document: {'data': ResumeData dict, 'metadata': ...} or {'error': ...}
+
+        Chunks whose response is missing or not valid JSON are dropped, as in
+        interactive chunked extraction (truncated responses keep their valid
+        prefix); a document loses its result only when all of its chunks failed.
+        """
+        responses: Dict[str, Dict[str, Any]] = {}
+        for batch in self.batches:
+            if batch['status'] == 'completed':
+                responses.update(self.backend.results(batch['id']))
+
+        collected = {}
+        for document in self.documents:
+            if document.error:
+                collected[document.name] = {'error': document.error}
+                continue
+            if document.result is not None:
+                collected[document.name] = {'data': document.result, 'metadata': document.metadata}
+                continue
+
+            chunk_results, failures = [], []
+            for call, custom_id in zip(document.metadata.get('llm_calls', []), document.requests):
+                response = responses.get(custom_id)
+                if response is None or 'error' in response:
+                    failures.append(f"{custom_id}: {response['error'] if response else 'no response'}")
+                    continue
+                call['usage'] = {
+                    'prompt_tokens': response['usage'].get('prompt_tokens', 0),
+                    'completion_tokens': response['usage'].get('completion_tokens', 0)
+                }
+                try:
+                    chunk_results.append(self.parser._parse_json_response(response['content']))
+                    continue
+                except Exception as e:
+                    error = e
+                # A batch has no follow-up turn; a response cut off at max_tokens keeps its valid prefix
+                salvaged = salvage_json(response['content']) if is_truncated(response['content']) else None
+                if isinstance(salvaged, dict):
+                    call['finish_reason'] = response.get('finish_reason', 'length')
+                    document.metadata.setdefault('truncations', []).append({'outcome': 'salvaged', 'continuations': 0})
+                    chunk_results.append(salvaged)
+                else:
+                    failures.append(f"{custom_id}: {error}")
+
+            metadata = dict(document.metadata, mode='batch')
+            if failures:
+                metadata['failed_chunks'] = failures
+            if not chunk_results:
+                collected[document.name] = {'error': '; '.join(failures) or 'No batch results', 'metadata': metadata}
+                continue
+            structured_data = self.parser._merge_extraction_results(chunk_results)
+            resume_data = self.parser._convert_to_resume_data(structured_data)
+            collected[document.name] = {'data': asdict(resume_data), 'metadata': metadata}
+        return collected
+
+    def save(self):
+        payload = {
+            'backend': self.backend.name,
+            'documents': [asdict(document) for document in self.documents],
+            'batches': self.batches
+        }
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def load(self) -> 'BulkImport':
+        with open(self.manifest_path, encoding='utf-8') as f:
+            payload = json.load(f)
+        if payload.get('backend') != self.backend.name:
+            raise ValueError(f"Import in {self.work_dir} was submitted with the "
+                             f"'{payload.get('backend')}' backend, not '{self.backend.name}'")
+        self.documents = [ImportDocument(**document) for document in payload['documents']]
+        self.batches = payload['batches']
+        return self
+
+
+def build_backend(kind: str, work_dir: str) -> Tuple[BatchBackend, Any]:
+    """The batch backend and the chat client the parser uses for routing (never called in batch mode)"""
+    if kind == 'local':
+        backend = LocalBatchBackend(os.path.join(work_dir, 'local-batches'))
+        return backend, backend.client
+    import openai
+    api_key = os.getenv('OPENAI_API_KEY')
+    if not api_key:
+        raise ValueError("The OpenAI batch backend needs OPENAI_API_KEY")
+    client = openai.OpenAI(api_key=api_key)
+    return OpenAIBatchBackend(client, os.getenv('BATCH_COMPLETION_WINDOW', '24h')), client
+
+
+def _pdf_paths(inputs: List[str]) -> List[str]:
+    paths = []
+    for path in inputs:
+        if os.path.isdir(path):
+            paths.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.lower().endswith('.pdf'))
+        else:
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-import LinkedIn PDFs through batch LLM jobs')
+    parser.add_argument('command', choices=['submit', 'collect', 'run'],
+                        help='submit: write and submit batch jobs; collect: wait and write results; run: both')
+    parser.add_argument('inputs', nargs='*', help='PDF files or directories (submit/run)')
+    parser.add_argument('--work-dir', '-w', required=True, help='Directory for batch files and the import manifest')
+    parser.add_argument('--output-dir', '-o', help='Write one <name>.json result per document (collect/run)')
+    parser.add_argument('--backend', choices=['openai', 'local'], default=os.getenv('BATCH_BACKEND', 'openai'),
+                        help='Batch backend (local: file-based stand-in answered by the offline LLM)')
+    parser.add_argument('--poll-interval', type=float, default=float(os.getenv('BATCH_POLL_INTERVAL', '30')),
+                        help='Seconds between status polls')
+    parser.add_argument('--timeout', type=float, help='Stop waiting after this many seconds (collect again later)')
+
+    args = parser.parse_args()
+
+    try:
+        from ai_pdf_parser import AILinkedInPDFParser
+        from near_duplicate_cache import NearDuplicateCache
+
+        backend, client = build_backend(args.backend, args.work_dir)
+        pdf_parser = AILinkedInPDFParser(client=client, duplicate_cache=NearDuplicateCache(capacity=0))
+        bulk = BulkImport(pdf_parser, backend, args.work_dir,
+                          int(os.getenv('BATCH_MAX_REQUESTS', str(MAX_REQUESTS_PER_BATCH))))
+
+        if args.command in ('submit', 'run'):
+            paths = _pdf_paths(args.inputs)
+            if not paths:
+                parser.error('no PDF files given')
+            bulk.submit(paths)
+            llm_documents = sum(1 for document in bulk.documents if document.requests)
+            print(f"[BATCH] {len(paths)} document(s), {llm_documents} need the LLM; manifest: {bulk.manifest_path}",
+                  file=sys.stderr)
+            if args.command == 'submit':
+                return
+        else:
+            bulk.load()
+
+        if not bulk.wait(args.poll_interval, args.timeout):
+            print("[BATCH] Batches still running; run 'collect' again later", file=sys.stderr)
+            sys.exit(2)
+
+        results = bulk.collect()
+        if args.output_dir:
+            os.makedirs(args.output_dir, exist_ok=True)
+            for name, result in results.items():
+                with open(os.path.join(args.output_dir, f"{name}.json"), 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+        else:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+        failed = [name for name, result in results.items() if 'error' in result]
+        print(f"[BATCH] {len(results) - len(failed)} parsed, {len(failed)} failed", file=sys.stderr)
+
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Parser comparison harness on a labelled corpus
+Runs the heuristic, layout and AI parsing variants over PDFs with
+ground-truth ResumeData JSON and reports field-level precision/recall next
+to latency, LLM tokens and cost
+"""
+
+import argparse
+import difflib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from layout_registry import LayoutRegistry
+from llm_providers import LLMProvider
+from llm_replay import Cassette, RecordingLLMClient, ReplayLLMClient
+from load_test import percentile
+from near_duplicate_cache import NearDuplicateCache
+from pdf_parser import LinkedInPDFParser
+
+# Variant name -> (parser family, AI mode, layout fast path)
+VARIANTS: Dict[str, Tuple[str, Optional[str], bool]] = {
+    'heuristic': ('heuristic', None, False),
+    'layout': ('heuristic', None, True),
+    'ai-full': ('ai', 'full', False),
+    'ai-sections': ('ai', 'sections', False),
+    'ai-pipelined': ('ai', 'pipelined', False),
+    'hybrid': ('ai', 'full', True),
+}
+
+# USD per 1K tokens (input, output); override with --prices
+DEFAULT_PRICES = {
+    'gpt-4': (0.03, 0.06),
+    'gpt-4-turbo': (0.01, 0.03),
+    'gpt-4o': (0.0025, 0.01),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-3.5-turbo': (0.0005, 0.0015),
+}
+
+# Items of list sections are aligned on these fields before their fields are compared
+ITEM_KEYS = {
+    'experience': ['company', 'position'],
+    'education': ['school', 'degree'],
+    'skills': ['name'],
+    'certifications': ['name'],
+    'languages': ['name'],
+}
+LIST_SECTIONS = list(ITEM_KEYS)
+
+# Free-text fields count as correct above this similarity; other fields must match after normalization
+TEXT_FIELDS = {'summary', 'description'}
+TEXT_SIMILARITY = 0.8
+ITEM_MATCH_SIMILARITY = 0.6
+IGNORED_FIELDS = {'id'}
+
+MONTHS = {name: index for index, names in enumerate([
+    ('jan', 'january', 'januar'), ('feb', 'february', 'februar'), ('mar', 'march', 'märz', 'maerz'),
+    ('apr', 'april'), ('may', 'mai'), ('jun', 'june', 'juni'), ('jul', 'july', 'juli'),
+    ('aug', 'august'), ('sep', 'sept', 'september'), ('oct', 'october', 'okt', 'oktober'),
+    ('nov', 'november'), ('dec', 'december', 'dez', 'dezember')], start=1) for name in names}
+
+
+@dataclass
+class FieldCounts:
+    true_positive: int = 0
+    false_positive: int = 0
+    false_negative: int = 0
+
+    def add(self, other: 'FieldCounts'):
+        self.true_positive += other.true_positive
+        self.false_positive += other.false_positive
+        self.false_negative += other.false_negative
+
+    @property
+    def precision(self) -> float:
+        predicted = self.true_positive + self.false_positive
+        return self.true_positive / predicted if predicted else 1.0
+
+    @property
+    def recall(self) -> float:
+        expected = self.true_positive + self.false_negative
+        return self.true_positive / expected if expected else 1.0
+
+    @property
+    def f1(self) -> float:
+        p, r = self.precision, self.recall
+        return 2 * p * r / (p + r) if p + r else 0.0
+
+
+@dataclass
+class DocumentRun:
+    document: str
+    latency_ms: float
+    llm_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cost_usd: float = 0.0
+    mode: str = ""
+    error: str = ""
+    counts: Dict[str, FieldCounts] = field(default_factory=dict)
+
+
+@dataclass
+class VariantReport:
+    variant: str
+    documents: int = 0
+    errors: int = 0
+    precision: float = 0.0
+    recall: float = 0.0
+    f1: float = 0.0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    f1_per_second: float = 0.0
+    llm_calls_per_doc: float = 0.0
+    tokens_per_doc: float = 0.0
+    cost_per_doc_usd: float = 0.0
+    sections: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    runs: List[Dict[str, Any]] = field(default_factory=list)
+
+
+# --- scoring -----------------------------------------------------------------
+
+def normalize_value(name: str, value: Any) -> str:
+    """Canonical form for comparison: case, whitespace, URL prefixes and date formats are ignored"""
+    if isinstance(value, list):
+        value = ' '.join(str(item) for item in value)
+    text = ' '.join(str(value).split()).casefold()
+    if name in ('linkedin', 'website', 'url'):
+        text = re.sub(r'^(?:https?://)?(?:www\.)?', '', text).rstrip('/')
+    elif name in ('start_date', 'end_date', 'date'):
+        text = _normalize_date(text)
+    elif name == 'phone':
+        text = re.sub(r'[^\d+]', '', text)
+    return text
+
+
+def _normalize_date(text: str) -> str:
+    if text in ('present', 'current', 'heute', 'aktuell', 'now'):
+        return 'present'
+    match = re.match(r'^(\d{4})-(\d{1,2})$', text)
+    if match:
+        return f"{match.group(1)}-{int(match.group(2)):02d}"
+    match = re.match(r'^([a-zä]+)\.?\s+(\d{4})$', text)
+    if match and match.group(1) in MONTHS:
+        return f"{match.group(2)}-{MONTHS[match.group(1)]:02d}"
+    return text
+
+
+def _is_empty(value: Any) -> bool:
+    return value in (None, '', [], False)
+
+
+def _values_match(name: str, predicted: Any, expected: Any) -> bool:
+    predicted, expected = normalize_value(name, predicted), normalize_value(name, expected)
+    if name in TEXT_FIELDS:
+        return difflib.SequenceMatcher(None, predicted, expected).ratio() >= TEXT_SIMILARITY
+    return predicted == expected
+
+
+def score_fields(predicted: Dict[str, Any], expected: Dict[str, Any]) -> FieldCounts:
+    """Per-field counts for one record: a non-empty prediction is a TP if it matches, else a FP
+    (and a FN when a value was expected); a missing expected value is a FN"""
+    counts = FieldCounts()
+    for name in set(predicted) | set(expected):
+        if name in IGNORED_FIELDS:
+            continue
+        got, want = predicted.get(name), expected.get(name)
+        if _is_empty(got) and _is_empty(want):
+            continue
+        if _is_empty(got):
+            counts.false_negative += 1
+        elif _is_empty(want):
+            counts.false_positive += 1
+        elif _values_match(name, got, want):
+            counts.true_positive += 1
+        else:
+            counts.false_positive += 1
+            counts.false_negative += 1
+    return counts
+
+
+def _item_key(section: str, item: Dict[str, Any]) -> str:
+    return ' '.join(normalize_value(name, item.get(name, '')) for name in ITEM_KEYS[section])
+
+
+def align_items(section: str, predicted: List[Dict[str, Any]],
+                expected: List[Dict[str, Any]]) -> Tuple[List[Tuple[int, int]], List[int], List[int]]:
+    """Greedy one-to-one alignment of predicted to expected items by key similarity"""
+    predicted_keys = [_item_key(section, item) for item in predicted]
+    expected_keys = [_item_key(section, item) for item in expected]
+
+    # Identical keys pair up directly; only the rest is compared pairwise
+    pairs, used_predicted, used_expected = [], set(), set()
+    unclaimed: Dict[str, List[int]] = {}
+    for j, key in enumerate(expected_keys):
+        unclaimed.setdefault(key, []).append(j)
+    for i, key in enumerate(predicted_keys):
+        if unclaimed.get(key):
+            j = unclaimed[key].pop(0)
+            pairs.append((i, j))
+            used_predicted.add(i)
+            used_expected.add(j)
+
+    candidates = []
+    matcher = difflib.SequenceMatcher()
+    for j, expected_key in enumerate(expected_keys):
+        if j in used_expected:
+            continue
+        matcher.set_seq2(expected_key)
+        for i, predicted_key in enumerate(predicted_keys):
+            if i in used_predicted:
+                continue
+            matcher.set_seq1(predicted_key)
+            if (matcher.real_quick_ratio() >= ITEM_MATCH_SIMILARITY and
+                    matcher.quick_ratio() >= ITEM_MATCH_SIMILARITY):
+                ratio = matcher.ratio()
+                if ratio >= ITEM_MATCH_SIMILARITY:
+                    candidates.append((ratio, i, j))
+    for _, i, j in sorted(candidates, reverse=True):
+        if i not in used_predicted and j not in used_expected:
+            pairs.append((i, j))
+            used_predicted.add(i)
+            used_expected.add(j)
+    unmatched_predicted = [i for i in range(len(predicted)) if i not in used_predicted]
+    unmatched_expected = [j for j in range(len(expected)) if j not in used_expected]
+    return pairs, unmatched_predicted, unmatched_expected
+
+
+def score_resume(predicted: Dict[str, Any], expected: Dict[str, Any]) -> Dict[str, FieldCounts]:
+    """Field-level counts per section for a parsed resume against its ground truth"""
+    sections = {
+        'personal_info': score_fields(predicted.get('personal_info') or {}, expected.get('personal_info') or {}),
+        'summary': score_fields({'summary': predicted.get('summary', '')}, {'summary': expected.get('summary', '')}),
+    }
+    for section in LIST_SECTIONS:
+        got, want = predicted.get(section) or [], expected.get(section) or []
+        counts = FieldCounts()
+        pairs, extra, missing = align_items(section, got, want)
+        for i, j in pairs:
+            counts.add(score_fields(got[i], want[j]))
+        for i in extra:
+            counts.add(score_fields(got[i], {}))
+        for j in missing:
+            counts.add(score_fields({}, want[j]))
+        sections[section] = counts
+    return sections
+
+
+# --- running -----------------------------------------------------------------
+
+def load_labelled_corpus(paths: List[str], truth_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """PDFs with their ground truth (`<name>.json` next to the PDF or in `truth_dir`)"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.lower().endswith('.pdf'))
+        else:
+            files.append(path)
+
+    corpus = []
+    for pdf_path in files:
+        stem = os.path.splitext(os.path.basename(pdf_path))[0]
+        truth_path = os.path.join(truth_dir or os.path.dirname(pdf_path), stem + '.json')
+        truth = None
+        if os.path.exists(truth_path):
+            with open(truth_path, encoding='utf-8') as f:
+                truth = json.load(f)
+        with open(pdf_path, 'rb') as f:
+            corpus.append({'name': os.path.basename(pdf_path), 'data': f.read(),
+                           'truth': truth, 'truth_path': truth_path})
+    if not corpus:
+        raise ValueError("No PDF files found in corpus")
+    return corpus
+
+
+def build_llm_client(kind: str, cassette: Optional[Cassette], replay_latency: bool) -> Any:
+    if kind == 'offline':
+        from offline_llm import OfflineLLMClient
+        return OfflineLLMClient(latency_ms=0, jitter_ms=0, seed=1)
+    if kind == 'replay':
+        return ReplayLLMClient(cassette, replay_latency=replay_latency)
+    # Live calls go to the configured provider (the OpenAI API or an OpenAI-compatible server)
+    live = LLMProvider.from_env().create_client()
+    return RecordingLLMClient(live, cassette) if kind == 'record' else live
+
+
+def build_runner(variant: str, llm_client: Any) -> Callable[[bytes, Dict[str, Any]], Any]:
+    """A function parsing PDF bytes with the variant's parser, filling a metadata dict"""
+    family, mode, use_layouts = VARIANTS[variant]
+    if family == 'heuristic':
+        parser = LinkedInPDFParser()
+        parser.layouts.enabled = use_layouts
+        return lambda data, metadata: parser.parse_pdf(data, metadata=metadata)
+
+    from ai_pdf_parser import AILinkedInPDFParser
+    # No result reuse across documents or repeats: every run must do the full work
+    # The provider maps routed model names the same way whether calls are live, recorded or replayed
+    parser = AILinkedInPDFParser(client=llm_client, duplicate_cache=NearDuplicateCache(capacity=0),
+                                 provider=LLMProvider.from_env())
+    parser.heuristic_parser.layouts = LayoutRegistry(enabled=use_layouts)
+    return lambda data, metadata: parser.parse_pdf(data, metadata=metadata, mode=mode)
+
+
+def call_cost(call: Dict[str, Any], prices: Dict[str, Tuple[float, float]]) -> float:
+    usage = call.get('usage') or {}
+    input_price, output_price = prices.get(call.get('model', ''), (0.0, 0.0))
+    return (usage.get('prompt_tokens', 0) * input_price + usage.get('completion_tokens', 0) * output_price) / 1000.0
+
+
+def run_document(runner: Callable, document: Dict[str, Any], repeats: int,
+                 prices: Dict[str, Tuple[float, float]]) -> DocumentRun:
+    """Parse one document `repeats` times; the median latency and the last result are kept"""
+    timings, metadata, result, error = [], {}, None, ""
+    for _ in range(repeats):
+        metadata = {}
+        start = time.perf_counter()
+        try:
+            result = runner(document['data'], metadata)
+        except Exception as e:
+            error = str(e)
+            result = None
+        timings.append((time.perf_counter() - start) * 1000)
+        if error:
+            break
+
+    calls = metadata.get('llm_calls', [])
+    run = DocumentRun(
+        document=document['name'],
+        latency_ms=round(statistics.median(timings), 2),
+        llm_calls=len(calls),
+        prompt_tokens=sum((call.get('usage') or {}).get('prompt_tokens', 0) for call in calls),
+        completion_tokens=sum((call.get('usage') or {}).get('completion_tokens', 0) for call in calls),
+        cost_usd=round(sum(call_cost(call, prices) for call in calls), 6),
+        mode=metadata.get('mode', ''),
+        error=error
+    )
+    if document['truth'] is not None:
+        # A failed parse predicted nothing, so every expected field counts as missed
+        run.counts = score_resume(asdict(result) if result is not None else {}, document['truth'])
+    return run
+
+
+def summarize(variant: str, runs: List[DocumentRun]) -> VariantReport:
+    report = VariantReport(variant=variant, documents=len(runs))
+    report.errors = sum(1 for run in runs if run.error)
+
+    total = FieldCounts()
+    by_section: Dict[str, FieldCounts] = {}
+    for run in runs:
+        for section, counts in run.counts.items():
+            total.add(counts)
+            by_section.setdefault(section, FieldCounts()).add(counts)
+
+    report.precision, report.recall, report.f1 = round(total.precision, 4), round(total.recall, 4), round(total.f1, 4)
+    report.sections = {section: {'precision': round(c.precision, 4), 'recall': round(c.recall, 4), 'f1': round(c.f1, 4)}
+                       for section, c in by_section.items()}
+
+    latencies = sorted(run.latency_ms for run in runs)
+    mean_ms = statistics.mean(latencies) if latencies else 0.0
+    report.latency_ms = {'mean': round(mean_ms, 2), 'p50': percentile(latencies, 50), 'p95': percentile(latencies, 95)}
+    report.f1_per_second = round(report.f1 / (mean_ms / 1000.0), 3) if mean_ms else 0.0
+    if runs:
+        report.llm_calls_per_doc = round(sum(run.llm_calls for run in runs) / len(runs), 2)
+        report.tokens_per_doc = round(sum(run.prompt_tokens + run.completion_tokens for run in runs) / len(runs), 1)
+        report.cost_per_doc_usd = round(sum(run.cost_usd for run in runs) / len(runs), 5)
+    report.runs = [dict(asdict(run), counts={s: asdict(c) for s, c in run.counts.items()}) for run in runs]
+    return report
+
+
+def print_table(reports: List[VariantReport]):
+    print(f"{'variant':<14} {'docs':>4} {'err':>4} {'prec':>6} {'recall':>6} {'F1':>6} "
+          f"{'mean ms':>9} {'p95 ms':>9} {'F1/s':>9} {'calls':>6} {'tokens':>8} {'$/doc':>9}")
+    for r in reports:
+        print(f"{r.variant:<14} {r.documents:>4} {r.errors:>4} {r.precision:>6.3f} {r.recall:>6.3f} {r.f1:>6.3f} "
+              f"{r.latency_ms['mean']:>9.1f} {r.latency_ms['p95']:>9.1f} {r.f1_per_second:>9.2f} "
+              f"{r.llm_calls_per_doc:>6.2f} {r.tokens_per_doc:>8.0f} {r.cost_per_doc_usd:>9.5f}")
+
+
+def print_sections(reports: List[VariantReport]):
+    sections = ['personal_info', 'summary'] + LIST_SECTIONS
+    print(f"\n{'F1 by section':<14} " + ' '.join(f"{s[:12]:>12}" for s in sections))
+    for r in reports:
+        print(f"{r.variant:<14} " + ' '.join(
+            f"{r.sections[s]['f1']:>12.3f}" if s in r.sections else f"{'-':>12}" for s in sections))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare parser accuracy, latency and cost on a labelled corpus')
+    parser.add_argument('corpus', nargs='+', help='PDF files or directories (ground truth: <name>.json beside each PDF)')
+    parser.add_argument('--truth-dir', help='Directory holding the ground-truth JSON files instead')
+    parser.add_argument('--variants', default='heuristic,layout,ai-full,ai-sections,ai-pipelined,hybrid',
+                        help=f"Comma-separated variants ({', '.join(VARIANTS)})")
+    parser.add_argument('--llm', choices=['offline', 'replay', 'record', 'live'], default='replay',
+                        help='LLM client: synthetic offline stand-in, cassette replay, live with recording, or live')
+    parser.add_argument('--cassette', default='eval_cassette.json', help='Recorded LLM responses for replay/record')
+    parser.add_argument('--replay-latency', action='store_true', help='Delay replayed responses by their recorded latency')
+    parser.add_argument('--repeats', type=int, default=1, help='Parses per document (median latency is reported)')
+    parser.add_argument('--prices', help="JSON file of USD per 1K tokens: {\"model\": [input, output]}")
+    parser.add_argument('--bootstrap-truth', metavar='VARIANT',
+                        help='Write missing ground-truth files from this variant for manual correction, then exit')
+    parser.add_argument('--output', '-o', help='Write machine-readable results to this JSON file')
+
+    args = parser.parse_args()
+
+    try:
+        variants = [v.strip() for v in args.variants.split(',') if v.strip()]
+        unknown = [v for v in variants + ([args.bootstrap_truth] if args.bootstrap_truth else []) if v not in VARIANTS]
+        if unknown:
+            raise ValueError(f"Unknown variant(s): {', '.join(unknown)}")
+
+        prices = dict(DEFAULT_PRICES)
+        if args.prices:
+            with open(args.prices, encoding='utf-8') as f:
+                prices.update({model: tuple(price) for model, price in json.load(f).items()})
+
+        corpus = load_labelled_corpus(args.corpus, args.truth_dir)
+        cassette = Cassette(args.cassette) if args.llm in ('replay', 'record') else None
+        llm_client = build_llm_client(args.llm, cassette, args.replay_latency) \
+            if any(VARIANTS[v][0] == 'ai' for v in variants + [args.bootstrap_truth or 'heuristic']) else None
+
+        if args.bootstrap_truth:
+            runner = build_runner(args.bootstrap_truth, llm_client)
+            for document in corpus:
+                if document['truth'] is None:
+                    with open(document['truth_path'], 'w', encoding='utf-8') as f:
+                        json.dump(asdict(runner(document['data'], {})), f, indent=2, ensure_ascii=False)
+                    print(f"[EVAL] Wrote {document['truth_path']} (review before use)", file=sys.stderr)
+            if cassette is not None and args.llm == 'record':
+                cassette.save()
+            return
+
+        unlabelled = [d['name'] for d in corpus if d['truth'] is None]
+        if unlabelled:
+            print(f"[EVAL] No ground truth for {len(unlabelled)} document(s), timing only: "
+                  f"{', '.join(unlabelled)}", file=sys.stderr)
+
+        reports = []
+        for variant in variants:
+            print(f"[EVAL] Running '{variant}' on {len(corpus)} document(s)", file=sys.stderr)
+            runner = build_runner(variant, llm_client)
+            runs = [run_document(runner, document, args.repeats, prices) for document in corpus]
+            for run in runs:
+                if run.error:
+                    print(f"[EVAL]   {variant} failed on {run.document}: {run.error}", file=sys.stderr)
+            reports.append(summarize(variant, runs))
+
+        if cassette is not None and args.llm == 'record':
+            cassette.save()
+            print(f"[EVAL] Recorded {llm_client.recorded} response(s) to {args.cassette}", file=sys.stderr)
+
+        print_table(reports)
+        print_sections(reports)
+
+        if args.output:
+            output = {
+                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'llm': args.llm,
+                'corpus': [{'name': d['name'], 'labelled': d['truth'] is not None} for d in corpus],
+                'variants': [asdict(report) for report in reports]
+            }
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, sort_keys=True)
+            print(f"Results saved to {args.output}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Recovery of truncated JSON model output
+An incremental scan finds the points where a truncated JSON document could
+end; the longest prefix that parses once its open objects and arrays are
+closed is kept
+"""
+
+import json
+from typing import Any, List, Optional, Tuple
+
+# Cut points tried (latest first) before giving up on a truncated document
+MAX_SALVAGE_ATTEMPTS = 64
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def _scan(text: str) -> Tuple[int, Optional[int], List[Tuple[int, str]]]:
+    """Start of the JSON document, its end (None if truncated) and candidate cuts with their closers.
+
+    A candidate cut lies after a complete string, after an opening or
+    closing bracket, or before a comma (which ends any number or literal).
+    """
+    start = min((i for i in (text.find('{'), text.find('[')) if i >= 0), default=-1)
+    candidates: List[Tuple[int, str]] = []
+    if start < 0:
+        return start, None, candidates
+
+    stack: List[str] = []
+    in_string = escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == '\\':
+                escape = True
+            elif char == '"':
+                in_string = False
+                candidates.append((i + 1, ''.join(_CLOSERS[c] for c in reversed(stack))))
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+            candidates.append((i + 1, ''.join(_CLOSERS[c] for c in reversed(stack))))
+        elif char in '}]':
+            if not stack:
+                break
+            stack.pop()
+            if not stack:
+                return start, i + 1, candidates
+            candidates.append((i + 1, ''.join(_CLOSERS[c] for c in reversed(stack))))
+        elif char == ',':
+            candidates.append((i, ''.join(_CLOSERS[c] for c in reversed(stack))))
+    return start, None, candidates
+
+
+def is_truncated(text: str) -> bool:
+    """True if the text opens a JSON object or array that never closes"""
+    start, end, _ = _scan(text)
+    return start >= 0 and end is None
+
+
+def salvage_json(text: str) -> Optional[Any]:
+    """The longest valid prefix of a (possibly truncated) JSON document, or None.
+
+    Open strings are dropped, and open arrays and objects are closed, so a
+    response cut off inside its fifth experience entry keeps the first four
+    (and whatever fields of the fifth were complete).
+    """
+    start, end, candidates = _scan(text)
+    if start < 0:
+        return None
+    if end is not None:
+        try:
+            return json.loads(text[start:end])
+        except json.JSONDecodeError:
+            pass
+    for cut, closers in reversed(candidates[-MAX_SALVAGE_ATTEMPTS:]):
+        try:
+            return json.loads(text[start:cut] + closers)
+        except json.JSONDecodeError:
+            continue
+    return None
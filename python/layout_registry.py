@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""
+Layout template registry with a coordinate-based fast path
+Recognises known LinkedIn export layouts from a fingerprint of fonts, column
+positions and header styles, and assigns fields directly from geometry and
+font role instead of keyword heuristics or an LLM call
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pdf_extraction import ExtractedDocument
+from pdf_parser import LinkedInPDFParser, ResumeData, PersonalInfo, Experience, Education
+from text_normalization import PAGE_LABEL_PATTERN
+
+# Header spellings of the LinkedIn export not covered by the heuristic parser's list
+EXTRA_SECTION_HEADERS = {
+    'skills': ['top-kenntnisse', 'top kenntnisse'],
+}
+
+# Export sections with no place in the schema; recognised so they end the previous section
+IGNORED_SECTION_HEADERS = [
+    'honors-awards', 'honors & awards', 'publications', 'patents', 'projects', 'volunteer experience',
+    'auszeichnungen', 'publikationen', 'patente', 'projekte', 'ehrenamt'
+]
+
+MAIN_SECTIONS = ('summary', 'experience', 'education')
+
+LOCATION_WORDS = ['area', 'region', 'remote', 'germany', 'deutschland', 'united states', 'united kingdom',
+                  'usa', 'uk', 'france', 'austria', 'österreich', 'switzerland', 'schweiz']
+
+# Font sizes are compared with this tolerance (PDF producers round differently)
+SIZE_TOLERANCE = 0.25
+
+
+@dataclass
+class LayoutTemplate:
+    name: str
+    # Sidebar lines start left of this x coordinate, main column lines at or right of it
+    column_split_x: float
+    # Profile name: the largest text on the first page, in the main column
+    name_min_size: float
+    # [min, max] font sizes of section headers in each column
+    main_header_sizes: List[float] = field(default_factory=list)
+    sidebar_header_sizes: List[float] = field(default_factory=list)
+    # Bold lines at least this large start an entry (company, school)
+    entry_min_size: float = 12.0
+    # Pagination lines at most this large are dropped
+    footer_max_size: float = 9.5
+    # Share of fingerprint checks that must pass, and of lines that must land in a known section
+    min_score: float = 1.0
+    min_coverage: float = 0.8
+
+
+def default_templates() -> List[LayoutTemplate]:
+    """Built-in LinkedIn "Save to PDF" profile export (two columns, US Letter)"""
+    return [
+        LayoutTemplate(name='linkedin-profile', column_split_x=200, name_min_size=20,
+                       main_header_sizes=[15.0, 16.5], sidebar_header_sizes=[12.5, 13.5],
+                       entry_min_size=11.75)
+    ]
+
+
+def _section_type(text: str, parser: LinkedInPDFParser) -> Optional[str]:
+    """Section a header line names ('other' for known sections the schema ignores), else None"""
+    name = text.lower().rstrip(':').strip()
+    for section_type, headers in parser.section_headers.items():
+        if name in headers or name in EXTRA_SECTION_HEADERS.get(section_type, []):
+            return section_type
+    if name in IGNORED_SECTION_HEADERS:
+        return 'other'
+    return None
+
+
+def _size_in(size: float, size_range: List[float]) -> bool:
+    return bool(size_range) and size_range[0] - SIZE_TOLERANCE <= size <= size_range[1] + SIZE_TOLERANCE
+
+
+@dataclass
+class LayoutFingerprint:
+    # Line start positions (10pt buckets) used by at least 5% of the first page's lines
+    columns: List[float]
+    name_size: float
+    name_x: float
+    # Recognised section headers with their position and style
+    headers: List[Dict[str, Any]] = field(default_factory=list)
+
+    def key(self) -> str:
+        """Stable identifier of the layout, for logs and metadata"""
+        style = {
+            'columns': self.columns,
+            'name_size': round(self.name_size),
+            'headers': sorted({(round(h['x'], -1), round(h['size'] * 2) / 2, h['bold']) for h in self.headers})
+        }
+        return hashlib.sha1(json.dumps(style).encode('utf-8')).hexdigest()[:16]
+
+
+def layout_fingerprint(document: ExtractedDocument, parser: LinkedInPDFParser) -> LayoutFingerprint:
+    blocks = document.text_blocks
+    first_page = [block for block in blocks if block['page'] == 0]
+    name_block = max(first_page, key=lambda block: block['font_size'], default=None)
+
+    # The sidebar only runs down the first page, so columns are measured there
+    starts = Counter(round(block['bbox'][0], -1) for block in first_page)
+    threshold = max(2, len(first_page) * 0.05)
+
+    headers = []
+    for block in blocks:
+        section_type = _section_type(block['text'], parser)
+        if section_type:
+            headers.append({'section': section_type, 'x': block['bbox'][0],
+                            'size': block['font_size'], 'bold': block['is_bold']})
+
+    return LayoutFingerprint(
+        columns=sorted(x for x, count in starts.items() if count >= threshold),
+        name_size=name_block['font_size'] if name_block else 0.0,
+        name_x=name_block['bbox'][0] if name_block else 0.0,
+        headers=headers
+    )
+
+
+def template_score(template: LayoutTemplate, fingerprint: LayoutFingerprint) -> float:
+    """Share of the template's layout checks the fingerprint passes"""
+    split = template.column_split_x
+
+    def fits_style(header: Dict[str, Any]) -> bool:
+        if header['x'] >= split:
+            return _size_in(header['size'], template.main_header_sizes)
+        return _size_in(header['size'], template.sidebar_header_sizes)
+
+    checks = [
+        fingerprint.name_size >= template.name_min_size and fingerprint.name_x >= split,
+        any(x < split for x in fingerprint.columns) and any(x >= split for x in fingerprint.columns),
+        any(h['x'] >= split and h['section'] in MAIN_SECTIONS and fits_style(h) for h in fingerprint.headers),
+        any(h['x'] < split and fits_style(h) for h in fingerprint.headers),
+        bool(fingerprint.headers) and
+        sum(1 for h in fingerprint.headers if fits_style(h)) / len(fingerprint.headers) >= 0.75
+    ]
+    return sum(checks) / len(checks)
+
+
+class GeometricExtractor:
+    """Assigns fields of a recognised layout from column, font size and boldness"""
+
+    def __init__(self, template: LayoutTemplate, parser: LinkedInPDFParser):
+        self.template = template
+        self.parser = parser
+
+    def extract(self, document: ExtractedDocument) -> Tuple[ResumeData, float]:
+        """Returns the parsed resume and the share of lines that fell into a known section"""
+        template = self.template
+        sidebar, main = [], []
+        for block in document.text_blocks:
+            if block['font_size'] <= template.footer_max_size and PAGE_LABEL_PATTERN.match(block['text']):
+                continue
+            (sidebar if block['bbox'][0] < template.column_split_x else main).append(block)
+
+        resume = ResumeData(personal_info=PersonalInfo())
+        covered = 0
+
+        for section_type, blocks in self._split_sections(main, template.main_header_sizes):
+            texts = [block['text'] for block in blocks]
+            if section_type is None:
+                self._parse_header(blocks, resume.personal_info)
+            elif section_type == 'summary':
+                resume.summary = ' '.join(texts)
+            elif section_type == 'experience':
+                resume.experience.extend(self._parse_experience(blocks, len(resume.experience)))
+            elif section_type == 'education':
+                resume.education.extend(self._parse_education(blocks, len(resume.education)))
+            else:
+                continue
+            covered += len(blocks) + (section_type is not None)
+
+        for section_type, blocks in self._split_sections(sidebar, template.sidebar_header_sizes):
+            texts = [block['text'] for block in blocks]
+            if section_type == 'personal':
+                self._parse_contact(texts, resume.personal_info)
+            elif section_type == 'skills':
+                resume.skills.extend(self.parser._parse_skill_lines(texts))
+            elif section_type == 'languages':
+                resume.languages.extend(self.parser._parse_language_lines(texts))
+            elif section_type == 'certifications':
+                resume.certifications.extend(self.parser._parse_certification_lines(texts))
+            else:
+                continue
+            covered += len(blocks) + 1
+
+        total = len(sidebar) + len(main)
+        return resume, (covered / total if total else 0.0)
+
+    def _split_sections(self, blocks: List[Dict[str, Any]],
+                        header_sizes: List[float]) -> List[Tuple[Optional[str], List[Dict[str, Any]]]]:
+        """Group a column's lines under its section headers (None for lines before the first header)"""
+        sections = [(None, [])]
+        for block in blocks:
+            section_type = _section_type(block['text'], self.parser)
+            if section_type and _size_in(block['font_size'], header_sizes):
+                sections.append((section_type, []))
+            else:
+                sections[-1][1].append(block)
+        return sections
+
+    def _is_entry_title(self, block: Dict[str, Any]) -> bool:
+        return block['is_bold'] and block['font_size'] >= self.template.entry_min_size - SIZE_TOLERANCE
+
+    @staticmethod
+    def _looks_like_location(text: str) -> bool:
+        lower = text.lower()
+        return (len(text) <= 60 and not text.endswith('.') and
+                (',' in text or any(re.search(rf'\b{re.escape(word)}\b', lower) for word in LOCATION_WORDS)))
+
+    def _parse_header(self, blocks: List[Dict[str, Any]], personal_info: PersonalInfo):
+        """Name, headline and location above the first main-column section"""
+        first_page = [block for block in blocks if block['page'] == 0]
+        if not first_page:
+            return
+        name_block = max(first_page, key=lambda block: block['font_size'])
+        if name_block['font_size'] < self.template.name_min_size:
+            return
+        personal_info.name = name_block['text']
+
+        rest = [block['text'] for block in first_page[first_page.index(name_block) + 1:]]
+        if len(rest) >= 2 or (rest and self._looks_like_location(rest[-1])):
+            # The export always puts the location on the last line under the headline
+            personal_info.location = rest.pop()
+        personal_info.title = ' '.join(rest)
+
+    def _parse_contact(self, texts: List[str], personal_info: PersonalInfo):
+        patterns = self.parser.linkedin_patterns
+        skip_next = False
+        for i, text in enumerate(texts):
+            if skip_next:
+                skip_next = False
+                continue
+            bounded = self.parser._bounded(text)
+            lower = bounded.lower()
+
+            if 'linkedin.com/' in lower:
+                # Long profile URLs wrap onto the next line, which ends with "(LinkedIn)"
+                if '(linkedin)' not in lower and i + 1 < len(texts) and '(linkedin)' in texts[i + 1].lower():
+                    bounded += self.parser._bounded(texts[i + 1])
+                    skip_next = True
+                linkedin_match = re.search(patterns['linkedin_url'], bounded, re.IGNORECASE)
+                if linkedin_match and not personal_info.linkedin:
+                    personal_info.linkedin = linkedin_match.group()
+                continue
+
+            email_match = re.search(patterns['email'], bounded)
+            if email_match:
+                personal_info.email = personal_info.email or email_match.group()
+                continue
+
+            phone_match = re.search(patterns['phone'], bounded)
+            if phone_match:
+                personal_info.phone = personal_info.phone or phone_match.group().strip()
+                continue
+
+            website_match = re.search(patterns['website'], bounded)
+            if website_match and not personal_info.website:
+                personal_info.website = website_match.group()
+
+    def _parse_experience(self, blocks: List[Dict[str, Any]], id_offset: int) -> List[Experience]:
+        """Company (bold) > position > date line > optional location > description, per role"""
+        experiences = []
+        company = ""
+        current = None
+        previous_text = None
+        expect_location = False
+
+        for block in blocks:
+            text = block['text']
+            if self._is_entry_title(block):
+                company, current, previous_text, expect_location = text, None, None, False
+                continue
+
+            # LinkedIn date lines start with the range: "January 2020 - Present (3 years 2 months)"
+            date_match = re.match(self.parser.linkedin_patterns['date_range'], self.parser._bounded(text),
+                                  re.IGNORECASE)
+            if date_match:
+                # The line just above the dates is the role title, not part of the previous description
+                if current is not None and previous_text is not None and current.description[-1:] == [previous_text]:
+                    current.description.pop()
+                end_date = date_match.group(2)
+                current = Experience(
+                    id=str(id_offset + len(experiences) + 1),
+                    position=previous_text or "",
+                    company=company,
+                    start_date=date_match.group(1),
+                    end_date=end_date,
+                    current=end_date.lower() in ('present', 'current', 'heute', 'aktuell')
+                )
+                experiences.append(current)
+                previous_text, expect_location = None, True
+                continue
+
+            if current is not None and expect_location and self._looks_like_location(text):
+                current.location = text
+                expect_location = False
+                continue
+            expect_location = False
+
+            if current is not None:
+                current.description.append(text)
+            previous_text = text
+
+        return experiences
+
+    def _parse_education(self, blocks: List[Dict[str, Any]], id_offset: int) -> List[Education]:
+        """School (bold) followed by degree and dates ("Degree · (2010 - 2012)" or on separate lines)"""
+        education = []
+        current = None
+
+        for block in blocks:
+            text = block['text']
+            if self._is_entry_title(block):
+                current = Education(id=str(id_offset + len(education) + 1), school=text)
+                education.append(current)
+                continue
+            if current is None:
+                continue
+
+            date_match = re.search(r'(\d{4})\s*[-–]\s*(\d{4}|present|heute)', self.parser._bounded(text),
+                                   re.IGNORECASE)
+            if date_match and not current.start_date:
+                current.start_date, current.end_date = date_match.group(1), date_match.group(2)
+                text = text[:date_match.start()].strip(' ·()-–,')
+                if not text:
+                    continue
+
+            if not current.degree:
+                current.degree = text
+            else:
+                current.description = f"{current.description} {text}".strip()
+
+        return education
+
+
+class LayoutRegistry:
+    """Known layouts, tried in order; the first template whose checks pass handles the document"""
+
+    def __init__(self, templates: Optional[List[LayoutTemplate]] = None, enabled: bool = True):
+        self.templates = templates if templates is not None else default_templates()
+        self.enabled = enabled
+
+    @classmethod
+    def from_env(cls) -> 'LayoutRegistry':
+        """LAYOUT_FAST_PATH=0 disables the fast path; LAYOUT_TEMPLATES adds templates from JSON
+        ({"templates": [{"name": ..., "column_split_x": ..., ...}]}), tried before the built-ins"""
+        templates = default_templates()
+        path = os.getenv('LAYOUT_TEMPLATES')
+        if path:
+            with open(path, encoding='utf-8') as f:
+                config = json.load(f)
+            templates = [LayoutTemplate(**template) for template in config.get('templates', [])] + templates
+        enabled = os.getenv('LAYOUT_FAST_PATH', '1').lower() in ('1', 'true', 'yes')
+        return cls(templates, enabled)
+
+    def match(self, document: ExtractedDocument,
+              parser: LinkedInPDFParser) -> Optional[Tuple[LayoutTemplate, float, LayoutFingerprint]]:
+        fingerprint = layout_fingerprint(document, parser)
+        for template in self.templates:
+            score = template_score(template, fingerprint)
+            if score >= template.min_score:
+                return template, score, fingerprint
+        return None
+
+    def extract(self, document: ExtractedDocument,
+                parser: LinkedInPDFParser) -> Tuple[Optional[ResumeData], Optional[Dict[str, Any]]]:
+        """Fast-path parse; returns (None, details) when the layout is unknown or the result is not trusted"""
+        if not self.enabled or not document.text_blocks:
+            return None, None
+        matched = self.match(document, parser)
+        if matched is None:
+            return None, None
+
+        template, score, fingerprint = matched
+        resume, coverage = GeometricExtractor(template, parser).extract(document)
+        accepted = coverage >= template.min_coverage and bool(resume.personal_info.name)
+        details = {
+            'template': template.name,
+            'fingerprint': fingerprint.key(),
+            'score': round(score, 3),
+            'coverage': round(coverage, 3),
+            'accepted': accepted
+        }
+        return (resume if accepted else None), details
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+LLM provider configuration for extraction calls
+A provider is any OpenAI-compatible chat completions endpoint (the public
+API, or a local inference server such as vLLM, llama.cpp or Ollama) with
+its own base URL, credentials, model names, concurrency and timeout
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import openai
+
+DEFAULT_PROVIDER = 'openai'
+
+
+@dataclass
+class LLMProvider:
+    name: str = DEFAULT_PROVIDER
+    # None: the public OpenAI API
+    base_url: Optional[str] = None
+    # Environment variable holding the API key (keys are never stored in config files)
+    api_key_env: str = 'OPENAI_API_KEY'
+    # Served model used for every route; `models` maps individual routed model names instead
+    model: Optional[str] = None
+    models: Dict[str, str] = field(default_factory=dict)
+    # Concurrent requests to this provider (0 = unlimited)
+    max_concurrency: int = 0
+    timeout_seconds: float = 60.0
+    # Local servers usually accept any key; the public API does not
+    requires_api_key: Optional[bool] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def from_file(cls, path: str, name: Optional[str] = None) -> 'LLMProvider':
+        """Load a provider from JSON: {"default": "local", "providers": [{"name": "local", "base_url": ...}]}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        providers = {provider['name']: cls(**provider) for provider in config.get('providers', [])}
+        name = name or config.get('default') or DEFAULT_PROVIDER
+        if name not in providers:
+            raise ValueError(f"Unknown LLM provider '{name}' in {path} (available: {', '.join(sorted(providers))})")
+        return providers[name]
+
+    @classmethod
+    def from_env(cls) -> 'LLMProvider':
+        """LLM_PROVIDERS_CONFIG (+ LLM_PROVIDER to pick one), else LLM_BASE_URL / LLM_MODEL / ..."""
+        path = os.getenv('LLM_PROVIDERS_CONFIG')
+        if path:
+            return cls.from_file(path, os.getenv('LLM_PROVIDER') or None)
+        base_url = os.getenv('LLM_BASE_URL') or None
+        return cls(
+            name=os.getenv('LLM_PROVIDER') or ('custom' if base_url else DEFAULT_PROVIDER),
+            base_url=base_url,
+            api_key_env=os.getenv('LLM_API_KEY_ENV', 'LLM_API_KEY' if base_url else 'OPENAI_API_KEY'),
+            model=os.getenv('LLM_MODEL') or None,
+            max_concurrency=int(os.getenv('LLM_MAX_CONCURRENCY', '0')),
+            timeout_seconds=float(os.getenv('LLM_TIMEOUT_SECONDS', '60'))
+        )
+
+    @property
+    def api_key(self) -> Optional[str]:
+        return os.getenv(self.api_key_env) or None
+
+    @property
+    def key_required(self) -> bool:
+        return self.requires_api_key if self.requires_api_key is not None else self.base_url is None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key) or not self.key_required
+
+    def model_for(self, routed_model: str) -> str:
+        """Served model name for a model chosen by the router"""
+        return self.models.get(routed_model) or self.model or routed_model
+
+    def create_client(self, api_key: Optional[str] = None) -> 'ProviderClient':
+        api_key = api_key or self.api_key
+        if not api_key and self.key_required:
+            raise ValueError(f"An API key is required for the '{self.name}' LLM provider. "
+                             f"Set the {self.api_key_env} environment variable or pass it directly.")
+        return ProviderClient(self, api_key)
+
+    def describe(self) -> Dict[str, Any]:
+        """JSON-ready summary (without credentials)"""
+        return {
+            'name': self.name,
+            'base_url': self.base_url or 'https://api.openai.com/v1',
+            'model': self.model,
+            'max_concurrency': self.max_concurrency,
+            'timeout_seconds': self.timeout_seconds,
+            'configured': self.configured
+        }
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class ProviderClient:
+    """OpenAI-compatible client for one provider, with its concurrency limit and timeout.
+
+    Exposes `chat.completions.create` like `openai.OpenAI`. Retries are left
+    to the parser's rate limiter so a 429 slows down every caller.
+    """
+
+    def __init__(self, provider: LLMProvider, api_key: Optional[str] = None):
+        self.provider = provider
+        self.client = openai.OpenAI(
+            # Local servers ignore the key, but the client library requires one
+            api_key=api_key or 'not-needed',
+            base_url=provider.base_url,
+            timeout=provider.timeout_seconds,
+            max_retries=0,
+            default_headers=provider.headers or None
+        )
+        self._slots = threading.BoundedSemaphore(provider.max_concurrency) if provider.max_concurrency > 0 else None
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Any:
+        if self._slots is None:
+            return self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        with self._slots:
+            return self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+
+    def warm(self, connections: int = 1):
+        """Open pooled connections (TCP and TLS) to the provider with a free request (GET /models)
+
+        Raises the first error if any connection fails, so a dead or
+        misconfigured endpoint is not reported as warm.
+        """
+        if connections <= 1:
+            self.client.models.list()
+            return
+        errors: List[Exception] = []
+
+        def ping():
+            try:
+                self.client.models.list()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=ping) for _ in range(connections)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
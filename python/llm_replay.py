@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Record/replay clients for the OpenAI chat completions API
+Recorded responses (a "cassette" JSON file keyed by the request) let
+evaluations and benchmarks run repeatably without network access
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+
+def request_key(model: str, messages: List[Dict[str, str]], **kwargs) -> str:
+    """Stable key of a completion request (model, messages and sampling/length parameters)"""
+    request = {'model': model, 'messages': messages}
+    request.update({name: value for name, value in kwargs.items() if name in ('temperature', 'max_tokens')})
+    return hashlib.sha256(json.dumps(request, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _response(model: str, record: Dict[str, Any]) -> SimpleNamespace:
+    usage = record.get('usage') or {}
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(
+            index=0,
+            finish_reason=record.get('finish_reason', 'stop'),
+            message=SimpleNamespace(role='assistant', content=record['content'])
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=usage.get('prompt_tokens', 0),
+            completion_tokens=usage.get('completion_tokens', 0),
+            total_tokens=usage.get('prompt_tokens', 0) + usage.get('completion_tokens', 0)
+        )
+    )
+
+
+class Cassette:
+    """Recorded responses, loaded from and saved to a JSON file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.records = json.load(f).get('responses', {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self.records.get(key)
+
+    def put(self, key: str, record: Dict[str, Any]):
+        with self._lock:
+            self.records[key] = record
+
+    def save(self):
+        with self._lock:
+            payload = {'responses': dict(self.records)}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=1, sort_keys=True, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+class _Completions:
+    def __init__(self, create):
+        self.create = create
+
+
+class RecordingLLMClient:
+    """Passes requests to a real client and records each response (with its latency) in a cassette.
+
+    With `reuse=True`, requests already in the cassette are answered from it
+    so an interrupted recording can be resumed without paying twice.
+    """
+
+    def __init__(self, client: Any, cassette: Cassette, reuse: bool = True):
+        self.client = client
+        self.cassette = cassette
+        self.reuse = reuse
+        self.recorded = 0
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> Any:
+        key = request_key(model, messages, **kwargs)
+        if self.reuse:
+            record = self.cassette.get(key)
+            if record is not None:
+                return _response(model, record)
+
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(response, 'usage', None)
+        self.cassette.put(key, {
+            'model': model,
+            'content': response.choices[0].message.content,
+            'finish_reason': getattr(response.choices[0], 'finish_reason', 'stop'),
+            'usage': {
+                'prompt_tokens': getattr(usage, 'prompt_tokens', 0),
+                'completion_tokens': getattr(usage, 'completion_tokens', 0)
+            } if usage is not None else {},
+            'latency_ms': round((time.perf_counter() - start) * 1000, 1)
+        })
+        self.recorded += 1
+        return response
+
+
+class ReplayLLMClient:
+    """Answers requests from a cassette; unknown requests fail instead of reaching the network.
+
+    With `replay_latency`, each response is delayed by its recorded latency so
+    end-to-end timings resemble the live service.
+    """
+
+    def __init__(self, cassette: Cassette, replay_latency: bool = False):
+        self.cassette = cassette
+        self.replay_latency = replay_latency
+        self.replayed = 0
+        self.chat = SimpleNamespace(completions=_Completions(self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> SimpleNamespace:
+        key = request_key(model, messages, **kwargs)
+        record = self.cassette.get(key)
+        if record is None:
+            raise KeyError(f"No recorded response for request {key[:12]} (model {model}); "
+                           f"re-record the cassette {self.cassette.path}")
+        if self.replay_latency and record.get('latency_ms'):
+            time.sleep(record['latency_ms'] / 1000.0)
+        self.replayed += 1
+        return _response(model, record)
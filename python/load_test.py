@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the PDF parser API
+Replays a corpus of PDFs against api_server.py and reports throughput,
+latency percentiles, error rates and server memory over time
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Optional
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api_server.py')
+
+# Replaying a small corpus would otherwise measure cache hits after the first pass
+COLD_CACHE_ENV = {'NEAR_DUP_CACHE_SIZE': '0', 'RESULT_STORE_SIZE': '0', 'SECTION_CACHE_SIZE': '0'}
+
+
+@dataclass
+class ServingConfig:
+    name: str
+    env: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class RequestResult:
+    started_at: float
+    latency_ms: float
+    status: int
+    error: str = ""
+
+
+@dataclass
+class RunReport:
+    config: str
+    env: Dict[str, str]
+    mode: str
+    # 'cold' (result caches disabled), 'warm' (--warm-caches) or 'server' (--url: as that server is configured)
+    caches: str = 'cold'
+    requests: int = 0
+    successes: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    error_rate: float = 0.0
+    duration_s: float = 0.0
+    throughput_rps: float = 0.0
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    memory_mb: List[List[float]] = field(default_factory=list)
+    peak_rss_mb: float = 0.0
+
+
+def parse_config(spec: str) -> ServingConfig:
+    """Parse `name:KEY=VAL,KEY=VAL` into a ServingConfig"""
+    name, _, assignments = spec.partition(':')
+    env = {}
+    for assignment in filter(None, assignments.split(',')):
+        key, sep, value = assignment.partition('=')
+        if not sep:
+            raise ValueError(f"Invalid config assignment '{assignment}' (expected KEY=VALUE)")
+        env[key.strip()] = value.strip()
+    return ServingConfig(name=name.strip() or 'default', env=env)
+
+
+def load_corpus(paths: List[str]) -> List[Dict[str, Any]]:
+    """Collect PDF files from the given files and directories"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(
+                os.path.join(path, name) for name in sorted(os.listdir(path))
+                if name.lower().endswith('.pdf')
+            )
+        else:
+            files.append(path)
+
+    corpus = []
+    for file_path in files:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        corpus.append({
+            'name': os.path.basename(file_path),
+            'data': data,
+            'sha256': hashlib.sha256(data).hexdigest()
+        })
+
+    if not corpus:
+        raise ValueError("No PDF files found in corpus")
+    return corpus
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def encode_multipart(field_name: str, filename: str, data: bytes) -> tuple:
+    """Build a multipart/form-data body for a single file field"""
+    boundary = uuid.uuid4().hex
+    body = b''.join([
+        f'--{boundary}\r\n'.encode(),
+        f'Content-Disposition: form-data; name="{field_name}"; filename="{filename}"\r\n'.encode(),
+        b'Content-Type: application/pdf\r\n\r\n',
+        data,
+        f'\r\n--{boundary}--\r\n'.encode()
+    ])
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc, falling back to ps)"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        output = subprocess.check_output(['ps', '-o', 'rss=', '-p', str(pid)], text=True)
+        return int(output.strip()) / 1024.0
+    except (OSError, subprocess.CalledProcessError, ValueError):
+        return None
+
+
+class MemorySampler(threading.Thread):
+    """Samples a server process's RSS at a fixed interval"""
+
+    def __init__(self, pid: int, interval: float):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.samples: List[List[float]] = []
+        self._stop_event = threading.Event()
+        self._start_time = time.monotonic()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            rss = read_rss_mb(self.pid)
+            if rss is not None:
+                self.samples.append([round(time.monotonic() - self._start_time, 3), round(rss, 2)])
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class LoadGenerator:
+    def __init__(self, base_url: str, endpoint: str, corpus: List[Dict[str, Any]],
+                 timeout: float = 120.0, seed: Optional[int] = None):
+        self.url = base_url.rstrip('/') + endpoint
+        self.corpus = corpus
+        self.timeout = timeout
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.results: List[RequestResult] = []
+
+    def _next_document(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._random.choice(self.corpus)
+
+    def _send_one(self):
+        document = self._next_document()
+        body, content_type = encode_multipart('pdf', document['name'], document['data'])
+        req = urllib.request.Request(self.url, data=body, method='POST',
+                                     headers={'Content-Type': content_type})
+        started = time.monotonic()
+        status, error = 0, ""
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status, error = e.code, f"HTTP {e.code}"
+        except Exception as e:
+            error = type(e).__name__
+
+        result = RequestResult(started_at=started, latency_ms=(time.monotonic() - started) * 1000.0,
+                               status=status, error=error)
+        with self._lock:
+            self.results.append(result)
+
+    def run_closed_loop(self, concurrency: int, duration: Optional[float], total: Optional[int]):
+        """Fixed number of workers, each sending the next request as soon as one completes"""
+        deadline = time.monotonic() + duration if duration else None
+        remaining = [total] if total else None
+        counter_lock = threading.Lock()
+
+        def worker():
+            while True:
+                if deadline and time.monotonic() >= deadline:
+                    return
+                if remaining is not None:
+                    with counter_lock:
+                        if remaining[0] <= 0:
+                            return
+                        remaining[0] -= 1
+                self._send_one()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run_open_loop(self, rate: float, duration: Optional[float], total: Optional[int]):
+        """Poisson arrivals at `rate` requests/second, independent of response times"""
+        start = time.monotonic()
+        deadline = start + duration if duration else None
+        next_arrival = start
+        sent = 0
+        threads = []
+
+        while (total is None or sent < total) and (deadline is None or next_arrival < deadline):
+            delay = next_arrival - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            thread = threading.Thread(target=self._send_one, daemon=True)
+            thread.start()
+            threads.append(thread)
+            sent += 1
+            next_arrival += self._random.expovariate(rate)
+
+        for thread in threads:
+            thread.join()
+
+
+def summarize(config: ServingConfig, mode: str, results: List[RequestResult],
+              duration: float, memory: List[List[float]]) -> RunReport:
+    report = RunReport(config=config.name, env=config.env, mode=mode)
+    report.requests = len(results)
+    report.duration_s = round(duration, 3)
+
+    for result in results:
+        if 200 <= result.status < 300:
+            report.successes += 1
+        else:
+            key = str(result.status) if result.status else result.error or 'unknown'
+            report.errors[key] = report.errors.get(key, 0) + 1
+
+    if results:
+        report.error_rate = round(1 - report.successes / len(results), 4)
+    if duration > 0:
+        report.throughput_rps = round(report.successes / duration, 3)
+
+    latencies = sorted(r.latency_ms for r in results if 200 <= r.status < 300)
+    if latencies:
+        report.latency_ms = {
+            'min': round(latencies[0], 2),
+            'mean': round(sum(latencies) / len(latencies), 2),
+            'p50': round(percentile(latencies, 50), 2),
+            'p95': round(percentile(latencies, 95), 2),
+            'p99': round(percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2)
+        }
+
+    report.memory_mb = memory
+    report.peak_rss_mb = max((sample[1] for sample in memory), default=0.0)
+    return report
+
+
+def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited during startup with code {process.returncode}")
+        try:
+            # Ready, not just up: /api/ready answers 503 until the warm-up is done, so runs never measure a cold start
+            with urllib.request.urlopen(base_url + '/api/ready', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def start_server(config: ServingConfig, port: int, live_llm: bool, warm_caches: bool = False) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({'API_HOST': '127.0.0.1', 'API_PORT': str(port), 'FLASK_DEBUG': '0'})
+    if not live_llm:
+        env['OPENAI_OFFLINE_STUB'] = '1'
+    if not warm_caches:
+        env.update(COLD_CACHE_ENV)
+    env.update(config.env)
+    return subprocess.Popen([sys.executable, SERVER_SCRIPT], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def run_config(config: ServingConfig, args, corpus: List[Dict[str, Any]]) -> RunReport:
+    process = None
+    pid = args.server_pid
+    base_url = args.url
+
+    if not base_url:
+        base_url = f'http://127.0.0.1:{args.port}'
+        process = start_server(config, args.port, args.live_llm, args.warm_caches)
+        pid = process.pid
+        wait_for_server(base_url, process)
+
+    sampler = MemorySampler(pid, args.sample_interval) if pid else None
+    generator = LoadGenerator(base_url, args.endpoint, corpus, timeout=args.timeout, seed=args.seed)
+
+    try:
+        if sampler:
+            sampler.start()
+        start = time.monotonic()
+        if args.rate:
+            generator.run_open_loop(args.rate, args.duration, args.requests)
+            mode = f'open-loop rate={args.rate}/s'
+        else:
+            generator.run_closed_loop(args.concurrency, args.duration, args.requests)
+            mode = f'closed-loop concurrency={args.concurrency}'
+        elapsed = time.monotonic() - start
+    finally:
+        if sampler:
+            sampler.stop()
+        if process:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    report = summarize(config, mode, generator.results, elapsed, sampler.samples if sampler else [])
+    report.caches = 'server' if args.url else 'warm' if args.warm_caches else 'cold'
+    return report
+
+
+def print_table(reports: List[RunReport]):
+    header = f"{'config':<20} {'caches':<6} {'reqs':>6} {'ok':>6} {'err%':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'peakMB':>8}"
+    print(header)
+    print('-' * len(header))
+    for r in reports:
+        lat = r.latency_ms
+        print(f"{r.config:<20} {r.caches:<6} {r.requests:>6} {r.successes:>6} {r.error_rate * 100:>5.1f}% "
+              f"{r.throughput_rps:>8.2f} {lat.get('p50', 0):>9.1f} {lat.get('p95', 0):>9.1f} "
+              f"{lat.get('p99', 0):>9.1f} {r.peak_rss_mb:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the PDF parser API')
+    parser.add_argument('corpus', nargs='+', help='PDF files or directories of PDFs to replay')
+    parser.add_argument('--config', action='append', default=[],
+                        help="Serving configuration to start and test, as 'name:KEY=VAL,KEY=VAL' (repeatable)")
+    parser.add_argument('--url', help='Test an already running server instead of starting one per config')
+    parser.add_argument('--server-pid', type=int, help='PID of the server given by --url, for memory sampling')
+    parser.add_argument('--endpoint', default='/api/parse-pdf', help='Endpoint to POST PDFs to')
+    parser.add_argument('--concurrency', '-c', type=int, default=4, help='Closed-loop concurrency')
+    parser.add_argument('--rate', '-r', type=float, help='Open-loop arrival rate (requests/second)')
+    parser.add_argument('--duration', '-d', type=float, help='Run length in seconds per config')
+    parser.add_argument('--requests', '-n', type=int, help='Total requests per config')
+    parser.add_argument('--port', type=int, default=5055, help='Port for servers started by the harness')
+    parser.add_argument('--live-llm', action='store_true', help='Use the real LLM instead of the offline stand-in')
+    parser.add_argument('--warm-caches', action='store_true',
+                        help='Keep the result caches enabled in started servers (by default they are disabled, '
+                             'so repeated corpus documents are parsed every time)')
+    parser.add_argument('--sample-interval', type=float, default=0.5, help='Memory sampling interval in seconds')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Per-request timeout in seconds')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for document selection and arrivals')
+    parser.add_argument('--output', '-o', help='Write machine-readable results to this JSON file')
+
+    args = parser.parse_args()
+
+    if not args.duration and not args.requests:
+        args.requests = 50
+    if args.url and len(args.config) > 1:
+        parser.error('--url tests a single running server; use one --config (name only) or none')
+
+    try:
+        corpus = load_corpus(args.corpus)
+        configs = [parse_config(spec) for spec in args.config] or [ServingConfig(name='default')]
+
+        reports = []
+        for config in configs:
+            print(f"[LOAD] Running config '{config.name}' {config.env}", file=sys.stderr)
+            reports.append(run_config(config, args, corpus))
+
+        print_table(reports)
+
+        if args.output:
+            output = {
+                'generated_at': datetime.now(timezone.utc).isoformat(),
+                'endpoint': args.endpoint,
+                'corpus': [{'name': d['name'], 'sha256': d['sha256'], 'bytes': len(d['data'])} for d in corpus],
+                'runs': [asdict(report) for report in reports]
+            }
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(output, f, indent=2, sort_keys=True)
+            print(f"Results saved to {args.output}")
+
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
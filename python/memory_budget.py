@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Per-request memory accounting for PDF extraction
+Tracks the estimated size of retained extraction data against a budget and
+degrades in defined steps before refusing the document
+"""
+
+import os
+import sys
+from typing import Dict, List, Any
+
+# Degradation steps, in the order they are applied
+DEGRADE_SPAN_FONTS = 'span_fonts_dropped'
+DEGRADE_PAGE_LIMIT = 'page_limit'
+
+# Approximate retained sizes of the containers built per line / per span
+LINE_BLOCK_OVERHEAD = 600
+SPAN_FONT_OVERHEAD = 400
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when a document needs more memory than the request budget allows"""
+
+
+def text_bytes(text: str) -> int:
+    return sys.getsizeof(text)
+
+
+class MemoryBudget:
+    """Estimated memory use of one parse request.
+
+    - Above `font_threshold` of the limit, per-span font details are dropped
+      (line-level bold/size aggregates are kept, so parsing is unaffected).
+    - Above `page_threshold`, extraction stops once `degraded_max_pages`
+      pages have been read.
+    - Above the limit, the request is refused with MemoryBudgetExceeded.
+    """
+
+    def __init__(self, limit_bytes: int, font_threshold: float = 0.5, page_threshold: float = 0.8,
+                 degraded_max_pages: int = 10):
+        self.limit_bytes = limit_bytes
+        self.font_threshold = font_threshold
+        self.page_threshold = page_threshold
+        self.degraded_max_pages = degraded_max_pages
+        self.used_bytes = 0
+        self.peak_bytes = 0
+        self.degradations: List[str] = []
+        self.pages_processed = 0
+        self.page_count = 0
+
+    @classmethod
+    def from_env(cls) -> 'MemoryBudget':
+        return cls(
+            limit_bytes=int(float(os.getenv('PARSE_MEMORY_BUDGET_MB', '256')) * 1024 * 1024),
+            degraded_max_pages=int(os.getenv('PARSE_DEGRADED_MAX_PAGES', '10'))
+        )
+
+    def charge(self, nbytes: int):
+        self.used_bytes += nbytes
+        self.peak_bytes = max(self.peak_bytes, self.used_bytes)
+        if self.limit_bytes <= 0:
+            return
+        if self.used_bytes > self.limit_bytes:
+            raise MemoryBudgetExceeded(
+                f"Document exceeds the per-request memory budget of {self.limit_bytes / 1048576:.1f} MB "
+                f"after {self.pages_processed} of {self.page_count} pages"
+            )
+        usage = self.used_bytes / self.limit_bytes
+        if usage >= self.font_threshold and DEGRADE_SPAN_FONTS not in self.degradations:
+            self.degradations.append(DEGRADE_SPAN_FONTS)
+        if usage >= self.page_threshold and DEGRADE_PAGE_LIMIT not in self.degradations:
+            self.degradations.append(DEGRADE_PAGE_LIMIT)
+
+    def release(self, nbytes: int):
+        self.used_bytes = max(0, self.used_bytes - nbytes)
+
+    @property
+    def keep_span_fonts(self) -> bool:
+        return DEGRADE_SPAN_FONTS not in self.degradations
+
+    def should_stop(self) -> bool:
+        """True when no further pages should be extracted"""
+        return (DEGRADE_PAGE_LIMIT in self.degradations and
+                self.pages_processed >= self.degraded_max_pages)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'peak_mb': round(self.peak_bytes / 1048576, 3),
+            'limit_mb': round(self.limit_bytes / 1048576, 3),
+            'degradations': list(self.degradations),
+            'pages_processed': self.pages_processed,
+            'page_count': self.page_count
+        }
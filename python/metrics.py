@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+In-process service metrics for the API server
+Rolling latency windows with percentiles and latency targets, plus counters
+and gauges, reported as JSON by /api/metrics
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+
+def _percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LatencyTracker:
+    """Latencies of one endpoint over the last `window` requests.
+
+    With a `target_p99_ms`, the snapshot reports whether the window's p99 is
+    within the target and how many requests (in total) exceeded it.
+    """
+
+    def __init__(self, name: str, target_p99_ms: Optional[float] = None, window: int = 1000):
+        self.name = name
+        self.target_p99_ms = target_p99_ms
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.over_target = 0
+        self.statuses: Dict[int, int] = {}
+
+    def record(self, duration_ms: float, status: int = 200):
+        with self._lock:
+            self._samples.append((time.time(), duration_ms))
+            self.count += 1
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status >= 500:
+                self.errors += 1
+            if self.target_p99_ms is not None and duration_ms > self.target_p99_ms:
+                self.over_target += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self._samples)
+            result = {
+                'count': self.count,
+                'errors': self.errors,
+                'statuses': {str(status): n for status, n in sorted(self.statuses.items())}
+            }
+            over_target = self.over_target
+        latencies = sorted(duration for _, duration in samples)
+        result['window'] = len(latencies)
+        result['latency_ms'] = {
+            'mean': round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+            'p50': round(_percentile(latencies, 50), 2),
+            'p95': round(_percentile(latencies, 95), 2),
+            'p99': round(_percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        }
+        if samples:
+            span = samples[-1][0] - samples[0][0]
+            result['rate_rps'] = round((len(samples) - 1) / span, 2) if span > 0 else 0.0
+        if self.target_p99_ms is not None:
+            result['target_p99_ms'] = self.target_p99_ms
+            result['within_target'] = result['latency_ms']['p99'] <= self.target_p99_ms
+            result['over_target'] = over_target
+        return result
+
+
+class MetricsRegistry:
+    """Named latency trackers, counters and gauges (callables evaluated at snapshot time)"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.started_at = time.time()
+        self._trackers: Dict[str, LatencyTracker] = {}
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Callable[[], Any]] = {}
+        self._lock = threading.Lock()
+
+    def tracker(self, name: str, target_p99_ms: Optional[float] = None) -> LatencyTracker:
+        with self._lock:
+            tracker = self._trackers.get(name)
+            if tracker is None:
+                tracker = self._trackers[name] = LatencyTracker(name, target_p99_ms, self.window)
+            return tracker
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def gauge(self, name: str, fn: Callable[[], Any]):
+        with self._lock:
+            self._gauges[name] = fn
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            trackers = dict(self._trackers)
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+        gauge_values = {}
+        for name, fn in gauges.items():
+            try:
+                gauge_values[name] = fn()
+            except Exception as e:
+                gauge_values[name] = f"error: {e}"
+        return {
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'endpoints': {name: tracker.snapshot() for name, tracker in trackers.items()},
+            'counters': counters,
+            'gauges': gauge_values
+        }
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Cost/latency-aware model routing for LLM extraction calls
+Chooses the model and output budget from the input size, the sections it
+contains and the heuristic parser's confidence
+"""
+
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional
+
+
+@dataclass
+class Route:
+    name: str
+    model: str
+    max_tokens: int
+    # Conditions (all must hold); zero/empty means "no constraint"
+    max_input_tokens: int = 0
+    sections: List[str] = field(default_factory=list)
+    min_confidence: float = 0.0
+
+
+@dataclass
+class RoutingSignals:
+    input_tokens: int
+    sections: List[str] = field(default_factory=list)
+    heuristic_confidence: float = 0.0
+
+
+def default_routes() -> List[Route]:
+    """Built-in routing table; the final catch-all honours OPENAI_MODEL / OPENAI_MAX_TOKENS"""
+    return [
+        # A chunk holding only list-like sidebar sections needs neither a large model nor a large budget
+        Route(name='list-sections', model='gpt-4o-mini', max_tokens=800,
+              max_input_tokens=1500, sections=['skills', 'languages', 'certifications']),
+        # Short, well-structured profiles the heuristic parser already understands
+        Route(name='small-structured', model='gpt-4o-mini', max_tokens=1500,
+              max_input_tokens=2500, min_confidence=0.6),
+        Route(name='default', model=os.getenv('OPENAI_MODEL', 'gpt-4'),
+              max_tokens=int(os.getenv('OPENAI_MAX_TOKENS', '2000')))
+    ]
+
+
+class ModelRouter:
+    """Picks the first route in the table whose conditions match the signals"""
+
+    def __init__(self, routes: Optional[List[Route]] = None):
+        # Copied: the catch-all below must not be appended to the caller's list
+        self.routes = list(routes or default_routes())
+        if any(self._is_conditional(route) for route in self.routes[-1:]):
+            # Always keep a catch-all so every input gets a route
+            self.routes.append(default_routes()[-1])
+
+    @classmethod
+    def from_file(cls, path: str) -> 'ModelRouter':
+        """Load a routing table from JSON: {"routes": [{"name": ..., "model": ..., ...}]}"""
+        with open(path, encoding='utf-8') as f:
+            config = json.load(f)
+        return cls([Route(**route) for route in config.get('routes', [])])
+
+    @classmethod
+    def from_env(cls) -> 'ModelRouter':
+        path = os.getenv('MODEL_ROUTING_CONFIG')
+        return cls.from_file(path) if path else cls()
+
+    @staticmethod
+    def _is_conditional(route: Route) -> bool:
+        return bool(route.max_input_tokens or route.sections or route.min_confidence)
+
+    def route(self, signals: RoutingSignals) -> Route:
+        for route in self.routes:
+            if route.max_input_tokens and signals.input_tokens > route.max_input_tokens:
+                continue
+            if route.sections and (not signals.sections or
+                                   not set(signals.sections) <= set(route.sections)):
+                continue
+            if route.min_confidence and signals.heuristic_confidence < route.min_confidence:
+                continue
+            return route
+        return self.routes[-1]
+
+    @staticmethod
+    def describe(route: Route, signals: RoutingSignals) -> Dict[str, Any]:
+        """JSON-ready record of a routing decision"""
+        return {
+            'route': route.name,
+            'model': route.model,
+            'max_tokens': route.max_tokens,
+            'signals': asdict(signals)
+        }
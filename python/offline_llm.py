@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Offline stand-in for the OpenAI chat completions client
+Lets the API server and parsers run without network access or an API key
+(load tests, local development) while keeping realistic response latency
+"""
+
+import json
+import random
+import re
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional
+
+
+class _OfflineCompletions:
+    def __init__(self, owner: 'OfflineLLMClient'):
+        self._owner = owner
+
+    def create(self, model: str, messages: List[Dict[str, str]], **kwargs) -> SimpleNamespace:
+        return self._owner._complete(model, messages, **kwargs)
+
+
+class OfflineLLMClient:
+    """Mimics the subset of `openai.OpenAI` used by AILinkedInPDFParser.
+
+    Responses are deterministic JSON documents derived from the prompt text,
+    delivered after a configurable latency (plus optional jitter) so that
+    concurrency behaviour under load resembles the real service.
+    """
+
+    def __init__(self, latency_ms: float = 800.0, jitter_ms: float = 200.0, seed: Optional[int] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self._random = random.Random(seed)
+        self.chat = SimpleNamespace(completions=_OfflineCompletions(self))
+
+    def _complete(self, model: str, messages: List[Dict[str, str]], **kwargs) -> SimpleNamespace:
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+        # A continuation request carries the partial response as an assistant turn
+        roles = [message.get("role") for message in messages]
+        original = messages[:roles.index("assistant")] if "assistant" in roles else messages
+        prompt_text = "\n".join(message.get("content", "") for message in messages)
+        content = json.dumps(self._synthesize("\n".join(message.get("content", "") for message in original)))
+        if len(original) < len(messages):
+            partial = original and messages[len(original)].get("content", "")
+            if partial and content.startswith(partial):
+                content = content[len(partial):]
+
+        # Honour the output limit like the real service (about 4 characters per token)
+        finish_reason = "stop"
+        max_tokens = kwargs.get("max_tokens")
+        if max_tokens and len(content) > max_tokens * 4:
+            content = content[:max_tokens * 4]
+            finish_reason = "length"
+
+        return SimpleNamespace(
+            model=model,
+            choices=[SimpleNamespace(
+                index=0,
+                finish_reason=finish_reason,
+                message=SimpleNamespace(role="assistant", content=content)
+            )],
+            usage=SimpleNamespace(
+                prompt_tokens=len(prompt_text) // 4,
+                completion_tokens=len(content) // 4,
+                total_tokens=(len(prompt_text) + len(content)) // 4
+            )
+        )
+
+    def _synthesize(self, prompt_text: str) -> Dict[str, Any]:
+        """Build a schema-shaped result from the document text in the prompt"""
+        match = re.search(r'text(?: chunk)?:\n\n(.*?)\n\nReturn', prompt_text, re.DOTALL)
+        document_text = match.group(1) if match else prompt_text
+        lines = [line.strip() for line in document_text.splitlines() if line.strip()]
+
+        email = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*\.[a-zA-Z]{2,}', document_text)
+        linkedin = re.search(r'linkedin\.com/in/\S+', document_text, re.IGNORECASE)
+
+        return {
+            "personal_info": {
+                "name": lines[0] if lines else "",
+                "title": lines[1] if len(lines) > 1 else "",
+                "email": email.group() if email else "",
+                "phone": "",
+                "location": "",
+                "linkedin": linkedin.group() if linkedin else "",
+                "website": ""
+            },
+            "summary": "",
+            "experience": [],
+            "education": [],
+            "skills": [],
+            "certifications": [],
+            "languages": []
+        }
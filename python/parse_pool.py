@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Process pool for the CPU-bound parsing stages
+PDF decoding and text extraction run in pre-warmed worker processes so
+concurrent uploads are not serialized by the GIL; upload bytes reach the
+workers through shared memory instead of a pickled copy
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, Optional, Tuple
+
+from memory_budget import MemoryBudget
+from pdf_extraction import ExtractedDocument, extract_document
+
+
+def _warm_worker():
+    """Worker initializer: import and exercise PyMuPDF once before the first real job"""
+    import fitz  # noqa: F401  (loads the MuPDF library)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "warm-up")
+    extract_document(doc.tobytes())
+    doc.close()
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _read_shared_pdf(shm_name: str, size: int) -> bytes:
+    # Spawned workers share the parent's resource tracker, so attaching here does not
+    # take ownership; the parent unlinks the segment once the job is done
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        return bytes(shm.buf[:size])
+    finally:
+        shm.close()
+
+
+def _extract_shared(shm_name: str, size: int) -> Tuple[ExtractedDocument, Dict[str, Any]]:
+    """Worker job: decode the PDF held in shared memory under a fresh per-request budget
+
+    The document is pickled back to the parent, so only what the parse stages
+    read is returned: per-span font details and `lines` (a copy of each
+    block's text, rebuilt by the parent) are dropped, about a quarter of the
+    pickled size.
+    """
+    budget = MemoryBudget.from_env()
+    try:
+        document = extract_document(_read_shared_pdf(shm_name, size), budget)
+    finally:
+        memory = budget.summary()
+    for block in document.text_blocks:
+        block['fonts'] = []
+    document.lines = []
+    return document, memory
+
+
+class ParsePool:
+    """Pre-warmed worker processes for PDF extraction.
+
+    Workers are recycled after `max_tasks_per_child` jobs to contain leaks in
+    the native PDF library. With `workers` set to 0 the pool is disabled and
+    callers parse in-process. Processes are started by `start()` (or the first
+    job), never on construction, because spawned workers re-import the
+    server's main module.
+    """
+
+    def __init__(self, workers: int = 0, max_tasks_per_child: int = 100):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'ParsePool':
+        return cls(
+            workers=int(os.getenv('PARSE_POOL_WORKERS', '0')),
+            max_tasks_per_child=int(os.getenv('PARSE_POOL_MAX_TASKS', '100'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> Tuple[ProcessPoolExecutor, bool]:
+        """The running executor (created if needed) and whether it was just created"""
+        with self._lock:
+            if self._executor is not None:
+                return self._executor, False
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                # 'spawn': recycling workers is not supported with 'fork', and forking a threaded server is unsafe
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_warm_worker,
+                max_tasks_per_child=self.max_tasks_per_child or None
+            )
+            return self._executor, True
+
+    def start(self) -> 'ParsePool':
+        """Start the worker processes and wait until each has warmed up"""
+        if not self.enabled:
+            return self
+        executor, created = self._get_executor()
+        if created:
+            for future in [executor.submit(_ping) for _ in range(self.workers)]:
+                future.result()
+            print(f"[POOL] {self.workers} parse worker process(es) ready")
+        return self
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def extract(self, pdf_bytes: bytes) -> Tuple[ExtractedDocument, Dict[str, Any]]:
+        """Extract a PDF in a worker process; returns the document and its memory budget summary"""
+        # One reference for the whole job: shutdown() may clear self._executor meanwhile
+        executor, _ = self._get_executor()
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(pdf_bytes)))
+        try:
+            shm.buf[:len(pdf_bytes)] = pdf_bytes
+            document, memory = executor.submit(_extract_shared, shm.name, len(pdf_bytes)).result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. crashed in native code); replace the pool for later requests,
+            # unless another request already has
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise Exception(f"Parse worker process failed: {e}")
+        finally:
+            shm.close()
+            shm.unlink()
+        document.lines = [block['text'] for block in document.text_blocks]
+        return document, memory
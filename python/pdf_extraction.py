@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Shared single-pass PDF extraction for both LinkedIn parsers
+Opens the document once and builds each page's text page once, producing the
+structured line/font blocks, the plain text and (optionally) words from it
+"""
+
+import fitz  # PyMuPDF
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Any, Optional, Union
+from memory_budget import MemoryBudget, LINE_BLOCK_OVERHEAD, SPAN_FONT_OVERHEAD, text_bytes
+
+# Same flags as a plain page.get_text(), so the text output is unchanged; image
+# blocks are never needed by the parsers
+TEXTPAGE_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+PdfSource = Union[str, bytes, bytearray, memoryview, 'fitz.Document']
+
+
+@dataclass
+class ExtractedDocument:
+    text_blocks: List[Dict[str, Any]] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)
+    page_texts: List[str] = field(default_factory=list)
+    page_count: int = 0
+    words: Optional[List[tuple]] = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self.page_texts)
+
+    def structured_content(self) -> Dict[str, Any]:
+        """The content dict consumed by LinkedInPDFParser._parse_structured_data"""
+        return {
+            'text_blocks': self.text_blocks,
+            'lines': self.lines,
+            'fonts': {},
+            'page_count': self.page_count
+        }
+
+
+def open_pdf(source: PdfSource) -> 'fitz.Document':
+    """Open a PDF from a path or from in-memory bytes"""
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=bytes(source), filetype="pdf")
+
+
+def extract_document(source: PdfSource, budget: Optional[MemoryBudget] = None,
+                     include_words: bool = False) -> ExtractedDocument:
+    """Decode the PDF exactly once.
+
+    `source` may be a path, PDF bytes or an already open document (which is
+    left open). With a memory budget, retained data is accounted and
+    extraction degrades (per-span fonts dropped, then page limit) as the
+    budget fills up.
+    """
+    owns_document = not isinstance(source, fitz.Document)
+    doc = open_pdf(source) if owns_document else source
+
+    try:
+        result = ExtractedDocument(page_count=len(doc), words=[] if include_words else None)
+        if budget:
+            budget.page_count = len(doc)
+
+        for page_num in range(len(doc)):
+            if budget and budget.should_stop():
+                break
+            page = doc[page_num]
+            textpage = page.get_textpage(flags=TEXTPAGE_FLAGS)
+
+            page_text = page.get_text("text", textpage=textpage)
+            result.page_texts.append(page_text)
+            if budget:
+                budget.charge(text_bytes(page_text))
+
+            _append_line_blocks(result.text_blocks, page.get_text("dict", textpage=textpage),
+                                page_num, budget)
+
+            if include_words:
+                result.words.extend(
+                    word + (page_num,) for word in page.get_text("words", textpage=textpage)
+                )
+
+            if budget:
+                budget.pages_processed = page_num + 1
+    finally:
+        if owns_document:
+            doc.close()
+
+    # Sort by position (top to bottom, left to right)
+    result.text_blocks.sort(key=lambda x: (x['page'], x['bbox'][1], x['bbox'][0]))
+    result.lines = [block['text'] for block in result.text_blocks]
+
+    return result
+
+
+def iter_page_texts(source: PdfSource, budget: Optional[MemoryBudget] = None) -> Iterator[str]:
+    """Lazily yield the plain text of each page (for pipelined processing)"""
+    owns_document = not isinstance(source, fitz.Document)
+    doc = open_pdf(source) if owns_document else source
+
+    try:
+        if budget:
+            budget.page_count = len(doc)
+        for page_num in range(len(doc)):
+            if budget and budget.should_stop():
+                break
+            page_text = doc[page_num].get_text("text", flags=TEXTPAGE_FLAGS)
+            if budget:
+                budget.charge(text_bytes(page_text))
+                budget.pages_processed = page_num + 1
+            yield page_text
+    finally:
+        if owns_document:
+            doc.close()
+
+
+def iter_page_blocks(source: PdfSource, budget: Optional[MemoryBudget] = None) -> Iterator[List[Dict[str, Any]]]:
+    """Lazily yield each page's line blocks, in the same order as extract_document's text_blocks.
+
+    Only the current page is held: its blocks are charged to the budget while
+    the caller works on them and released when the next page is requested.
+    """
+    owns_document = not isinstance(source, fitz.Document)
+    doc = open_pdf(source) if owns_document else source
+
+    try:
+        if budget:
+            budget.page_count = len(doc)
+        for page_num in range(len(doc)):
+            if budget and budget.should_stop():
+                break
+            charged_before = budget.used_bytes if budget else 0
+            page_blocks: List[Dict[str, Any]] = []
+            _append_line_blocks(page_blocks, doc[page_num].get_text("dict", flags=TEXTPAGE_FLAGS),
+                                page_num, budget)
+            # Same key as the global sort in extract_document; pages already come in order
+            page_blocks.sort(key=lambda x: (x['bbox'][1], x['bbox'][0]))
+            if budget:
+                budget.pages_processed = page_num + 1
+            yield page_blocks
+            if budget:
+                budget.release(budget.used_bytes - charged_before)
+    finally:
+        if owns_document:
+            doc.close()
+
+
+def _append_line_blocks(text_blocks: List[Dict[str, Any]], text_dict: Dict[str, Any], page_num: int,
+                        budget: Optional[MemoryBudget] = None):
+    """Turn one page's text dict into line blocks with positioning and font information"""
+    for block in text_dict["blocks"]:
+        if "lines" in block:
+            for line in block["lines"]:
+                line_text = ""
+                line_fonts = []
+
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if text:
+                        line_text += text + " "
+                        font_info = {
+                            'font': span.get('font', ''),
+                            'size': span.get('size', 12),
+                            'flags': span.get('flags', 0),
+                            'color': span.get('color', 0)
+                        }
+                        line_fonts.append(font_info)
+
+                if line_text.strip():
+                    keep_fonts = budget.keep_span_fonts if budget else True
+                    text_blocks.append({
+                        'text': line_text.strip(),
+                        'bbox': line["bbox"],
+                        'page': page_num,
+                        'fonts': line_fonts if keep_fonts else [],
+                        'is_bold': any(f.get('flags', 0) & 2**4 for f in line_fonts),
+                        'font_size': max([f.get('size', 12) for f in line_fonts]) if line_fonts else 12
+                    })
+                    if budget:
+                        budget.charge(LINE_BLOCK_OVERHEAD + text_bytes(line_text) +
+                                      (SPAN_FONT_OVERHEAD * len(line_fonts) if keep_fonts else 0))
+                        if keep_fonts and not budget.keep_span_fonts:
+                            _drop_span_fonts(text_blocks, budget)
+
+
+def _drop_span_fonts(text_blocks: List[Dict[str, Any]], budget: MemoryBudget):
+    """First degradation step: release per-span font details already collected"""
+    for block in text_blocks:
+        if block['fonts']:
+            budget.release(SPAN_FONT_OVERHEAD * len(block['fonts']))
+            block['fonts'] = []
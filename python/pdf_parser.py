@@ -4,13 +4,16 @@ Enhanced LinkedIn PDF Parser using PyMuPDF (fitz)
 Extracts structured data from LinkedIn profile PDFs with improved parsing logic
 """
 
-import fitz  # PyMuPDF
 import json
+import os
 import re
 import sys
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from dataclasses import dataclass, asdict
 import argparse
+from memory_budget import MemoryBudget, MemoryBudgetExceeded
+from pdf_extraction import ExtractedDocument, PdfSource, extract_document, iter_page_blocks
+from profiling import print_profile_summary, profile_call
 
 @dataclass
 class PersonalInfo:
@@ -90,6 +93,9 @@ class ResumeData:
         if self.languages is None:
             self.languages = []
 
+# Longest line any regex is evaluated on (bounds the worst case per line)
+MAX_REGEX_LINE_LENGTH = 1000
+
 class LinkedInPDFParser:
     def __init__(self):
         # Enhanced section headers for better LinkedIn PDF recognition
@@ -125,79 +131,88 @@ class LinkedInPDFParser:
             ]
         }
         
-        # Common LinkedIn PDF patterns
+        # Common LinkedIn PDF patterns. These run on arbitrary uploaded text, so
+        # each is written to match in linear time: no nested or overlapping
+        # quantifiers, and lookbehinds/word boundaries so a failed attempt is not
+        # retried from every position inside the same token. Checked by
+        # regex_benchmark.py.
         self.linkedin_patterns = {
-            'email': r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}',
-            'phone': r'[\+]?[\d\s\-\(\)]{10,}',
+            'email': r'(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}',
+            'phone': r'\+?\(?\d[\d\s\-\(\)]{8,}\d',
             'linkedin_url': r'linkedin\.com/in/[^\s]+',
-            'website': r'(?:https?://)?(?:www\.)?[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}(?:/[^\s]*)?',
-            'date_range': r'(\w+\s+\d{4}|\d{4})\s*[-–]\s*(\w+\s+\d{4}|\d{4}|Present|Current|Heute|Aktuell)',
-            'location': r'[A-Za-zÀ-ÿ\s,\-]+(?:,\s*[A-Za-zÀ-ÿ\s]+)*'
+            'website': r'(?<![a-zA-Z0-9.-])(?:https?://)?(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}(?:/[^\s]*)?',
+            'date_range': r'(\b\w+\s+\d{4}|\d{4})\s*[-–]\s*(\w+\s+\d{4}|\d{4}|Present|Current|Heute|Aktuell)',
+            'location': r'[A-Za-zÀ-ÿ][A-Za-zÀ-ÿ \-]*(?:, ?[A-Za-zÀ-ÿ][A-Za-zÀ-ÿ \-]*)*'
         }
         
-    def parse_pdf(self, pdf_path: str) -> ResumeData:
-        """Enhanced PDF parsing with better text extraction and positioning"""
+        # Pattern: Language (Proficiency) or Language - Proficiency or Language: Proficiency
+        # (first character is free so a leading separator still belongs to the name)
+        self.language_patterns = [
+            r'^(.[^(]*)\((.+)\)$',
+            r'^(.[^-–]*)[-–](.+)$',
+            r'^(.[^:]*):(.+)$'
+        ]
+        
+        # Skills are split on list separators or runs of whitespace
+        self.skill_separator_pattern = r'[,•·\|\n\t]|(?:\s{2,})'
+        
+        # Known export layouts take a coordinate-based fast path
+        # (imported here because layout_registry builds on this module)
+        from layout_registry import LayoutRegistry
+        self.layouts = LayoutRegistry.from_env()
+        
+    def parse_pdf(self, pdf_path: PdfSource, budget: Optional[MemoryBudget] = None,
+                  metadata: Optional[Dict[str, Any]] = None) -> ResumeData:
+        """Enhanced PDF parsing with better text extraction and positioning (path or PDF bytes)"""
         try:
-            doc = fitz.open(pdf_path)
-            
             # Extract text with enhanced positioning and formatting
-            structured_content = self._extract_structured_content(doc)
-            doc.close()
+            document = extract_document(pdf_path, budget)
             
             # Parse the structured content
-            return self._parse_structured_data(structured_content)
+            return self.parse_document(document, metadata)
             
+        except MemoryBudgetExceeded:
+            raise
         except Exception as e:
             raise Exception(f"Error parsing PDF: {str(e)}")
     
-    def _extract_structured_content(self, doc) -> Dict[str, Any]:
-        """Extract text with positioning, font size, and formatting information"""
-        content = {
-            'text_blocks': [],
-            'lines': [],
-            'fonts': {},
-            'page_count': len(doc)
-        }
-        
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
-            # Get text with detailed formatting
-            text_dict = page.get_text("dict")
-            
-            for block in text_dict["blocks"]:
-                if "lines" in block:
-                    for line in block["lines"]:
-                        line_text = ""
-                        line_fonts = []
-                        
-                        for span in line["spans"]:
-                            text = span["text"].strip()
-                            if text:
-                                line_text += text + " "
-                                font_info = {
-                                    'font': span.get('font', ''),
-                                    'size': span.get('size', 12),
-                                    'flags': span.get('flags', 0),
-                                    'color': span.get('color', 0)
-                                }
-                                line_fonts.append(font_info)
-                        
-                        if line_text.strip():
-                            content['text_blocks'].append({
-                                'text': line_text.strip(),
-                                'bbox': line["bbox"],
-                                'page': page_num,
-                                'fonts': line_fonts,
-                                'is_bold': any(f.get('flags', 0) & 2**4 for f in line_fonts),
-                                'font_size': max([f.get('size', 12) for f in line_fonts]) if line_fonts else 12
-                            })
-        
-        # Sort by position (top to bottom, left to right)
-        content['text_blocks'].sort(key=lambda x: (x['page'], -x['bbox'][1], x['bbox'][0]))
-        content['lines'] = [block['text'] for block in content['text_blocks']]
-        
-        return content
+    def parse_document(self, document: ExtractedDocument, metadata: Optional[Dict[str, Any]] = None,
+                       use_layouts: bool = True) -> ResumeData:
+        """Parse a document already decoded by pdf_extraction.extract_document"""
+        if use_layouts:
+            resume = self.parse_layout(document, metadata)
+            if resume is not None:
+                return resume
+        return self._parse_structured_data(document.structured_content())
+    
+    def iter_parse(self, pdf_path: PdfSource, budget: Optional[MemoryBudget] = None,
+                   collect: bool = True) -> Iterator[Any]:
+        """Stream the heuristic parse page by page, yielding each entry as soon as it is complete
+
+        Pages are decoded lazily and only the current page's blocks are held.
+        The final event is the full ResumeData ('resume'), identical to
+        `parse_document(document, use_layouts=False)`, or with `collect=False`
+        just the entry counts ('done').
+        """
+        from resume_stream import stream_blocks
+        try:
+            yield from stream_blocks(self, iter_page_blocks(pdf_path, budget), collect)
+        except MemoryBudgetExceeded:
+            raise
+        except Exception as e:
+            raise Exception(f"Error parsing PDF: {str(e)}")
+    
+    def parse_layout(self, document: ExtractedDocument,
+                     metadata: Optional[Dict[str, Any]] = None) -> Optional[ResumeData]:
+        """Fast path for recognised export layouts; None when the layout is unknown
+
+        The matched template, its fingerprint and the share of lines it
+        accounted for are recorded in `metadata['layout']`.
+        """
+        resume, details = self.layouts.extract(document, self)
+        if metadata is not None and details:
+            metadata['layout'] = details
+        return resume
     
     def _parse_structured_data(self, content: Dict[str, Any]) -> ResumeData:
         """Enhanced parsing with better section detection and data extraction"""
@@ -225,38 +240,75 @@ class LinkedInPDFParser:
         sections = {}
         
         for i, (line, block) in enumerate(zip(lines, text_blocks)):
-            line_lower = line.lower().strip()
-            
-            # Check if this looks like a section header
-            is_potential_header = (
-                block['is_bold'] or 
-                block['font_size'] > 12 or
-                line.isupper() or
-                line.endswith(':')
-            )
-            
-            if is_potential_header:
-                for section_type, headers in self.section_headers.items():
-                    for header in headers:
-                        # More flexible matching
-                        if (header in line_lower or 
-                            line_lower.startswith(header) or
-                            line_lower == header.replace(' ', '') or
-                            line_lower == header + ':'):
-                            
-                            if section_type not in sections:
-                                sections[section_type] = []
-                            sections[section_type].append(i)
-                            break
+            section_type = self._classify_header(line, block)
+            if section_type:
+                if section_type not in sections:
+                    sections[section_type] = []
+                sections[section_type].append(i)
         
         return sections
     
+    def _classify_header(self, line: str, block: Dict[str, Any]) -> Optional[str]:
+        """Section type a line introduces, or None if it is not a section header"""
+        line_lower = line.lower().strip()
+        
+        # Check if this looks like a section header
+        is_potential_header = (
+            block['is_bold'] or 
+            block['font_size'] > 12 or
+            line.isupper() or
+            line.endswith(':')
+        )
+        
+        if is_potential_header:
+            for section_type, headers in self.section_headers.items():
+                for header in headers:
+                    # More flexible matching
+                    if (header in line_lower or 
+                        line_lower.startswith(header) or
+                        line_lower == header.replace(' ', '') or
+                        line_lower == header + ':'):
+                        return section_type
+        
+        return None
+    
+    @staticmethod
+    def _bounded(line: str) -> str:
+        """Cap a line before regex evaluation; real resume lines are far shorter"""
+        return line[:MAX_REGEX_LINE_LENGTH]
+    
+    def detect_sections_in_text(self, text: str) -> Tuple[List[str], Dict[str, List[int]]]:
+        """Section detection for plain text without font information (exact header lines only)"""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        sections = {}
+        
+        for i, line in enumerate(lines):
+            line_lower = line.lower().rstrip(':').strip()
+            for section_type, headers in self.section_headers.items():
+                if line_lower in headers:
+                    sections.setdefault(section_type, []).append(i)
+                    break
+        
+        return lines, sections
+    
+    def estimate_confidence(self, lines: List[str], sections: Dict[str, List[int]]) -> float:
+        """Rough 0-1 score of how well the heuristics understand the document structure"""
+        if not lines or not sections:
+            return 0.0
+        
+        # Share of the text that falls under a recognised section, and how many sections were found
+        first_header = min(idx for indices in sections.values() for idx in indices)
+        coverage = (len(lines) - first_header) / len(lines)
+        variety = min(1.0, len(sections) / 3)
+        
+        return round(0.5 * coverage + 0.5 * variety, 3)
+    
     def _parse_personal_info_enhanced(self, lines: List[str], text_blocks: List[Dict], sections: Dict[str, List[int]]) -> PersonalInfo:
         """Enhanced personal information extraction"""
         personal_info = PersonalInfo()
         
         # Look in the first 15 lines for personal info (LinkedIn PDFs typically have this at the top)
-        header_lines = lines[:15]
+        header_lines = [self._bounded(line) for line in lines[:15]]
         
         for i, line in enumerate(header_lines):
             # Name detection (usually the largest text at the top)
@@ -347,7 +399,7 @@ class LinkedInPDFParser:
             line = exp_lines[i].strip()
             
             # Look for date patterns to identify new experience entries
-            date_match = re.search(self.linkedin_patterns['date_range'], line, re.IGNORECASE)
+            date_match = re.search(self.linkedin_patterns['date_range'], self._bounded(line), re.IGNORECASE)
             
             if date_match:
                 # Save previous experience
@@ -365,11 +417,8 @@ class LinkedInPDFParser:
                 # Look for position and company in surrounding lines
                 self._extract_job_details(exp_lines, i, current_exp)
                 
-            elif current_exp and line and not re.match(r'^\d{4}', line):
-                # Add to description if it's not a date and we have a current experience
-                if (len(line) > 10 and 
-                    not any(keyword in line.lower() for keyword in ['page', 'linkedin', 'generated'])):
-                    current_exp.description.append(line)
+            elif current_exp and self._is_experience_description(line):
+                current_exp.description.append(line)
             
             i += 1
         
@@ -379,6 +428,14 @@ class LinkedInPDFParser:
         
         return experiences
     
+    @staticmethod
+    def _is_experience_description(line: str) -> bool:
+        """Whether a non-date line inside an experience entry belongs to its description"""
+        # Not a date, long enough, and not page furniture
+        return bool(line and not re.match(r'^\d{4}', line) and
+                    len(line) > 10 and
+                    not any(keyword in line.lower() for keyword in ['page', 'linkedin', 'generated']))
+    
     def _extract_job_details(self, lines: List[str], date_line_idx: int, experience: Experience):
         """Extract job position, company, and location from surrounding lines"""
         # Look in lines before and after the date line
@@ -402,7 +459,7 @@ class LinkedInPDFParser:
             elif (not experience.company and 
                   len(line) < 80 and 
                   not any(word in line.lower() for word in ['at', 'in', 'from', 'to', 'since']) and
-                  not re.search(self.linkedin_patterns['date_range'], line)):
+                  not re.search(self.linkedin_patterns['date_range'], self._bounded(line))):
                 experience.company = line
             
             # Location detection
@@ -424,7 +481,7 @@ class LinkedInPDFParser:
                 continue
             
             # Date pattern for education
-            date_match = re.search(r'(\d{4})\s*[-–]\s*(\d{4})', line)
+            date_match = re.search(r'(\d{4})\s*[-–]\s*(\d{4})', self._bounded(line))
             
             if date_match:
                 if current_edu:
@@ -437,26 +494,34 @@ class LinkedInPDFParser:
                 )
             
             elif current_edu and line:
-                # Degree detection
-                if any(degree in line.lower() for degree in 
-                      ['bachelor', 'master', 'phd', 'diploma', 'certificate', 'degree']):
-                    current_edu.degree = line
-                # School detection
-                elif not current_edu.school:
-                    current_edu.school = line
-                # Additional info
-                else:
-                    if not current_edu.description:
-                        current_edu.description = line
+                self._add_education_detail(current_edu, line)
         
         if current_edu:
             education.append(current_edu)
         
         return education
     
+    @staticmethod
+    def _add_education_detail(education: Education, line: str):
+        """Assign a line following an education entry's date line"""
+        # Degree detection
+        if any(degree in line.lower() for degree in 
+              ['bachelor', 'master', 'phd', 'diploma', 'certificate', 'degree']):
+            education.degree = line
+        # School detection
+        elif not education.school:
+            education.school = line
+        # Additional info
+        else:
+            if not education.description:
+                education.description = line
+    
     def _parse_skills_enhanced(self, lines: List[str], sections: Dict[str, List[int]]) -> List[Skill]:
         """Enhanced skills parsing with better separation and categorization"""
-        skill_lines = self._get_section_lines(lines, sections, 'skills')
+        return self._parse_skill_lines(self._get_section_lines(lines, sections, 'skills'))
+    
+    def _parse_skill_lines(self, skill_lines: List[str]) -> List[Skill]:
+        """Skills from the lines of a skills section"""
         skills = []
         
         for line in skill_lines:
@@ -465,7 +530,7 @@ class LinkedInPDFParser:
                 continue
             
             # Split skills by various separators
-            skill_items = re.split(r'[,•·\|\n\t]|(?:\s{2,})', line)
+            skill_items = re.split(self.skill_separator_pattern, self._bounded(line))
             
             for skill_item in skill_items:
                 skill_name = skill_item.strip()
@@ -488,7 +553,10 @@ class LinkedInPDFParser:
     
     def _parse_certifications_enhanced(self, lines: List[str], sections: Dict[str, List[int]]) -> List[Certification]:
         """Enhanced certifications parsing"""
-        cert_lines = self._get_section_lines(lines, sections, 'certifications')
+        return self._parse_certification_lines(self._get_section_lines(lines, sections, 'certifications'))
+    
+    def _parse_certification_lines(self, cert_lines: List[str]) -> List[Certification]:
+        """Certifications from the lines of a certifications section"""
         certifications = []
         
         for line in cert_lines:
@@ -497,7 +565,7 @@ class LinkedInPDFParser:
                 continue
             
             # Try to parse certification with issuer and date
-            parts = re.split(r'[-–|]', line)
+            parts = re.split(r'[-–|]', self._bounded(line))
             if len(parts) >= 2:
                 cert_name = parts[0].strip()
                 issuer = parts[1].strip()
@@ -528,7 +596,10 @@ class LinkedInPDFParser:
     
     def _parse_languages_enhanced(self, lines: List[str], sections: Dict[str, List[int]]) -> List[Language]:
         """Enhanced languages parsing"""
-        lang_lines = self._get_section_lines(lines, sections, 'languages')
+        return self._parse_language_lines(self._get_section_lines(lines, sections, 'languages'))
+    
+    def _parse_language_lines(self, lang_lines: List[str]) -> List[Language]:
+        """Languages from the lines of a languages section"""
         languages = []
         
         for line in lang_lines:
@@ -536,16 +607,9 @@ class LinkedInPDFParser:
             if not line:
                 continue
             
-            # Pattern: Language (Proficiency) or Language - Proficiency
-            patterns = [
-                r'^(.+?)\s*\((.+?)\)$',
-                r'^(.+?)\s*[-–]\s*(.+?)$',
-                r'^(.+?)\s*:\s*(.+?)$'
-            ]
-            
             matched = False
-            for pattern in patterns:
-                lang_match = re.match(pattern, line)
+            for pattern in self.language_patterns:
+                lang_match = re.match(pattern, self._bounded(line))
                 if lang_match:
                     languages.append(Language(
                         id=str(len(languages) + 1),
@@ -590,12 +654,32 @@ def main():
     parser = argparse.ArgumentParser(description='Enhanced LinkedIn PDF Parser')
     parser.add_argument('pdf_path', help='Path to PDF file')
     parser.add_argument('--output', '-o', help='Output JSON file path')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile the parse; prints a stage summary and saves the profile to PROFILE_DIR')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream entries as newline-delimited JSON while pages are read (heuristic parse)')
     
     args = parser.parse_args()
     
     try:
         pdf_parser = LinkedInPDFParser()
-        resume_data = pdf_parser.parse_pdf(args.pdf_path)
+        if args.stream:
+            out = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+            try:
+                for event in pdf_parser.iter_parse(args.pdf_path, collect=False):
+                    out.write(json.dumps(event.to_dict(), ensure_ascii=False) + "\n")
+                    out.flush()
+            finally:
+                if args.output:
+                    out.close()
+            return
+        
+        if args.profile:
+            resume_data, profile = profile_call(pdf_parser.parse_pdf, args.pdf_path,
+                                                label=os.path.basename(args.pdf_path))
+            print_profile_summary(profile)
+        else:
+            resume_data = pdf_parser.parse_pdf(args.pdf_path)
         
         # Convert to dict for JSON serialization
         result = asdict(resume_data)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-request profiling for the PDF parsers
+Runs a parse under cProfile (including the parser's worker threads), reduces
+the result to a per-stage summary and keeps the full profiles in a rotated
+local directory
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Pipeline stages -> (module file, function) entry points whose cumulative time is the stage time
+STAGES: Dict[str, List[Tuple[str, str]]] = {
+    'extraction': [('pdf_extraction.py', 'extract_document'), ('pdf_extraction.py', 'iter_page_texts')],
+    'heuristic_parsing': [('pdf_parser.py', '_parse_structured_data'), ('ai_pdf_parser.py', '_segment_sections')],
+    'duplicate_cache': [('near_duplicate_cache.py', 'lookup'), ('near_duplicate_cache.py', 'add')],
+    'rate_limit_wait': [('rate_limiter.py', 'acquire')],
+    'llm_calls': [('ai_pdf_parser.py', '_single_extraction')],
+    'merge_and_convert': [('ai_pdf_parser.py', '_merge_extraction_results'),
+                          ('ai_pdf_parser.py', '_convert_to_resume_data')],
+}
+
+# Profiler active on the current (request) thread, so worker threads it starts can join it
+_active = threading.local()
+
+
+class ParseProfiler:
+    """Deterministic profile of one parse, spanning every thread it hands work to.
+
+    Only the request thread is profiled directly; functions submitted to worker
+    threads must be wrapped with `profiled()` so their time is collected too.
+    """
+
+    def __init__(self):
+        self._profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self.wall_seconds = 0.0
+        self.errors: List[str] = []
+
+    def run(self, fn: Callable, *args, **kwargs) -> Any:
+        _active.profiler = self
+        start = time.perf_counter()
+        try:
+            return self._run_profiled(fn, *args, **kwargs)
+        finally:
+            self.wall_seconds = time.perf_counter() - start
+            _active.profiler = None
+
+    def _run_profiled(self, fn: Callable, *args, **kwargs) -> Any:
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            # Another profiler is active (only one per process on newer Pythons)
+            with self._lock:
+                self.errors.append(str(e))
+            return fn(*args, **kwargs)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.append(profile)
+
+    def stats(self) -> Optional[pstats.Stats]:
+        with self._lock:
+            profiles = list(self._profiles)
+        if not profiles:
+            return None
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        return stats
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Stage timings plus the functions with the most own time (JSON-ready)"""
+        result = {
+            'wall_ms': round(self.wall_seconds * 1000, 1),
+            'threads_profiled': len(self._profiles),
+            'stages_ms': {},
+            'hotspots': []
+        }
+        if self.errors:
+            result['errors'] = list(self.errors)
+        stats = self.stats()
+        if stats is None:
+            return result
+
+        entries = stats.stats  # {(file, line, func): (cc, nc, tottime, cumtime, callers)}
+        for stage, entry_points in STAGES.items():
+            cumulative = sum(
+                cumtime for (filename, _, func), (_, _, _, cumtime, _) in entries.items()
+                if (os.path.basename(filename), func) in entry_points
+            )
+            if cumulative:
+                result['stages_ms'][stage] = round(cumulative * 1000, 1)
+
+        ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        for (filename, line, func), (_, calls, tottime, cumtime, _) in ranked:
+            result['hotspots'].append({
+                'function': f"{os.path.basename(filename)}:{line}({func})" if line else func,
+                'calls': calls,
+                'own_ms': round(tottime * 1000, 2),
+                'cumulative_ms': round(cumtime * 1000, 2)
+            })
+        return result
+
+
+def profiled(fn: Callable) -> Callable:
+    """Wrap a callable submitted to a worker thread so it joins the submitting thread's profile"""
+    profiler = getattr(_active, 'profiler', None)
+    if profiler is None:
+        return fn
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        return profiler._run_profiled(fn, *args, **kwargs)
+    return wrapper
+
+
+class ProfileStore:
+    """Directory of saved profiles, rotated by file count and total size (oldest removed first)"""
+
+    def __init__(self, directory: str, max_files: int = 50, max_bytes: int = 100 * 1024 * 1024):
+        self.directory = directory
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'ProfileStore':
+        return cls(
+            directory=os.getenv('PROFILE_DIR', 'profiles'),
+            max_files=int(os.getenv('PROFILE_MAX_FILES', '50')),
+            max_bytes=int(float(os.getenv('PROFILE_MAX_MB', '100')) * 1024 * 1024)
+        )
+
+    def save(self, profiler: ParseProfiler, label: str) -> Optional[str]:
+        """Write the full profile (pstats format, readable with `python -m pstats`); returns its path"""
+        stats = profiler.stats()
+        if stats is None:
+            return None
+        safe_label = re.sub(r'[^A-Za-z0-9_.-]', '_', label)[:64]
+        filename = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(time.time() * 1000) % 1000:03d}-{safe_label}.prof"
+        path = os.path.join(self.directory, filename)
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            stats.dump_stats(path)
+            self._rotate()
+        return path
+
+    def _rotate(self):
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.prof'):
+                path = os.path.join(self.directory, name)
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+        files.sort()
+        total = sum(size for _, size, _ in files)
+        while files and (len(files) > self.max_files or total > self.max_bytes):
+            _, size, path = files.pop(0)
+            os.remove(path)
+            total -= size
+
+
+def profile_call(fn: Callable, *args, label: str = 'parse', store: Optional[ProfileStore] = None,
+                 **kwargs) -> Tuple[Any, Dict[str, Any]]:
+    """Run `fn` under the profiler; returns its result and the summary (with the saved profile path)"""
+    profiler = ParseProfiler()
+    store = store or ProfileStore.from_env()
+    try:
+        result = profiler.run(fn, *args, **kwargs)
+    finally:
+        summary = profiler.summary()
+        try:
+            summary['profile_path'] = store.save(profiler, label)
+        except OSError as e:
+            summary['profile_path'] = None
+            summary.setdefault('errors', []).append(f"Could not save profile: {e}")
+    return result, summary
+
+
+def print_profile_summary(summary: Dict[str, Any], file=None):
+    """Human-readable stage summary for the CLIs (stderr by default, so JSON output stays clean)"""
+    file = file or sys.stderr
+    print(f"[PROFILE] {summary['wall_ms']} ms wall, {summary['threads_profiled']} thread(s) profiled", file=file)
+    for stage, ms in summary['stages_ms'].items():
+        print(f"[PROFILE]   {stage:<20} {ms:>10.1f} ms", file=file)
+    for hotspot in summary['hotspots'][:5]:
+        print(f"[PROFILE]   hot: {hotspot['function']} {hotspot['own_ms']} ms own, {hotspot['calls']} calls", file=file)
+    for error in summary.get('errors', []):
+        print(f"[PROFILE]   {error}", file=file)
+    if summary.get('profile_path'):
+        print(f"[PROFILE] Full profile saved to {summary['profile_path']}", file=file)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Process-wide rate limiting for LLM calls
+Budgets requests and estimated tokens per minute with token buckets and
+serves queued callers by priority class (interactive before bulk)
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Optional
+
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_BULK = 'bulk'
+
+# Lower rank is served first
+PRIORITY_CLASSES = {
+    PRIORITY_INTERACTIVE: 0,
+    PRIORITY_BULK: 1
+}
+
+
+class LLMRateLimitError(Exception):
+    """Raised when an LLM call could not be admitted within the allowed wait"""
+
+    def __init__(self, message: str, retry_after: float = 0.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token for English text)"""
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `rate_per_minute`"""
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill(now)
+        # Oversized requests only wait for a full bucket, so they cannot wait forever
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float):
+        # The full amount is charged, even beyond capacity; the balance may go
+        # negative and is repaid by later refills
+        self.tokens -= amount
+
+    def refund(self, amount: float):
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class LLMRateLimiter:
+    """Shared limiter that queues LLM calls instead of letting them fail.
+
+    Callers block in `acquire` until both the request and token budgets allow
+    the call and no `Retry-After` pause is active. Waiting callers are served
+    strictly by priority class, then in arrival order.
+    """
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 max_wait: float = 120.0):
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._blocked_until = 0.0
+
+    def acquire(self, estimated_tokens: int, priority: str = PRIORITY_INTERACTIVE) -> float:
+        """Block until the call may proceed; returns the time spent waiting"""
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class '{priority}'")
+
+        start = time.monotonic()
+        deadline = start + self.max_wait
+        ticket = (PRIORITY_CLASSES[priority], next(self._sequence))
+
+        with self._cond:
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    wait = None
+                    if self._waiters[0] == ticket:
+                        wait = self._time_until_admitted(estimated_tokens, now)
+                        if wait <= 0:
+                            heapq.heappop(self._waiters)
+                            if self.request_bucket:
+                                self.request_bucket.consume(1)
+                            if self.token_bucket:
+                                self.token_bucket.consume(estimated_tokens)
+                            self._cond.notify_all()
+                            return now - start
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        raise LLMRateLimitError(
+                            f"LLM rate limit: request not admitted within {self.max_wait:.0f}s",
+                            retry_after=wait or 1.0
+                        )
+                    self._cond.wait(min(wait, remaining) if wait is not None else remaining)
+            except BaseException:
+                if ticket in self._waiters:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def _time_until_admitted(self, estimated_tokens: int, now: float) -> float:
+        wait = self._blocked_until - now
+        if self.request_bucket:
+            wait = max(wait, self.request_bucket.time_until(1, now))
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.time_until(estimated_tokens, now))
+        return wait
+
+    def reconcile(self, estimated_tokens: int, actual_tokens: int):
+        """Correct the token budget once the real usage of a call is known"""
+        if not self.token_bucket or actual_tokens is None:
+            return
+        with self._cond:
+            difference = estimated_tokens - actual_tokens
+            if difference > 0:
+                self.token_bucket.refund(difference)
+            else:
+                self.token_bucket.consume(-difference)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold all callers for `seconds` (honours a server-sent Retry-After)"""
+        with self._cond:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    @property
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._waiters)
+
+
+_shared_limiter: Optional[LLMRateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_limiter() -> LLMRateLimiter:
+    """Process-wide limiter configured from OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = LLMRateLimiter(
+                requests_per_minute=float(os.getenv('OPENAI_RPM_LIMIT', '0')),
+                tokens_per_minute=float(os.getenv('OPENAI_TPM_LIMIT', '0')),
+                max_wait=float(os.getenv('OPENAI_LIMITER_MAX_WAIT', '120'))
+            )
+        return _shared_limiter
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Pathological-input benchmark for the LinkedInPDFParser regex patterns
+Times every pattern on adversarial and fuzzed lines of growing length and
+fails when matching time grows faster than linearly
+"""
+
+import argparse
+import math
+import random
+import re
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+from pdf_parser import LinkedInPDFParser, MAX_REGEX_LINE_LENGTH
+
+# Input generators: length -> adversarial line. Each targets a backtracking
+# shape (long tokens without a terminator, repeated separators, runs that
+# almost match) for the patterns it is listed under.
+ADVERSARIAL_INPUTS: Dict[str, List[Tuple[str, Callable[[int], str]]]] = {
+    'email': [
+        ('long local part, no @', lambda n: 'a' * n),
+        ('many dots after @', lambda n: 'a@' + 'a.' * (n // 2)),
+        ('dotted token', lambda n: 'a.' * (n // 2) + '!'),
+    ],
+    'phone': [
+        ('digit then spaces', lambda n: '1' + ' ' * n),
+        ('short runs', lambda n: ('1' + ' ' * 8 + 'x') * (n // 10)),
+        ('open parens', lambda n: '1' + '(' * n),
+    ],
+    'website': [
+        ('dotted labels without TLD', lambda n: 'a.1' * (n // 3)),
+        ('hyphen run', lambda n: 'a-' * (n // 2)),
+        ('www repeated', lambda n: 'www.' * (n // 4) + '!'),
+    ],
+    'date_range': [
+        ('long word', lambda n: 'a' * n),
+        ('year then spaces', lambda n: '2020' + ' ' * n + 'x'),
+        ('month words', lambda n: 'January ' * (n // 8)),
+    ],
+    'location': [
+        ('comma separated', lambda n: 'a,' * (n // 2) + '1'),
+        ('spaced letters', lambda n: 'a ' * (n // 2) + '1'),
+    ],
+    'language_patterns': [
+        ('open parens', lambda n: 'a' + '(' * n),
+        ('spaces before paren', lambda n: 'a' + ' ' * n + '('),
+        ('dashes', lambda n: '-' * n),
+        ('colons', lambda n: ': ' * (n // 2)),
+    ],
+    'skill_separator_pattern': [
+        ('whitespace run', lambda n: ' ' * n),
+        ('separators', lambda n: ', ' * (n // 2)),
+    ],
+}
+
+FUZZ_ALPHABET = 'aZ19 .-–@()+:/,|•\t'
+
+
+def pattern_table(parser: LinkedInPDFParser) -> Dict[str, List[str]]:
+    table = {name: [pattern] for name, pattern in parser.linkedin_patterns.items()}
+    table['language_patterns'] = list(parser.language_patterns)
+    table['skill_separator_pattern'] = [parser.skill_separator_pattern]
+    return table
+
+
+def time_patterns(patterns: List[str], line: str, repeats: int) -> float:
+    """Best-of-`repeats` time to evaluate every pattern the way the parser does"""
+    compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for regex in compiled:
+            regex.search(line)
+            regex.split(line)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def growth_exponent(sizes: List[int], times: List[float]) -> float:
+    """Slope of log(time) over log(size): ~1 for linear, ~2 for quadratic"""
+    floor = 1e-6  # ignore timer noise on very fast inputs
+    xs = [math.log(size) for size in sizes]
+    ys = [math.log(max(t, floor)) for t in times]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    numerator = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    denominator = sum((x - mean_x) ** 2 for x in xs)
+    return numerator / denominator
+
+
+def run_benchmark(sizes: List[int], repeats: int, max_exponent: float, fuzz_lines: int,
+                  max_line_ms: float, seed: int) -> bool:
+    parser = LinkedInPDFParser()
+    table = pattern_table(parser)
+    ok = True
+
+    print(f"{'pattern':<25} {'input':<28} {'ms@max':>9} {'exponent':>9}")
+    for name, generators in ADVERSARIAL_INPUTS.items():
+        for label, generate in generators:
+            times = [time_patterns(table[name], generate(size), repeats) for size in sizes]
+            exponent = growth_exponent(sizes, times)
+            status = 'ok' if exponent <= max_exponent else 'SUPERLINEAR'
+            ok &= exponent <= max_exponent
+            print(f"{name:<25} {label:<28} {times[-1] * 1000:>9.3f} {exponent:>9.2f}  {status}")
+
+    # Random lines over the characters the patterns care about, at the parser's line cap
+    rng = random.Random(seed)
+    all_patterns = [pattern for patterns in table.values() for pattern in patterns]
+    worst = 0.0
+    for _ in range(fuzz_lines):
+        line = ''.join(rng.choice(FUZZ_ALPHABET) for _ in range(MAX_REGEX_LINE_LENGTH))
+        worst = max(worst, time_patterns(all_patterns, line, 1))
+    fuzz_ok = worst * 1000 <= max_line_ms
+    ok &= fuzz_ok
+    print(f"fuzz: {fuzz_lines} lines of {MAX_REGEX_LINE_LENGTH} chars, worst {worst * 1000:.3f} ms "
+          f"(limit {max_line_ms} ms) {'ok' if fuzz_ok else 'TOO SLOW'}")
+
+    # End to end: a document of capped-length adversarial lines must parse quickly
+    lines = [generate(MAX_REGEX_LINE_LENGTH * 50) for generators in ADVERSARIAL_INPUTS.values()
+             for _, generate in generators]
+    lines = ['Experience', 'Education', 'Skills', 'Languages', 'Certifications'] + lines * 4
+    content = {
+        'lines': lines,
+        'text_blocks': [{'text': line, 'is_bold': True, 'font_size': 16, 'bbox': (0, 0, 0, 0), 'page': 0}
+                        for line in lines],
+        'fonts': {},
+        'page_count': 1
+    }
+    start = time.perf_counter()
+    parser._parse_structured_data(content)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    limit_ms = max_line_ms * len(lines)
+    parse_ok = elapsed_ms <= limit_ms
+    ok &= parse_ok
+    print(f"parse: {len(lines)} adversarial lines of {MAX_REGEX_LINE_LENGTH * 50} chars in {elapsed_ms:.1f} ms "
+          f"(limit {limit_ms:.0f} ms) {'ok' if parse_ok else 'TOO SLOW'}")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ReDoS benchmark for the LinkedIn PDF parser patterns')
+    parser.add_argument('--sizes', default='2000,4000,8000,16000,32000',
+                        help='Comma-separated input lengths for the growth check')
+    parser.add_argument('--repeats', type=int, default=5, help='Timing repeats per input (best is kept)')
+    parser.add_argument('--max-exponent', type=float, default=1.4,
+                        help='Largest accepted growth exponent (1 = linear, 2 = quadratic)')
+    parser.add_argument('--fuzz-lines', type=int, default=200, help='Number of random fuzz lines')
+    parser.add_argument('--max-line-ms', type=float, default=20.0,
+                        help='Time limit for evaluating all patterns on one capped line')
+    parser.add_argument('--seed', type=int, default=1, help='Fuzz seed')
+
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    if not run_benchmark(sizes, args.repeats, args.max_exponent, args.fuzz_lines, args.max_line_ms, args.seed):
+        print("Error: superlinear or slow regex behaviour detected", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
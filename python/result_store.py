@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Addressable parse results for conditional, compressed re-fetching
+Each result is serialized once, stored under the PDF's content hash with a
+strong ETag, and its gzip/brotli encodings are produced at most once
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+# Content codings in order of preference when the client accepts several equally
+SUPPORTED_ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+# Stored results are compressed once, so they get the slower, denser settings
+GZIP_LEVEL_STORED = 9
+GZIP_LEVEL_DYNAMIC = 6
+BROTLI_QUALITY_STORED = 9
+BROTLI_QUALITY_DYNAMIC = 5
+
+
+def compress(body: bytes, encoding: str, stored: bool = False) -> bytes:
+    """Encode a response body with 'gzip' or 'br'"""
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY_STORED if stored else BROTLI_QUALITY_DYNAMIC)
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and so the ETag of the encoding) deterministic
+        return gzip.compress(body, compresslevel=GZIP_LEVEL_STORED if stored else GZIP_LEVEL_DYNAMIC, mtime=0)
+    raise ValueError(f"Unsupported content encoding '{encoding}'")
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Best supported coding for an Accept-Encoding header, or None for identity"""
+    weights: Dict[str, float] = {}
+    for item in (accept_encoding or '').split(','):
+        parts = [part.strip() for part in item.split(';')]
+        coding = parts[0].lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in parts[1:]:
+            if param.lower().startswith('q='):
+                try:
+                    weight = float(param[2:])
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in SUPPORTED_ENCODINGS:
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check against the ETag of the representation being served
+
+    Weak comparison, as RFC 9110 requires for this header (a W/ prefix is
+    ignored). Each encoding has its own ETag, so a tag received with one
+    encoding does not revalidate another: a client that cached the gzip body
+    must not get a 304 for an identity request.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag.strip('"')
+    for candidate in if_none_match.split(','):
+        candidate_tag = candidate.strip()
+        if candidate_tag.startswith('W/'):
+            candidate_tag = candidate_tag[2:]
+        if candidate_tag.strip('"') == opaque:
+            return True
+    return False
+
+
+@dataclass
+class StoredResult:
+    content_hash: str
+    body: bytes
+    # Opaque validator: a hash of the serialized body
+    tag: str
+    stored_at: float
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(encoded) for encoded in self.encodings.values())
+
+    def representation(self, encoding: Optional[str]) -> Tuple[bytes, str]:
+        """Body and strong ETag of the identity or an encoded representation"""
+        if encoding is None:
+            return self.body, f'"{self.tag}"'
+        return self.encodings[encoding], f'"{self.tag}-{encoding}"'
+
+
+class ResultStore:
+    """Bounded, thread-safe store of serialized parse results keyed by PDF content hash.
+
+    The latest result for a hash replaces earlier ones. Entries expire after
+    `ttl_seconds`; least recently used entries are evicted beyond
+    `max_entries` or `max_bytes` (bodies plus cached encodings). A
+    `max_entries` of 0 disables the store.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, StoredResult]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> 'ResultStore':
+        return cls(
+            max_entries=int(os.getenv('RESULT_STORE_SIZE', '512')),
+            max_bytes=int(float(os.getenv('RESULT_STORE_MAX_MB', '64')) * 1024 * 1024),
+            ttl_seconds=float(os.getenv('RESULT_STORE_TTL_SECONDS', '86400'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def put(self, content_hash: str, payload: Dict[str, Any]) -> Optional[StoredResult]:
+        """Serialize and store a result; returns the stored entry (None when disabled)"""
+        if not self.enabled:
+            return None
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        entry = StoredResult(
+            content_hash=content_hash,
+            body=body,
+            tag=hashlib.sha256(body).hexdigest()[:32],
+            stored_at=time.time()
+        )
+        with self._lock:
+            self._remove(content_hash)
+            self._entries[content_hash] = entry
+            self._bytes += entry.size
+            self._evict()
+        return entry
+
+    def get(self, content_hash: str, encoding: Optional[str] = None) -> Optional[StoredResult]:
+        """Look up a result, producing (and keeping) the requested encoding on first use"""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(content_hash)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(content_hash)
+            self.hits += 1
+            if encoding is None or encoding in entry.encodings:
+                return entry
+
+        encoded = compress(entry.body, encoding, stored=True)
+        with self._lock:
+            if self._entries.get(content_hash) is entry and encoding not in entry.encodings:
+                entry.encodings[encoding] = encoded
+                self._bytes += len(encoded)
+                self._evict(keep=content_hash)
+            else:
+                # Cached by a concurrent request, or replaced/evicted meanwhile; serve this copy
+                entry.encodings.setdefault(encoding, encoded)
+        return entry
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._bytes,
+            'hits': self.hits,
+            'not_modified': self.not_modified,
+            'misses': self.misses,
+            'encodings': list(SUPPORTED_ENCODINGS)
+        }
+
+    def _evict(self, keep: Optional[str] = None):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._remove(oldest)
+
+    def _expire(self):
+        if self.ttl_seconds <= 0:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        expired: List[str] = [key for key, entry in self._entries.items() if entry.stored_at < cutoff]
+        for key in expired:
+            self._remove(key)
+
+    def _remove(self, content_hash: str):
+        entry = self._entries.pop(content_hash, None)
+        if entry is not None:
+            self._bytes -= entry.size
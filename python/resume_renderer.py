@@ -0,0 +1,733 @@
+#!/usr/bin/env python3
+"""
+Server-side resume PDF rendering with PyMuPDF
+Lays out ResumeData (as produced by the parsers, or the frontend's camelCase
+JSON) with one of the frontend's templates. Fonts, measured word widths and
+template layouts are cached across renders, and batches can be spread over a
+pool of worker processes
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size('a4')
+MARGIN = 40
+SIDEBAR_WIDTH = 170
+COLUMN_GAP = 22
+
+# Sections placed in the sidebar of two-column layouts (in this order)
+SIDEBAR_SECTIONS = ('contact', 'skills', 'languages', 'certifications')
+MAIN_SECTIONS = ('summary', 'experience', 'education', 'skills', 'certifications', 'languages')
+
+SECTION_TITLES = {
+    'contact': 'Contact',
+    'summary': 'Summary',
+    'experience': 'Experience',
+    'education': 'Education',
+    'skills': 'Skills',
+    'certifications': 'Certifications',
+    'languages': 'Languages',
+}
+
+LAYOUTS = ('single-column', 'double-column', 'header-footer', 'ivy-league')
+
+
+@dataclass
+class RenderTemplate:
+    """Template identity and palette, mirroring src/data/templates.ts"""
+    id: str
+    layout: str = 'single-column'
+    primary: str = '#1F2937'
+    secondary: str = '#4B5563'
+    accent: str = '#2563EB'
+    text: str = '#1F2937'
+    background: str = '#FFFFFF'
+    sidebar: str = '#F8FAFC'
+
+
+def default_templates() -> Dict[str, RenderTemplate]:
+    templates = [
+        RenderTemplate('beige-professional-clean', 'double-column', '#2D3748', '#4A5568', '#FF8C00',
+                       '#2D3748', '#F7F3E9', '#FFFFFF'),
+        RenderTemplate('green-organic-sidebar', 'double-column', '#059669', '#047857', '#34D399',
+                       '#1F2937', '#FFFFFF', '#F0FDF4'),
+        RenderTemplate('navy-header-professional', 'double-column', '#1E293B', '#475569', '#60A5FA',
+                       '#FFFFFF', '#FFFFFF', '#1E293B'),
+        RenderTemplate('orange-timeline-modern', 'ivy-league', '#1E293B', '#475569', '#F97316',
+                       '#1F2937', '#FFFFFF', '#FFF7ED'),
+        RenderTemplate('blue-sidebar-clean', 'double-column', '#1E40AF', '#3B82F6', '#60A5FA',
+                       '#1F2937', '#FFFFFF', '#EFF6FF'),
+        RenderTemplate('soft-blue-elegant', 'ivy-league', '#1E40AF', '#6B7280', '#93C5FD',
+                       '#374151', '#FFFFFF', '#EFF6FF'),
+        RenderTemplate('ivy-league-classic', 'ivy-league', '#1F2937', '#6B7280', '#3B82F6',
+                       '#111827', '#FFFFFF', '#F9FAFB'),
+        RenderTemplate('azurill', 'double-column', '#1F2937', '#6B7280', '#3B82F6',
+                       '#374151', '#FFFFFF', '#F3F4F6'),
+        RenderTemplate('bronzor', 'header-footer', '#1E293B', '#475569', '#0EA5E9',
+                       '#334155', '#FFFFFF', '#F1F5F9'),
+        RenderTemplate('chikorita', 'single-column', '#111827', '#4B5563', '#059669',
+                       '#374151', '#FFFFFF', '#F9FAFB'),
+        RenderTemplate('modern-two-column', 'double-column', '#2563EB', '#1E40AF', '#3B82F6',
+                       '#1F2937', '#FFFFFF', '#F8FAFC'),
+    ]
+    return {template.id: template for template in templates}
+
+
+DEFAULT_TEMPLATE = 'modern-two-column'
+
+
+# --- data normalization ------------------------------------------------------
+
+_CAMEL_KEYS = {'personalInfo': 'personal_info', 'startDate': 'start_date', 'endDate': 'end_date'}
+
+
+def normalize_resume(resume: Any) -> Dict[str, Any]:
+    """ResumeData (dataclass), a parse response ({"data": ...}) or frontend JSON -> snake_case dict"""
+    if is_dataclass(resume):
+        resume = asdict(resume)
+    if isinstance(resume, dict) and 'data' in resume and 'personal_info' not in resume \
+            and 'personalInfo' not in resume:
+        resume = resume['data']
+
+    def convert(value):
+        if isinstance(value, dict):
+            return {_CAMEL_KEYS.get(key, key): convert(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [convert(item) for item in value]
+        return value
+    return convert(resume or {})
+
+
+def sample_resume() -> Dict[str, Any]:
+    """A small, realistic resume for warm-up and benchmarks"""
+    return {
+        'personal_info': {
+            'name': 'Alex Example', 'title': 'Senior Software Engineer', 'email': 'alex@example.com',
+            'phone': '+49 170 1234567', 'location': 'Berlin, Germany',
+            'linkedin': 'linkedin.com/in/alex-example', 'website': 'alex.example.dev'
+        },
+        'summary': ('Backend engineer with ten years of experience building data-intensive services, '
+                    'from payment platforms to search infrastructure. Enjoys mentoring and making '
+                    'systems observable, fast and boring to operate.'),
+        'experience': [
+            {'position': 'Senior Software Engineer', 'company': 'Acme GmbH', 'location': 'Berlin, Germany',
+             'start_date': 'Mar 2021', 'end_date': 'Present', 'current': True,
+             'description': ['Led the migration of the billing platform to an event-driven architecture.',
+                             'Cut p99 latency of the checkout API from 900 ms to 180 ms.',
+                             'Mentored four engineers and ran the backend guild.']},
+            {'position': 'Software Engineer', 'company': 'Example Search AG', 'location': 'Munich, Germany',
+             'start_date': 'Jan 2017', 'end_date': 'Feb 2021', 'current': False,
+             'description': ['Built the indexing pipeline serving 40M documents per day.',
+                             'Introduced load testing and capacity planning for all search services.']},
+            {'position': 'Junior Developer', 'company': 'Startup Labs', 'location': 'Hamburg, Germany',
+             'start_date': 'Sep 2014', 'end_date': 'Dec 2016', 'current': False,
+             'description': ['Developed internal tools and the first public REST API.']},
+        ],
+        'education': [
+            {'degree': 'M.Sc. Computer Science', 'school': 'Technical University of Munich',
+             'location': 'Munich', 'start_date': '2012', 'end_date': '2014', 'gpa': '1.3', 'description': ''},
+            {'degree': 'B.Sc. Computer Science', 'school': 'University of Hamburg',
+             'location': 'Hamburg', 'start_date': '2009', 'end_date': '2012', 'gpa': '', 'description': ''},
+        ],
+        'skills': [{'name': name, 'level': 'Expert' if i < 3 else 'Advanced'} for i, name in enumerate(
+            ['Python', 'Go', 'PostgreSQL', 'Kafka', 'Kubernetes', 'Terraform', 'AWS', 'gRPC'])],
+        'certifications': [{'name': 'AWS Certified Solutions Architect', 'issuer': 'Amazon Web Services',
+                            'date': '2022', 'url': ''}],
+        'languages': [{'name': 'German', 'level': 'Native'}, {'name': 'English', 'level': 'Fluent'}],
+    }
+
+
+# --- fonts and template layouts (cached) -------------------------------------
+
+def _rgb(hex_color: str) -> Tuple[float, float, float]:
+    value = hex_color.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(c * 2 for c in value)
+    return tuple(int(value[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+
+
+def _luminance(rgb: Tuple[float, float, float]) -> float:
+    return 0.2126 * rgb[0] + 0.7152 * rgb[1] + 0.0722 * rgb[2]
+
+
+def _readable(color: Tuple[float, float, float], background: Tuple[float, float, float]) -> Tuple[float, float, float]:
+    """`color` if it stands out from `background`, otherwise near-black or white"""
+    if abs(_luminance(color) - _luminance(background)) >= 0.35:
+        return color
+    return (1.0, 1.0, 1.0) if _luminance(background) < 0.5 else (0.07, 0.09, 0.15)
+
+
+class FontSet:
+    """Regular and bold fonts with a cache of measured word widths"""
+
+    def __init__(self, regular: 'fitz.Font', bold: 'fitz.Font'):
+        self.regular = regular
+        self.bold = bold
+        self._widths: Dict[Tuple[bool, float, str], float] = {}
+
+    def font(self, bold: bool) -> 'fitz.Font':
+        return self.bold if bold else self.regular
+
+    def width(self, text: str, size: float, bold: bool = False) -> float:
+        key = (bold, size, text)
+        width = self._widths.get(key)
+        if width is None:
+            width = self.font(bold).text_length(text, fontsize=size)
+            if len(self._widths) < 200000:
+                self._widths[key] = width
+        return width
+
+
+_font_sets: Dict[Tuple[Optional[str], Optional[str]], FontSet] = {}
+_font_lock = threading.Lock()
+
+
+def load_fonts(font_file: Optional[str] = None, bold_font_file: Optional[str] = None) -> FontSet:
+    """Fonts are loaded once per process (Helvetica unless TTF/OTF files are configured)"""
+    key = (font_file, bold_font_file)
+    with _font_lock:
+        fonts = _font_sets.get(key)
+        if fonts is None:
+            regular = fitz.Font(fontfile=font_file) if font_file else fitz.Font('helv')
+            bold = fitz.Font(fontfile=bold_font_file) if bold_font_file else \
+                (regular if font_file else fitz.Font('hebo'))
+            fonts = _font_sets[key] = FontSet(regular, bold)
+        return fonts
+
+
+@dataclass
+class TemplateLayout:
+    """Page geometry and resolved colors of a template, computed once per template"""
+    template: RenderTemplate
+    main: Tuple[float, float]
+    sidebar: Optional[Tuple[float, float]]
+    centered_header: bool
+    header_band: bool
+    colors: Dict[str, Tuple[float, float, float]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, template: RenderTemplate) -> 'TemplateLayout':
+        if template.layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout '{template.layout}' in template '{template.id}'")
+        two_columns = template.layout == 'double-column'
+        if two_columns:
+            sidebar = (MARGIN, MARGIN + SIDEBAR_WIDTH)
+            main = (MARGIN + SIDEBAR_WIDTH + COLUMN_GAP, PAGE_WIDTH - MARGIN)
+        else:
+            sidebar, main = None, (MARGIN, PAGE_WIDTH - MARGIN)
+
+        background = _rgb(template.background)
+        sidebar_fill = _rgb(template.sidebar)
+        colors = {
+            'background': background,
+            'sidebar_fill': sidebar_fill,
+            'heading': _readable(_rgb(template.primary), background),
+            'accent': _readable(_rgb(template.accent), background),
+            'muted': _readable(_rgb(template.secondary), background),
+            'text': _readable(_rgb(template.text), background),
+            # Text on the sidebar (or header band) fill, which may be dark
+            'sidebar_heading': _readable(_rgb(template.primary), sidebar_fill),
+            'sidebar_accent': _readable(_rgb(template.accent), sidebar_fill),
+            'sidebar_text': _readable(_rgb(template.text), sidebar_fill),
+        }
+        return cls(template=template, main=main, sidebar=sidebar,
+                   centered_header=template.layout in ('ivy-league', 'header-footer'),
+                   header_band=template.layout == 'header-footer', colors=colors)
+
+
+@dataclass
+class RenderResult:
+    pdf: bytes
+    pages: int
+    template: str
+
+
+# --- layout engine -----------------------------------------------------------
+
+class _Canvas:
+    """Pages of one document; text is collected per page and color and written at the end"""
+
+    def __init__(self, layout: TemplateLayout):
+        self.layout = layout
+        self.doc = fitz.open()
+        self.pages: List['fitz.Page'] = []
+        self._writers: List[Dict[Tuple[float, float, float], 'fitz.TextWriter']] = []
+
+    def page(self, index: int) -> 'fitz.Page':
+        while len(self.pages) <= index:
+            page = self.doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            colors = self.layout.colors
+            if colors['background'] != (1.0, 1.0, 1.0):
+                page.draw_rect(page.rect, color=None, fill=colors['background'], width=0)
+            if self.layout.sidebar:
+                x0, x1 = self.layout.sidebar
+                page.draw_rect(fitz.Rect(0, 0, x1 + COLUMN_GAP / 2, PAGE_HEIGHT), color=None,
+                               fill=colors['sidebar_fill'], width=0)
+            self.pages.append(page)
+            self._writers.append({})
+        return self.pages[index]
+
+    def text(self, index: int, x: float, baseline: float, text: str, font: 'fitz.Font', size: float,
+             color: Tuple[float, float, float]):
+        page = self.page(index)
+        writers = self._writers[index]
+        writer = writers.get(color)
+        if writer is None:
+            writer = writers[color] = fitz.TextWriter(page.rect)
+        writer.append((x, baseline), text, font=font, fontsize=size)
+
+    def rule(self, index: int, x0: float, x1: float, y: float, color: Tuple[float, float, float], width: float = 0.8):
+        self.page(index).draw_line((x0, y), (x1, y), color=color, width=width)
+
+    def band(self, index: int, height: float, color: Tuple[float, float, float]):
+        self.page(index).draw_rect(fitz.Rect(0, 0, PAGE_WIDTH, height), color=None, fill=color, width=0)
+
+    def finish(self) -> bytes:
+        for page, writers in zip(self.pages, self._writers):
+            for color, writer in writers.items():
+                writer.write_text(page, color=color)
+        try:
+            return self.doc.tobytes(deflate=True)
+        finally:
+            self.doc.close()
+
+
+class _Flow:
+    """A column of text flowing down the pages, starting a new page when full"""
+
+    def __init__(self, canvas: _Canvas, fonts: FontSet, x0: float, x1: float, top: float):
+        self.canvas = canvas
+        self.fonts = fonts
+        self.x0, self.x1 = x0, x1
+        self.page_index = 0
+        self.y = top
+        self.bottom = PAGE_HEIGHT - MARGIN
+
+    def ensure(self, height: float):
+        if self.y + height > self.bottom and self.y > MARGIN:
+            self.page_index += 1
+            self.y = MARGIN
+
+    def gap(self, height: float):
+        self.y += height
+
+    def line(self, text: str, size: float, color, bold: bool = False, indent: float = 0.0,
+             align: str = 'left', leading: float = 1.35):
+        height = size * leading
+        self.ensure(height)
+        width = self.fonts.width(text, size, bold)
+        if align == 'center':
+            x = (self.x0 + self.x1 - width) / 2
+        elif align == 'right':
+            x = self.x1 - width
+        else:
+            x = self.x0 + indent
+        self.canvas.text(self.page_index, x, self.y + size, text, self.fonts.font(bold), size, color)
+        self.y += height
+
+    def wrap(self, text: str, size: float, color, bold: bool = False, indent: float = 0.0,
+             align: str = 'left', bullet: Optional[str] = None, leading: float = 1.35):
+        text = ' '.join(str(text).split())
+        if not text:
+            return
+        bullet_width = self.fonts.width(bullet + ' ', size, bold) if bullet else 0.0
+        lines = self._split(text, size, bold, self.x1 - self.x0 - indent - bullet_width)
+        for i, line in enumerate(lines):
+            if bullet and i == 0:
+                self.ensure(size * leading)
+                self.canvas.text(self.page_index, self.x0 + indent, self.y + size, bullet,
+                                 self.fonts.font(bold), size, color)
+            self.line(line, size, color, bold, indent + bullet_width, align, leading)
+
+    def split_line(self, left: str, right: str, size: float, left_color, right_color,
+                   left_bold: bool = True, right_size: Optional[float] = None):
+        """Text on the left with a right-aligned note (e.g. dates) on the same line when it fits"""
+        right_size = right_size or size
+        right_width = self.fonts.width(right, right_size) if right else 0.0
+        available = self.x1 - self.x0 - right_width - 8
+        if not right or self.fonts.width(left, size, left_bold) <= available:
+            self.ensure(size * 1.35)
+            if right:
+                self.canvas.text(self.page_index, self.x1 - right_width, self.y + size, right,
+                                 self.fonts.font(False), right_size, right_color)
+            self.line(left, size, left_color, left_bold)
+        else:
+            self.wrap(left, size, left_color, left_bold)
+            self.line(right, right_size, right_color)
+
+    def _split(self, text: str, size: float, bold: bool, width: float) -> List[str]:
+        space = self.fonts.width(' ', size, bold)
+        lines, current, current_width = [], [], 0.0
+        for word in text.split(' '):
+            word_width = self.fonts.width(word, size, bold)
+            if word_width > width:
+                # Break words that cannot fit on any line (long URLs)
+                if current:
+                    lines.append(' '.join(current))
+                    current, current_width = [], 0.0
+                piece = ''
+                for char in word:
+                    if self.fonts.width(piece + char, size, bold) > width and piece:
+                        lines.append(piece)
+                        piece = ''
+                    piece += char
+                word, word_width = piece, self.fonts.width(piece, size, bold)
+            if current and current_width + space + word_width > width:
+                lines.append(' '.join(current))
+                current, current_width = [], 0.0
+            current_width += (space if current else 0.0) + word_width
+            current.append(word)
+        if current:
+            lines.append(' '.join(current))
+        return lines
+
+
+def _date_range(item: Dict[str, Any]) -> str:
+    start = (item.get('start_date') or '').strip()
+    end = (item.get('end_date') or '').strip()
+    if item.get('current') and not end:
+        end = 'Present'
+    if start and end:
+        return f"{start} – {end}"
+    return start or end
+
+
+# --- renderer ----------------------------------------------------------------
+
+class ResumeRenderer:
+    """Renders resumes to PDF; template layouts are built on first use and reused"""
+
+    def __init__(self, templates: Optional[Dict[str, RenderTemplate]] = None,
+                 font_file: Optional[str] = None, bold_font_file: Optional[str] = None):
+        self.templates = templates if templates is not None else default_templates()
+        self.font_file = font_file
+        self.bold_font_file = bold_font_file
+        self._layouts: Dict[str, TemplateLayout] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'ResumeRenderer':
+        """RENDER_TEMPLATES adds templates from JSON ({"templates": [{"id": ..., "layout": ..., ...}]});
+        RENDER_FONT_FILE / RENDER_BOLD_FONT_FILE select TTF/OTF fonts (needed beyond Latin scripts)"""
+        templates = default_templates()
+        path = os.getenv('RENDER_TEMPLATES')
+        if path:
+            with open(path, encoding='utf-8') as f:
+                config = json.load(f)
+            templates.update({t['id']: RenderTemplate(**t) for t in config.get('templates', [])})
+        return cls(templates, os.getenv('RENDER_FONT_FILE') or None, os.getenv('RENDER_BOLD_FONT_FILE') or None)
+
+    def layout(self, template_id: str) -> TemplateLayout:
+        layout = self._layouts.get(template_id)
+        if layout is None:
+            template = self.templates.get(template_id)
+            if template is None:
+                raise ValueError(f"Unknown template '{template_id}' (available: {', '.join(sorted(self.templates))})")
+            with self._lock:
+                layout = self._layouts.setdefault(template_id, TemplateLayout.build(template))
+        return layout
+
+    def render(self, resume: Any, template_id: str = DEFAULT_TEMPLATE) -> RenderResult:
+        layout = self.layout(template_id)
+        fonts = load_fonts(self.font_file, self.bold_font_file)
+        data = normalize_resume(resume)
+        canvas = _Canvas(layout)
+        canvas.page(0)
+
+        main = _Flow(canvas, fonts, layout.main[0], layout.main[1], MARGIN)
+        self._render_header(main, canvas, layout, data)
+
+        if layout.sidebar:
+            sidebar = _Flow(canvas, fonts, layout.sidebar[0], layout.sidebar[1], MARGIN)
+            for section in SIDEBAR_SECTIONS:
+                self._render_section(sidebar, layout, section, data, in_sidebar=True)
+            main_sections = [s for s in MAIN_SECTIONS if s not in SIDEBAR_SECTIONS]
+        else:
+            main_sections = list(MAIN_SECTIONS)
+        for section in main_sections:
+            self._render_section(main, layout, section, data, in_sidebar=False)
+
+        pdf = canvas.finish()
+        return RenderResult(pdf=pdf, pages=len(canvas.pages), template=template_id)
+
+    def _render_header(self, flow: _Flow, canvas: _Canvas, layout: TemplateLayout, data: Dict[str, Any]):
+        info = data.get('personal_info') or {}
+        colors = layout.colors
+        align = 'center' if layout.centered_header else 'left'
+        heading, muted = colors['heading'], colors['muted']
+        if layout.header_band:
+            heading, muted = colors['sidebar_heading'], colors['sidebar_text']
+            flow.gap(6)
+
+        if info.get('name'):
+            flow.wrap(info['name'], 24, heading, bold=True, align=align, leading=1.2)
+        if info.get('title'):
+            flow.wrap(info['title'], 12, muted, align=align)
+        if not layout.sidebar:
+            contact = ' · '.join(info.get(key) for key in ('email', 'phone', 'location', 'linkedin', 'website')
+                                 if info.get(key))
+            if contact:
+                flow.gap(2)
+                flow.wrap(contact, 9, muted, align=align)
+        flow.gap(8)
+        if layout.header_band:
+            canvas.band(0, flow.y, colors['sidebar_fill'])
+            flow.gap(10)
+
+    def _section_title(self, flow: _Flow, layout: TemplateLayout, title: str, in_sidebar: bool):
+        colors = layout.colors
+        flow.ensure(40)
+        flow.gap(4)
+        flow.line(title.upper(), 11, colors['sidebar_heading' if in_sidebar else 'heading'], bold=True)
+        flow.canvas.rule(flow.page_index, flow.x0, flow.x1, flow.y - 1,
+                         colors['sidebar_accent' if in_sidebar else 'accent'])
+        flow.gap(5)
+
+    def _render_section(self, flow: _Flow, layout: TemplateLayout, section: str, data: Dict[str, Any],
+                        in_sidebar: bool):
+        colors = layout.colors
+        text = colors['sidebar_text' if in_sidebar else 'text']
+        heading = colors['sidebar_heading' if in_sidebar else 'heading']
+        muted = colors['sidebar_text' if in_sidebar else 'muted']
+
+        if section == 'contact':
+            info = data.get('personal_info') or {}
+            values = [info.get(key) for key in ('email', 'phone', 'location', 'linkedin', 'website') if info.get(key)]
+            if values:
+                self._section_title(flow, layout, SECTION_TITLES[section], in_sidebar)
+                for value in values:
+                    flow.wrap(value, 9, text)
+                flow.gap(8)
+            return
+
+        if section == 'summary':
+            if data.get('summary'):
+                self._section_title(flow, layout, SECTION_TITLES[section], in_sidebar)
+                flow.wrap(data['summary'], 9.5, text, leading=1.4)
+                flow.gap(8)
+            return
+
+        items = [item for item in (data.get(section) or []) if isinstance(item, dict)]
+        if not items:
+            return
+        self._section_title(flow, layout, SECTION_TITLES[section], in_sidebar)
+
+        if section == 'experience':
+            for item in items:
+                flow.ensure(40)
+                flow.split_line(item.get('position') or item.get('company') or '', _date_range(item),
+                                10.5, heading, muted, right_size=9)
+                company = ' · '.join(v for v in (item.get('company') if item.get('position') else '',
+                                                 item.get('location')) if v)
+                if company:
+                    flow.wrap(company, 9.5, muted)
+                for bullet in item.get('description') or []:
+                    flow.wrap(bullet, 9.5, text, indent=4, bullet='•', leading=1.35)
+                flow.gap(6)
+        elif section == 'education':
+            for item in items:
+                flow.ensure(30)
+                flow.split_line(item.get('degree') or item.get('school') or '', _date_range(item),
+                                10.5, heading, muted, right_size=9)
+                school = ' · '.join(v for v in (item.get('school') if item.get('degree') else '',
+                                                item.get('location')) if v)
+                if school:
+                    flow.wrap(school, 9.5, muted)
+                if item.get('gpa'):
+                    flow.wrap(f"GPA: {item['gpa']}", 9, text)
+                if item.get('description'):
+                    flow.wrap(item['description'], 9, text)
+                flow.gap(6)
+        elif section == 'skills':
+            if in_sidebar:
+                for item in items:
+                    level = item.get('level') or ''
+                    flow.wrap(f"{item.get('name', '')}" + (f"  ·  {level}" if level else ''), 9, text)
+            else:
+                flow.wrap(' · '.join(item.get('name', '') for item in items if item.get('name')), 9.5, text)
+            flow.gap(8)
+        elif section == 'certifications':
+            for item in items:
+                flow.wrap(item.get('name', ''), 9.5, heading, bold=True)
+                detail = ' · '.join(v for v in (item.get('issuer'), item.get('date')) if v)
+                if detail:
+                    flow.wrap(detail, 9, muted)
+                flow.gap(3)
+            flow.gap(5)
+        elif section == 'languages':
+            for item in items:
+                level = item.get('level') or ''
+                flow.wrap(item.get('name', '') + (f" ({level})" if level else ''), 9.5, text)
+            flow.gap(8)
+
+
+# --- worker pool -------------------------------------------------------------
+
+_worker_renderer: Optional[ResumeRenderer] = None
+
+
+def _warm_worker():
+    """Worker initializer: load fonts and every template layout before the first job"""
+    global _worker_renderer
+    _worker_renderer = ResumeRenderer.from_env()
+    for template_id in _worker_renderer.templates:
+        _worker_renderer.render(sample_resume(), template_id)
+
+
+def _render_job(resume: Dict[str, Any], template_id: str) -> RenderResult:
+    renderer = _worker_renderer or ResumeRenderer.from_env()
+    return renderer.render(resume, template_id)
+
+
+class RenderPool:
+    """Worker processes for batch rendering (PyMuPDF holds the GIL while laying out pages).
+
+    With `workers` set to 0, batches are rendered on the calling thread.
+    Workers load fonts and template layouts once when they start.
+    """
+
+    def __init__(self, workers: int = 0, max_tasks_per_child: int = 500, renderer: Optional[ResumeRenderer] = None):
+        self.workers = workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.renderer = renderer or ResumeRenderer.from_env()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> 'RenderPool':
+        return cls(
+            workers=int(os.getenv('RENDER_WORKERS', '0')),
+            max_tasks_per_child=int(os.getenv('RENDER_MAX_TASKS', '500'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def start(self) -> 'RenderPool':
+        if not self.enabled:
+            return self
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_warm_worker,
+                    max_tasks_per_child=self.max_tasks_per_child or None
+                )
+        return self
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def render_many(self, jobs: List[Tuple[Any, str]]) -> List[RenderResult]:
+        """Render (resume, template_id) pairs, preserving order"""
+        if not self.enabled:
+            return [self.renderer.render(resume, template_id) for resume, template_id in jobs]
+        self.start()
+        futures = [self._executor.submit(_render_job, normalize_resume(resume), template_id)
+                   for resume, template_id in jobs]
+        return [future.result() for future in futures]
+
+
+# --- CLI ---------------------------------------------------------------------
+
+def _load_inputs(paths: List[str]) -> List[Tuple[str, Any]]:
+    """(name, resume) pairs from JSON files or directories; a file may hold one resume or a list"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json'))
+        else:
+            files.append(path)
+    inputs = []
+    for file_path in files:
+        with open(file_path, encoding='utf-8') as f:
+            content = json.load(f)
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        if isinstance(content, list):
+            inputs.extend((f"{stem}-{i + 1}", resume) for i, resume in enumerate(content))
+        else:
+            inputs.append((stem, content))
+    return inputs
+
+
+def benchmark(pool: RenderPool, jobs: List[Tuple[Any, str]]) -> Dict[str, Any]:
+    """Render the jobs once (after a warm-up render) and report pages per second"""
+    pool.start()
+    pool.render_many(jobs[:1])
+    start = time.perf_counter()
+    results = pool.render_many(jobs)
+    elapsed = time.perf_counter() - start
+    pages = sum(result.pages for result in results)
+    return {
+        'workers': pool.workers,
+        'documents': len(results),
+        'pages': pages,
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 1) if elapsed else 0.0,
+        'documents_per_second': round(len(results) / elapsed, 1) if elapsed else 0.0
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render resumes (ResumeData JSON) to PDF')
+    parser.add_argument('inputs', nargs='*', help='ResumeData JSON files (or directories); parse responses are accepted')
+    parser.add_argument('--template', '-t', default=DEFAULT_TEMPLATE, help=f'Template ID (default: {DEFAULT_TEMPLATE})')
+    parser.add_argument('--output-dir', '-o', default='.', help='Directory for the rendered PDFs')
+    parser.add_argument('--workers', '-w', type=int, default=int(os.getenv('RENDER_WORKERS', '0')),
+                        help='Worker processes (0 = render in this process)')
+    parser.add_argument('--list-templates', action='store_true', help='List the available templates and exit')
+    parser.add_argument('--benchmark', type=int, metavar='N',
+                        help='Render N copies of the inputs (or of a built-in sample) and report pages/second')
+
+    args = parser.parse_args()
+
+    try:
+        renderer = ResumeRenderer.from_env()
+        if args.list_templates:
+            for template in renderer.templates.values():
+                print(f"{template.id:<28} {template.layout}")
+            return
+
+        inputs = _load_inputs(args.inputs) if args.inputs else []
+        pool = RenderPool(workers=args.workers, renderer=renderer)
+        try:
+            if args.benchmark:
+                resumes = [resume for _, resume in inputs] or [sample_resume()]
+                jobs = [(resumes[i % len(resumes)], args.template) for i in range(args.benchmark)]
+                print(json.dumps(benchmark(pool, jobs), indent=2))
+                return
+
+            if not inputs:
+                parser.error('no input files given')
+            results = pool.render_many([(resume, args.template) for _, resume in inputs])
+            os.makedirs(args.output_dir, exist_ok=True)
+            for (name, _), result in zip(inputs, results):
+                path = os.path.join(args.output_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', name) + '.pdf')
+                with open(path, 'wb') as f:
+                    f.write(result.pdf)
+                print(f"[RENDER] {path} ({result.pages} page(s))")
+        finally:
+            pool.shutdown()
+
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
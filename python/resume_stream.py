@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Streaming mode for the heuristic LinkedIn PDF parser
+Consumes line blocks page by page and emits each entry (experience,
+education, skill, ...) as soon as it is complete, keeping only the state of
+the current section instead of the whole document
+"""
+
+import re
+from collections import deque
+from dataclasses import dataclass, asdict, is_dataclass
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from pdf_parser import Education, Experience, LinkedInPDFParser, PersonalInfo, ResumeData
+
+# The batch parser looks for the name, title and contact details in this many leading lines
+PERSONAL_INFO_LINES = 15
+
+# _extract_job_details looks at the 3 lines before and the 2 lines after an entry's date line
+JOB_CONTEXT_BEFORE = 3
+JOB_CONTEXT_AFTER = 2
+
+# ResumeData list field each line-wise section is collected into
+LIST_SECTIONS = {
+    'skills': ('skill', 'skills'),
+    'certifications': ('certification', 'certifications'),
+    'languages': ('language', 'languages'),
+}
+
+
+@dataclass
+class ParseEvent:
+    """One streamed result: an entry kind ('experience', 'skill', ...) and its data"""
+    kind: str
+    data: Any
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.kind, 'data': asdict(self.data) if is_dataclass(self.data) else self.data}
+
+
+class _ExperienceStream:
+    """Incremental form of LinkedInPDFParser._parse_experience_enhanced.
+
+    An entry is emitted once the next entry has started (its description is
+    complete) and the lines after its date line that the job-detail lookup
+    reads have been seen.
+    """
+
+    def __init__(self, parser: LinkedInPDFParser):
+        self.parser = parser
+        self.count = 0
+        self.current: Optional[Experience] = None
+        self._recent: Deque[str] = deque(maxlen=JOB_CONTEXT_BEFORE)
+        # [experience, context lines, index of the date line in context], oldest first
+        self._pending: Deque[list] = deque()
+
+    def feed(self, line: str) -> List[Experience]:
+        line = line.strip()
+        for entry in self._pending:
+            if len(entry[1]) < entry[2] + 1 + JOB_CONTEXT_AFTER:
+                entry[1].append(line)
+
+        date_match = re.search(self.parser.linkedin_patterns['date_range'], self.parser._bounded(line),
+                               re.IGNORECASE)
+        if date_match:
+            self.count += 1
+            self.current = Experience(
+                id=str(self.count),
+                start_date=date_match.group(1),
+                end_date=date_match.group(2),
+                current='present' in date_match.group(2).lower() or 'current' in date_match.group(2).lower()
+            )
+            context = list(self._recent) + [line]
+            self._pending.append([self.current, context, len(context) - 1])
+        elif self.current and self.parser._is_experience_description(line):
+            self.current.description.append(line)
+
+        self._recent.append(line)
+        return self._ready(final=False)
+
+    def finish(self) -> List[Experience]:
+        return self._ready(final=True)
+
+    def _ready(self, final: bool) -> List[Experience]:
+        completed = []
+        while self._pending:
+            experience, context, date_index = self._pending[0]
+            has_context = len(context) >= date_index + 1 + JOB_CONTEXT_AFTER
+            if not final and (experience is self.current or not has_context):
+                break
+            self.parser._extract_job_details(context, date_index, experience)
+            completed.append(self._pending.popleft()[0])
+        return completed
+
+
+class _EducationStream:
+    """Incremental form of LinkedInPDFParser._parse_education_enhanced"""
+
+    def __init__(self, parser: LinkedInPDFParser):
+        self.parser = parser
+        self.count = 0
+        self.current: Optional[Education] = None
+
+    def feed(self, line: str) -> List[Education]:
+        line = line.strip()
+        if not line:
+            return []
+        date_match = re.search(r'(\d{4})\s*[-–]\s*(\d{4})', self.parser._bounded(line))
+        if date_match:
+            completed = [self.current] if self.current else []
+            self.count += 1
+            self.current = Education(
+                id=str(self.count),
+                start_date=date_match.group(1),
+                end_date=date_match.group(2)
+            )
+            return completed
+        if self.current:
+            self.parser._add_education_detail(self.current, line)
+        return []
+
+    def finish(self) -> List[Education]:
+        completed = [self.current] if self.current else []
+        self.current = None
+        return completed
+
+
+class _LineListStream:
+    """Sections parsed line by line (skills, certifications, languages), renumbered across lines"""
+
+    def __init__(self, parse_lines: Callable[[List[str]], List[Any]]):
+        self.parse_lines = parse_lines
+        self.count = 0
+
+    def feed(self, line: str) -> List[Any]:
+        items = self.parse_lines([line])
+        for item in items:
+            self.count += 1
+            item.id = str(self.count)
+        return items
+
+    def finish(self) -> List[Any]:
+        return []
+
+
+class ResumeStreamBuilder:
+    """Section state machine over a document's line blocks.
+
+    Feed blocks in document order (as produced by
+    pdf_extraction.iter_page_blocks); each call returns the events completed
+    by that line. Section lines are routed exactly like the batch parser's
+    _get_section_lines, so the collected result equals
+    `LinkedInPDFParser.parse_document(document, use_layouts=False)`. Only the
+    first lines (for the personal info), the current entry of each section and
+    the summary text are retained; with `collect=False` completed entries are
+    not kept either, so memory stays flat for arbitrarily long documents.
+    """
+
+    def __init__(self, parser: LinkedInPDFParser, collect: bool = True):
+        self.parser = parser
+        self.collect = collect
+        self.resume = ResumeData(personal_info=PersonalInfo())
+        self.counts: Dict[str, int] = {}
+        self.lines_seen = 0
+
+        self._head_lines: Optional[List[str]] = []
+        self._head_blocks: List[Dict[str, Any]] = []
+        self._summary_lines: List[str] = []
+        self._streams = {
+            'experience': _ExperienceStream(parser),
+            'education': _EducationStream(parser),
+            'skills': _LineListStream(parser._parse_skill_lines),
+            'certifications': _LineListStream(parser._parse_certification_lines),
+            'languages': _LineListStream(parser._parse_language_lines),
+        }
+        # Section currently open, and copies of its lines for repeated headers of the same section
+        self._section: Optional[str] = None
+        self._repeat_buffers: List[List[str]] = []
+
+    def feed(self, block: Dict[str, Any]) -> List[ParseEvent]:
+        events: List[ParseEvent] = []
+        line = block['text']
+        self.lines_seen += 1
+
+        if self._head_lines is not None:
+            self._head_lines.append(line)
+            self._head_blocks.append(block)
+            if len(self._head_lines) == PERSONAL_INFO_LINES:
+                events.extend(self._emit_personal_info())
+
+        section_type = self.parser._classify_header(line, block)
+        if section_type and section_type != self._section:
+            events.extend(self._close_section())
+            self._section = section_type
+        elif self._section:
+            # A repeated header of the open section is content for its earlier headers;
+            # the batch parser then emits the lines after it once more per repeat
+            events.extend(self._route(self._section, line))
+            for buffer in self._repeat_buffers:
+                buffer.append(line)
+            if section_type:
+                self._repeat_buffers.append([])
+        return events
+
+    def finish(self) -> List[ParseEvent]:
+        """Flush open entries; the last event is the full result ('resume') or the entry counts ('done')"""
+        events = self._close_section()
+        if self._head_lines is not None:
+            events.extend(self._emit_personal_info())
+        for section_type, stream in self._streams.items():
+            events.extend(self._events(section_type, stream.finish()))
+
+        summary = re.sub(r'\s+', ' ', ' '.join(self._summary_lines)).strip()
+        if summary:
+            events.append(self._event('summary', summary))
+        if self.collect:
+            self.resume.summary = summary
+            events.append(ParseEvent('resume', self.resume))
+        else:
+            events.append(ParseEvent('done', {'counts': dict(self.counts), 'lines': self.lines_seen}))
+        return events
+
+    def _close_section(self) -> List[ParseEvent]:
+        events = []
+        buffers, self._repeat_buffers = self._repeat_buffers, []
+        for buffer in buffers:
+            for line in buffer:
+                events.extend(self._route(self._section, line))
+        return events
+
+    def _route(self, section_type: str, line: str) -> List[ParseEvent]:
+        if section_type == 'summary':
+            self._summary_lines.append(line.strip())
+            return []
+        stream = self._streams.get(section_type)
+        if stream is None:
+            return []
+        return self._events(section_type, stream.feed(line))
+
+    def _emit_personal_info(self) -> List[ParseEvent]:
+        personal_info = self.parser._parse_personal_info_enhanced(self._head_lines, self._head_blocks, {})
+        self._head_lines, self._head_blocks = None, []
+        self.resume.personal_info = personal_info
+        return [self._event('personal_info', personal_info)]
+
+    def _events(self, section_type: str, items: List[Any]) -> List[ParseEvent]:
+        kind, field_name = LIST_SECTIONS.get(section_type, (section_type, section_type))
+        if self.collect:
+            getattr(self.resume, field_name).extend(items)
+        return [self._event(kind, item) for item in items]
+
+    def _event(self, kind: str, data: Any) -> ParseEvent:
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        return ParseEvent(kind, data)
+
+
+def stream_blocks(parser: LinkedInPDFParser, pages: Iterator[List[Dict[str, Any]]],
+                  collect: bool = True) -> Iterator[ParseEvent]:
+    """Run the state machine over per-page line blocks, yielding events as entries complete"""
+    builder = ResumeStreamBuilder(parser, collect)
+    for page_blocks in pages:
+        for block in page_blocks:
+            yield from builder.feed(block)
+    yield from builder.finish()
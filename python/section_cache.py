@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Segmented text of recently parsed documents, keyed by PDF content hash
+Lets single sections be re-extracted later without the PDF being uploaded
+or decoded again; a document is segmented only when a re-extraction first
+asks for it
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+@dataclass
+class CachedSegmentation:
+    content_hash: str
+    # Normalized document text (for sections the segmentation did not find)
+    text: str
+    # Raw text per extraction schema key, from the heuristic segmentation
+    section_texts: Dict[str, str] = field(default_factory=dict)
+    confidence: float = 0.0
+    stored_at: float = 0.0
+    # Until the first `get`: produces (text, section_texts, confidence)
+    loader: Optional[Callable[[], Tuple[str, Dict[str, str], float]]] = None
+    # Size charged while the entry is unresolved (the document text length)
+    pending_size: int = 0
+
+    @property
+    def size(self) -> int:
+        if self.loader is not None:
+            return self.pending_size
+        return len(self.text) + sum(len(text) for text in self.section_texts.values())
+
+
+class SectionCache:
+    """Bounded, thread-safe LRU of segmentations with a TTL.
+
+    Least recently used entries are evicted beyond `max_entries` or
+    `max_chars` (document and section text). A `max_entries` of 0 disables
+    the cache.
+    """
+
+    def __init__(self, max_entries: int = 256, max_chars: int = 32 * 1024 * 1024, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.ttl_seconds = ttl_seconds
+        self._entries: 'OrderedDict[str, CachedSegmentation]' = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> 'SectionCache':
+        return cls(
+            max_entries=int(os.getenv('SECTION_CACHE_SIZE', '256')),
+            max_chars=int(float(os.getenv('SECTION_CACHE_MAX_MB', '32')) * 1024 * 1024),
+            ttl_seconds=float(os.getenv('SECTION_CACHE_TTL_SECONDS', '86400'))
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def put(self, content_hash: str, text: str, section_texts: Dict[str, str], confidence: float):
+        if not self.enabled:
+            return
+        self._store(CachedSegmentation(content_hash, text, dict(section_texts), confidence, time.time()))
+
+    def put_lazy(self, content_hash: str, loader: Callable[[], Tuple[str, Dict[str, str], float]], size: int):
+        """Remember a document whose segmentation `loader` computes on its first `get`
+
+        Most parsed documents never have a section re-extracted, so they are
+        not segmented up front; `size` (e.g. the document text length) is
+        charged against `max_chars` until then.
+        """
+        if not self.enabled:
+            return
+        self._store(CachedSegmentation(content_hash, '', stored_at=time.time(), loader=loader, pending_size=size))
+
+    def _store(self, entry: CachedSegmentation):
+        content_hash = entry.content_hash
+        with self._lock:
+            self._remove(content_hash)
+            self._entries[content_hash] = entry
+            self._chars += entry.size
+            while self._entries and (len(self._entries) > self.max_entries or self._chars > self.max_chars):
+                self._remove(next(iter(self._entries)))
+
+    def get(self, content_hash: str) -> Optional[CachedSegmentation]:
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is not None and self.ttl_seconds > 0 and entry.stored_at < time.time() - self.ttl_seconds:
+                self._remove(content_hash)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(content_hash)
+            self.hits += 1
+            loader = entry.loader
+        if loader is not None:
+            # Segmented outside the lock; a failure propagates and the entry stays unresolved
+            text, section_texts, confidence = loader()
+            with self._lock:
+                if entry.loader is not None:
+                    # Recharge the entry at its real size if it is still cached
+                    cached = self._entries.get(content_hash) is entry
+                    if cached:
+                        self._chars -= entry.size
+                    entry.text, entry.section_texts, entry.confidence = text, dict(section_texts), confidence
+                    entry.loader = None
+                    if cached:
+                        self._chars += entry.size
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self._entries),
+            'chars': self._chars,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+    def _remove(self, content_hash: str):
+        entry = self._entries.pop(content_hash, None)
+        if entry is not None:
+            self._chars -= entry.size
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Single-flight coalescing of identical in-flight work
+Concurrent calls with the same key share one execution and its outcome
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait on the same future and receive the same
+    result or exception. Nothing is cached: once the leader finishes, the key
+    is released and the next call starts fresh work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Tuple[Any, bool]:
+        """Run `fn` for `key` or join an in-flight run.
+
+        Returns `(result, shared)` where `shared` is True for callers that
+        joined another caller's execution.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._release(key)
+            future.set_exception(e)
+            raise
+        self._release(key)
+        future.set_result(result)
+        return result, False
+
+    def _release(self, key: str):
+        # Released before the outcome is published so failures are never reused
+        with self._lock:
+            self._calls.pop(key, None)
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
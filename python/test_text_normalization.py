@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the boilerplate filter's page-edge de-duplication
+Run with: python -m pytest test_text_normalization.py
+"""
+
+import unittest
+
+from text_normalization import BoilerplateFilter
+
+
+def _page(*lines: str) -> str:
+    return "\n".join(lines) + "\n"
+
+
+class BoilerplateFilterTest(unittest.TestCase):
+
+    def test_running_footer_is_sent_once(self):
+        pages = [
+            _page("Experience", f"Role {n}", "Acme", "www.linkedin.com/in/jane-doe", f"Page {n} of 3")
+            for n in range(1, 4)
+        ]
+        text = BoilerplateFilter().clean_pages(pages)
+        self.assertEqual(text.count("www.linkedin.com/in/jane-doe"), 1)
+        self.assertNotIn("Page 2 of 3", text)
+
+    def test_repeated_title_at_page_top_survives(self):
+        # The same job title and company recur near the page edges, but not at the same place
+        pages = [
+            _page("Jane Doe", "Experience", "Senior Software Engineer", "Acme Corp", "2019 - 2021",
+                  "Built the billing platform", "Senior Software Engineer"),
+            _page("Senior Software Engineer", "Acme Corp", "2016 - 2019", "Ran the data team",
+                  "Education", "MIT"),
+        ]
+        text = BoilerplateFilter().clean_pages(pages)
+        self.assertEqual(text.count("Senior Software Engineer"), 3)
+        self.assertEqual(text.count("Acme Corp"), 2)
+
+    def test_streamed_pages_keep_lines_repeated_on_two_pages(self):
+        normalizer = BoilerplateFilter()
+        pages = [_page("Senior Software Engineer", f"Entry {n}", "Details", "More details") for n in range(3)]
+        text = "".join(normalizer.feed(page) for page in pages)
+        # Same slot on every page: kept on the first two, dropped once it looks like a running header
+        self.assertEqual(text.count("Senior Software Engineer"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
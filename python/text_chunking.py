@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Incremental text chunking for pipelined LLM extraction
+Emits a chunk as soon as enough text has arrived instead of waiting for the
+whole document
+"""
+
+from typing import Iterator
+
+# Preferred split points, best first (mirrors RecursiveCharacterTextSplitter)
+SEPARATORS = ["\n\n", "\n", " "]
+
+
+class StreamingChunker:
+    """Splits a stream of text into chunks of at most `chunk_size` characters.
+
+    Each chunk ends at the best available separator and the next chunk starts
+    with up to `chunk_overlap` characters of context from the previous one.
+    """
+
+    def __init__(self, chunk_size: int = 4000, chunk_overlap: int = 200):
+        if chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be smaller than chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self._buffer = ""
+
+    def feed(self, text: str) -> Iterator[str]:
+        """Add text and yield every chunk that is now complete"""
+        self._buffer += text
+        while len(self._buffer) > self.chunk_size:
+            cut = self._split_point(self._buffer)
+            chunk = self._buffer[:cut].strip()
+            self._buffer = self._overlap(self._buffer[:cut]) + self._buffer[cut:]
+            if chunk:
+                yield chunk
+
+    def finish(self) -> Iterator[str]:
+        """Yield whatever remains once the stream has ended"""
+        chunk = self._buffer.strip()
+        self._buffer = ""
+        if chunk:
+            yield chunk
+
+    def _split_point(self, text: str) -> int:
+        window = text[:self.chunk_size]
+        for separator in SEPARATORS:
+            index = window.rfind(separator)
+            # Ignore separators so early that the chunk would be mostly overlap
+            if index > self.chunk_overlap:
+                return index + len(separator)
+        return self.chunk_size
+
+    def _overlap(self, text: str) -> str:
+        if not self.chunk_overlap:
+            return ""
+        tail = text[-self.chunk_overlap:]
+        # Start the overlap at a word boundary
+        space = tail.find(" ")
+        return tail[space + 1:] if 0 <= space < len(tail) - 1 else tail
+
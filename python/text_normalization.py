@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Boilerplate stripping and text minification before LLM submission
+Removes page footers and lines repeated at the same place on the page edges,
+joins hyphenated line breaks and collapses whitespace, page by page, so it
+also works on the pipelined page stream
+"""
+
+import re
+from collections import Counter
+from typing import Dict, Any, List, Optional, Set, Tuple
+
+from rate_limiter import estimate_tokens
+
+# Pagination lines: explicit ones are removed anywhere, bare counters only at a page edge
+PAGE_LABEL_PATTERN = re.compile(r'^(?:page|seite)\s+\d+\s*(?:(?:of|von|/)\s*\d+)?$', re.IGNORECASE)
+PAGE_NUMBER_PATTERNS = [
+    re.compile(r'^\d+\s*(?:/|of|von)\s*\d+$', re.IGNORECASE),
+    re.compile(r'^-?\s*\d{1,3}\s*-?$'),
+]
+
+# Lines this close to the top or bottom of a page count as header/footer candidates
+EDGE_LINES = 3
+# A whole document's edge line is page furniture when it sits at the same edge position
+# on more than half of the pages, and on at least this many
+EDGE_REPEAT_PAGES = 2
+# The pipelined page stream has no page count, so there it must first repeat on this many pages
+STREAM_EDGE_REPEAT_PAGES = 3
+
+HORIZONTAL_SPACE = re.compile(r'[ \t\u00a0\u2000-\u200b\u202f\u3000]+')
+HYPHENATED_BREAK = re.compile(r'(?<=[A-Za-zÀ-ÿ])-\n(?=[a-zà-ÿ])')
+
+
+def _edge_key(line: str) -> str:
+    """Compare edge lines ignoring case (numbers matter: entries often differ only in them)"""
+    return line.lower()
+
+
+def _edge_slots(lines: List[str]) -> Dict[int, List[Tuple[str, int, str]]]:
+    """(edge, distance from it, key) of each line index within EDGE_LINES content lines of a page edge"""
+    content_indices = [i for i, line in enumerate(lines) if line.strip()]
+    slots: Dict[int, List[Tuple[str, int, str]]] = {}
+    for distance, i in enumerate(content_indices[:EDGE_LINES]):
+        slots.setdefault(i, []).append(('top', distance, _edge_key(HORIZONTAL_SPACE.sub(' ', lines[i]).strip())))
+    for distance, i in enumerate(reversed(content_indices[-EDGE_LINES:])):
+        slots.setdefault(i, []).append(('bottom', distance, _edge_key(HORIZONTAL_SPACE.sub(' ', lines[i]).strip())))
+    return slots
+
+
+def minify(text: str) -> str:
+    """Collapse whitespace, join hyphenated line breaks and drop empty-line runs"""
+    lines = [HORIZONTAL_SPACE.sub(' ', line).strip() for line in text.splitlines()]
+    text = "\n".join(lines)
+    text = HYPHENATED_BREAK.sub('', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+class BoilerplateFilter:
+    """Incremental page-by-page cleaner.
+
+    - "Page 2 of 3" lines are removed; bare counters ("2/3", "- 2 -") only
+      at a page's top or bottom.
+    - With `dedupe_edges`, page furniture (a running header or footer such
+      as the profile URL) is sent once: a line within EDGE_LINES of a page's
+      top or bottom is dropped when the same text (ignoring case and
+      whitespace) sits at the same distance from the same edge on other
+      pages. `clean_pages` sees the whole document and drops it after its
+      first occurrence when it repeats on more than half of the pages (and
+      at least EDGE_REPEAT_PAGES); page by page (`feed`) it is dropped once
+      it has repeated on STREAM_EDGE_REPEAT_PAGES pages. Content that merely
+      recurs near an edge (a job title or company at the bottom of one page
+      and the top of the next) is kept.
+    - Each page is then minified.
+
+    `stats()` reports how much text (and how many estimated tokens) was saved.
+    """
+
+    def __init__(self, dedupe_edges: bool = True):
+        self.dedupe_edges = dedupe_edges
+        # Pages on which each (edge, distance, key) slot has been seen so far
+        self._slot_pages: Counter = Counter()
+        # Slots known to be page furniture (set by `clean_pages`; None while streaming)
+        self._furniture: Optional[Set[Tuple[str, int, str]]] = None
+        self.chars_before = 0
+        self.chars_after = 0
+        self.tokens_before = 0
+        self.tokens_after = 0
+        self.lines_removed = 0
+
+    def feed(self, page_text: str) -> str:
+        """Clean one page and return its text (newline-terminated, like PyMuPDF page text)"""
+        lines = page_text.splitlines()
+        slots = _edge_slots(lines)
+
+        kept: List[str] = []
+        for i, line in enumerate(lines):
+            stripped = HORIZONTAL_SPACE.sub(' ', line).strip()
+            if not stripped:
+                kept.append('')
+                continue
+            if PAGE_LABEL_PATTERN.match(stripped):
+                self.lines_removed += 1
+                continue
+            if i in slots:
+                if any(pattern.match(stripped) for pattern in PAGE_NUMBER_PATTERNS):
+                    self.lines_removed += 1
+                    continue
+                if self.dedupe_edges and any(self._is_repeat(slot) for slot in slots[i]):
+                    self.lines_removed += 1
+                    continue
+            kept.append(line)
+        self._slot_pages.update({slot for line_slots in slots.values() for slot in line_slots})
+
+        cleaned = minify("\n".join(kept))
+        if cleaned:
+            cleaned += "\n"
+        self.chars_before += len(page_text)
+        self.chars_after += len(cleaned)
+        self.tokens_before += estimate_tokens(page_text)
+        self.tokens_after += estimate_tokens(cleaned)
+        return cleaned
+
+    def _is_repeat(self, slot: Tuple[str, int, str]) -> bool:
+        """Whether this occurrence of an edge line is a repeat of page furniture"""
+        seen = self._slot_pages[slot]
+        if self._furniture is not None:
+            return seen >= 1 and slot in self._furniture
+        return seen + 1 >= STREAM_EDGE_REPEAT_PAGES
+
+    def clean_pages(self, page_texts: List[str]) -> str:
+        if self.dedupe_edges:
+            counts = Counter(slot for page_text in page_texts
+                             for line_slots in _edge_slots(page_text.splitlines()).values()
+                             for slot in set(line_slots))
+            self._furniture = {slot for slot, pages in counts.items()
+                               if pages >= EDGE_REPEAT_PAGES and pages * 2 > len(page_texts)}
+        return "".join(self.feed(page_text) for page_text in page_texts)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'chars_before': self.chars_before,
+            'chars_after': self.chars_after,
+            'lines_removed': self.lines_removed,
+            # Clamped: the re-appended newline and the 1-token minimum can make a cleaned page no shorter
+            'tokens_saved': max(0, self.tokens_before - self.tokens_after)
+        }
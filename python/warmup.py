@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Start-up warm-up and readiness for the API server
+Runs every configured parse path once on a bundled sample PDF (paying the
+lazy costs: native library start-up, imports, regex compilation, pooled LLM
+connections) and again warm, recording the timings of both runs; readiness
+is reported only once all steps have succeeded, and a failed warm-up is
+retried with backoff
+"""
+
+import os
+import statistics
+import threading
+import time
+from functools import lru_cache
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+SAMPLE_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples', 'warmup_profile.pdf')
+
+
+@lru_cache(maxsize=1)
+def sample_pdf_bytes() -> bytes:
+    """WARMUP_SAMPLE_PDF, the bundled sample profile, or (if missing) a rendered sample resume"""
+    path = os.getenv('WARMUP_SAMPLE_PDF') or SAMPLE_PDF
+    if os.path.exists(path):
+        with open(path, 'rb') as f:
+            return f.read()
+    from resume_renderer import ResumeRenderer, sample_resume
+    return ResumeRenderer().render(sample_resume()).pdf
+
+
+@dataclass
+class WarmupStep:
+    """One parse path to warm: `fn` returns an optional detail string, or raises"""
+    name: str
+    fn: Callable[[], Optional[str]]
+    # Runs after the first; the first pays the cold costs, the rest measure the warm path
+    repeats: int = 1
+
+
+@dataclass
+class StepResult:
+    name: str
+    ok: bool = True
+    cold_ms: float = 0.0
+    warm_ms: Optional[float] = None
+    detail: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class WarmupReport:
+    status: str = 'pending'
+    attempt: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    # After a failed attempt: when the next one starts
+    next_attempt_at: Optional[float] = None
+    steps: List[StepResult] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = asdict(self)
+        if self.started_at and self.finished_at:
+            result['duration_ms'] = round((self.finished_at - self.started_at) * 1000, 1)
+        return result
+
+
+class Warmup:
+    """Runs the warm-up steps in a background thread and tracks readiness.
+
+    Status goes from 'pending' through 'running' to 'ready', or to 'failed'
+    if a step raised (unless `allow_failures`, which reports the failure
+    but still becomes ready). A failed warm-up is run again after
+    `retry_seconds`, doubling up to `max_retry_seconds`, until it succeeds,
+    so a transient failure at start-up (an LLM endpoint still booting)
+    does not leave the instance unready for good.
+    """
+
+    def __init__(self, steps: List[WarmupStep], allow_failures: bool = False,
+                 retry_seconds: float = 5.0, max_retry_seconds: float = 300.0):
+        self.steps = steps
+        self.allow_failures = allow_failures
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.report = WarmupReport()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, steps: List[WarmupStep]) -> 'Warmup':
+        return cls(
+            steps,
+            allow_failures=os.getenv('WARMUP_ALLOW_FAILURES', '').lower() in ('1', 'true', 'yes'),
+            retry_seconds=float(os.getenv('WARMUP_RETRY_SECONDS', '5')),
+            max_retry_seconds=float(os.getenv('WARMUP_RETRY_MAX_SECONDS', '300'))
+        )
+
+    @property
+    def ready(self) -> bool:
+        return self.report.status == 'ready'
+
+    def start(self) -> 'Warmup':
+        """Start the warm-up (and its retries) in the background (once; later calls do nothing)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run_until_ready, name='warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the first attempt to finish (retries are not waited for)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while self.report.status in ('pending', 'running'):
+            if self._thread is None or (deadline is not None and time.monotonic() >= deadline):
+                break
+            time.sleep(0.05)
+        return self.ready
+
+    def _run_until_ready(self):
+        delay = self.retry_seconds
+        while self.run().status == 'failed' and self.retry_seconds > 0:
+            self.report.next_attempt_at = time.time() + delay
+            print(f"[WARMUP] Retrying in {delay:g}s")
+            time.sleep(delay)
+            delay = min(self.max_retry_seconds, delay * 2)
+
+    def run(self) -> WarmupReport:
+        """One warm-up attempt; the report of the previous attempt is replaced"""
+        report = WarmupReport(status='running', attempt=self.report.attempt + 1, started_at=time.time())
+        self.report = report
+        failed = False
+        for step in self.steps:
+            result = self._run_step(step)
+            report.steps.append(result)
+            if result.ok:
+                print(f"[WARMUP] {step.name}: cold {result.cold_ms} ms"
+                      + (f", warm {result.warm_ms} ms" if result.warm_ms is not None else "")
+                      + (f" ({result.detail})" if result.detail else ""))
+            else:
+                failed = True
+                print(f"[WARMUP] {step.name} failed: {result.error}")
+        report.finished_at = time.time()
+        report.status = 'failed' if failed and not self.allow_failures else 'ready'
+        print(f"[WARMUP] {report.status} after {report.to_dict()['duration_ms']} ms (attempt {report.attempt})")
+        return report
+
+    @staticmethod
+    def _run_step(step: WarmupStep) -> StepResult:
+        result = StepResult(name=step.name)
+        try:
+            start = time.perf_counter()
+            result.detail = step.fn()
+            result.cold_ms = round((time.perf_counter() - start) * 1000, 1)
+            timings = []
+            for _ in range(step.repeats):
+                start = time.perf_counter()
+                step.fn()
+                timings.append((time.perf_counter() - start) * 1000)
+            if timings:
+                result.warm_ms = round(statistics.median(timings), 1)
+        except Exception as e:
+            result.ok = False
+            result.error = str(e)
+        return result